@@ -24,13 +24,14 @@ repo = ndt.find_repo()
 key = ndt.load_api_key(repo)
 base = ndt.om_base(key)
 pool = ndt.load_city_pools(repo)
+index = ndt.build_pool_index(repo, pool)
 
 # ---- A. Storm Approach (the headline) --------------------------------------
 import time
 now = time.time()
-saved = ndt.pseudo_saved_cities(pool, LAT, LON)
+saved = ndt.pseudo_saved_cities(index, LAT, LON)
 saved_keys = {"%.2f,%.2f" % (s["lat"], s["lon"]) for s in saved}
-towns = ndt.nearby_towns(pool, LAT, LON, saved_keys)
+towns = ndt.nearby_towns(index, LAT, LON, saved_keys)
 samples = ndt.ring_samples(LAT, LON, improved=True)
 coords = ([(s["lat"], s["lon"]) for s in samples] +
           [(t["lat"], t["lon"]) for t in towns])
@@ -342,6 +342,21 @@ def load_city_pools(repo):
     return all_cities
 
 
+# Spatial index over the pool: the Windows app's CityIndex (pure stdlib k-d
+# tree) imported straight from the repo, so nearest-town queries don't scan
+# all ~12,000 bundled cities per evaluated point. Built once in main() and
+# passed to whatever needs it.
+def build_pool_index(repo, pool):
+    windows_dir = os.path.join(repo, "windows")
+    if windows_dir not in sys.path:
+        sys.path.insert(0, windows_dir)
+    try:
+        from fastweather.city_index import CityIndex
+    except ImportError as e:
+        sys.exit("Cannot import fastweather.city_index from %s: %s" % (windows_dir, e))
+    return CityIndex(pool)
+
+
 BASELINE_CITIES = [
     # Geographic + climate spread; includes dry-likely and international
     # (international exercises the 2-hour narration phrasing path).
@@ -385,7 +400,7 @@ INTERESTING_ALERT_EVENTS = {
 }
 
 
-def find_interesting_cities(pool, want, log):
+def find_interesting_cities(pool, index, want, log):
     """Automated version of quickradar's hand-curated storm-chase list:
     NWS active alerts + an Open-Meteo current-precipitation scan."""
     chosen, seen_coords = [], []
@@ -394,14 +409,8 @@ def find_interesting_cities(pool, want, log):
         return all(haversine_km(lat, lon, a, b) > min_km for a, b in seen_coords)
 
     def nearest_pool_city(lat, lon, max_km=80.0):
-        best, best_d = None, max_km
-        for c in pool:
-            if abs(c["lat"] - lat) > 1.5 or abs(c["lon"] - lon) > 2.0:
-                continue
-            d = haversine_km(lat, lon, c["lat"], c["lon"])
-            if d < best_d:
-                best, best_d = c, d
-        return best
+        hits = index.nearest(lat, lon, k=1, max_km=max_km)
+        return hits[0][1] if hits else None
 
     # 1) NWS active alerts (the app's own alert source), most severe first.
     try:
@@ -517,9 +526,9 @@ def nws_observation(lat, lon):
         return None
 
 
-def build_city_list(pool, total, log, baseline_only=False):
+def build_city_list(pool, index, total, log, baseline_only=False):
     interesting = [] if baseline_only else find_interesting_cities(
-        pool, want=max(1, total * 6 // 10), log=log)
+        pool, index, want=max(1, total * 6 // 10), log=log)
     cities = list(interesting)
     have = {(c["name"], c["country"]) for c in cities}
     for name, region, country in BASELINE_CITIES:
@@ -972,47 +981,38 @@ def next_hour_from_minutely15(forecast, now_epoch):
 # Per-city evaluation
 # ---------------------------------------------------------------------------
 
-def nearby_towns(pool, lat, lon, exclude_keys):
-    # StormApproachService.nearbyPlaces — window prefilter, >1km, <=80km, nearest 12.
-    lat_window = PLACE_RADIUS_KM / 111.0
-    lon_window = PLACE_RADIUS_KM / (111.0 * max(0.2, math.cos(math.radians(lat))))
+def nearby_towns(index, lat, lon, exclude_keys):
+    # StormApproachService.nearbyPlaces — >1km, <=80km, nearest 12 (the Swift
+    # window prefilter is subsumed by the index's radius bound).
+    def keep(c):
+        return "%.2f,%.2f" % (c["lat"], c["lon"]) not in exclude_keys
+
     out = []
-    for c in pool:
-        if abs(c["lat"] - lat) > lat_window or abs(c["lon"] - lon) > lon_window:
-            continue
-        d = haversine_km(lat, lon, c["lat"], c["lon"])
-        if d <= 1.0 or d > PLACE_RADIUS_KM:
-            continue
-        key = "%.2f,%.2f" % (c["lat"], c["lon"])
-        if key in exclude_keys:
-            continue
-        out.append(dict(name=c["name"], lat=c["lat"], lon=c["lon"], distance_km=d,
+    for _, c in index.nearest(lat, lon, k=MAX_PLACES, min_km=1.0,
+                              max_km=PLACE_RADIUS_KM, where=keep):
+        out.append(dict(name=c["name"], lat=c["lat"], lon=c["lon"],
+                        distance_km=haversine_km(lat, lon, c["lat"], c["lon"]),
                         bearing=bearing_deg(lat, lon, c["lat"], c["lon"])))
-    out.sort(key=lambda t: t["distance_km"])
-    return out[:MAX_PLACES]
+    return out
 
 
-def pseudo_saved_cities(pool, lat, lon):
+def pseudo_saved_cities(index, lat, lon):
     # Stand-ins for the user's saved cities (deviation #3): 3 nearest 40–250 km.
     out = []
-    for c in pool:
-        if abs(c["lat"] - lat) > 3.0 or abs(c["lon"] - lon) > 4.0:
-            continue
-        d = haversine_km(lat, lon, c["lat"], c["lon"])
-        if 40.0 <= d <= MAX_CITY_KM:
-            out.append(dict(name=c["name"], lat=c["lat"], lon=c["lon"], distance_km=d,
-                            bearing=bearing_deg(lat, lon, c["lat"], c["lon"])))
-    out.sort(key=lambda t: t["distance_km"])
-    return out[:3]
+    for _, c in index.nearest(lat, lon, k=3, min_km=40.0, max_km=MAX_CITY_KM):
+        out.append(dict(name=c["name"], lat=c["lat"], lon=c["lon"],
+                        distance_km=haversine_km(lat, lon, c["lat"], c["lon"]),
+                        bearing=bearing_deg(lat, lon, c["lat"], c["lon"])))
+    return out
 
 
-def evaluate_city(city, pool, base, key, log):
+def evaluate_city(city, index, base, key, log):
     lat, lon = city["lat"], city["lon"]
     now_epoch = time.time()
 
-    saved = pseudo_saved_cities(pool, lat, lon)
+    saved = pseudo_saved_cities(index, lat, lon)
     saved_keys = {"%.2f,%.2f" % (s["lat"], s["lon"]) for s in saved}
-    towns = nearby_towns(pool, lat, lon, saved_keys)
+    towns = nearby_towns(index, lat, lon, saved_keys)
 
     imp_samples = ring_samples(lat, lon, improved=True)
     leg_samples = ring_samples(lat, lon, improved=False)
@@ -1409,9 +1409,10 @@ def main():
     log("Nowcast data test %s" % run_id)
     log("Repo: %s | API tier: %s" % (repo, "paid (customer endpoint)" if key else "free"))
     pool = load_city_pools(repo)
+    index = build_pool_index(repo, pool)
     log("City pool: %d bundled locations" % len(pool))
 
-    cities = build_city_list(pool, args.cities, log, baseline_only=args.baseline)
+    cities = build_city_list(pool, index, args.cities, log, baseline_only=args.baseline)
     log("Testing %d cities (%d interesting, %d baseline/fill)" % (
         len(cities),
         sum(1 for c in cities if not c.get("reason", "").startswith(("baseline", "fill"))),
@@ -1422,7 +1423,7 @@ def main():
     def work(city):
         try:
             time.sleep(random.uniform(0, 0.8))  # stagger concurrent TLS handshakes
-            ev = evaluate_city(city, pool, base, key, log)
+            ev = evaluate_city(city, index, base, key, log)
             return city, ev, None
         except Exception as e:  # noqa: BLE001
             return city, None, str(e)
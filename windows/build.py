@@ -67,6 +67,32 @@ def main():
     
     print("✓ Cleanup complete")
     print()
+
+    # Inland grid for skipping marine requests (required), built from Natural
+    # Earth GeoJSON placed next to this script (see build_land_mask.py).
+    mask_file = "land-sea-mask.bin"
+    if not os.path.exists(mask_file):
+        land = [f for f in ("ne_10m_land.geojson", "ne_50m_land.geojson")
+                if os.path.exists(f)]
+        if not land:
+            print(f"✗ {mask_file} not found")
+            print("  Download Natural Earth land polygons (and optionally lakes), convert")
+            print("  them to ne_10m_land.geojson / ne_10m_lakes.geojson next to build.py,")
+            print("  or run build_land_mask.py yourself, then build again.")
+            return 1
+        print("Building land/sea mask...")
+        mask_cmd = [sys.executable, "build_land_mask.py", land[0]]
+        lakes = [f for f in ("ne_10m_lakes.geojson", "ne_50m_lakes.geojson")
+                 if os.path.exists(f)]
+        if lakes:
+            mask_cmd += ["--lakes", lakes[0]]
+        try:
+            subprocess.check_call(mask_cmd)
+        except subprocess.CalledProcessError as e:
+            print(f"✗ Could not build {mask_file} (error code {e.returncode})")
+            return 1
+        print(f"✓ {mask_file} built")
+        print()
     
     # Build the executable
     print("Building executable...")
@@ -83,6 +109,7 @@ def main():
         "--add-data", "city.json;.", # Embed city.json as a resource
         "--add-data", "us-cities-cached.json;.", # Embed US cities cache
         "--add-data", "international-cities-cached.json;.", # Embed international cities cache
+        "--add-data", f"{mask_file};.", # Embed the inland grid (land_sea)
         "--hidden-import=wx", # Explicitly include wxPython
         "--collect-all=wx", # Collect all wxPython modules and resources
         "--exclude-module=tkinter", # Exclude unnecessary standard library GUI
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Build land-sea-mask.bin, the coarse inland grid used to skip marine requests.
+
+Input is Natural Earth land polygons as GeoJSON (ne_10m_land or ne_50m_land,
+converted with e.g. ``ogr2ogr -f GeoJSON``); an optional lakes layer is
+treated as water so lakeshore cities keep their marine lookups. Cells whose
+centre is on land and with no water cell within INLAND_KM are marked inland.
+
+Usage:
+    python build_land_mask.py ne_10m_land.geojson [--lakes ne_10m_lakes.geojson]
+
+Stdlib only; writes land-sea-mask.bin next to this script. build.py requires the
+grid: it runs this itself when ne_*_land.geojson sits beside it, and otherwise
+stops.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+from fastweather.services.land_sea import INLAND_KM, MASK_FILE, LandSeaMask
+
+CELLS_PER_DEGREE = 4          # 0.25 degree cells: 130 KB bitmap
+KM_PER_DEGREE = 111.32
+
+
+def rings(path):
+    """Every ring of every (Multi)Polygon in a GeoJSON file, as [lon, lat] lists."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for feature in data.get("features", []):
+        geom = feature.get("geometry") or {}
+        polys = geom.get("coordinates") or []
+        if geom.get("type") == "Polygon":
+            polys = [polys]
+        elif geom.get("type") != "MultiPolygon":
+            continue
+        for poly in polys:
+            yield from poly
+
+
+def rasterize(ring_list, res):
+    """Scanline even-odd fill: grid[row][col] is True when the cell centre is inside."""
+    rows, cols = 180 * res, 360 * res
+    by_row = [[] for _ in range(rows)]           # x crossings per row centre
+    for ring in ring_list:
+        for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+            if y1 == y2:
+                continue
+            lo, hi = min(y1, y2), max(y1, y2)
+            first = max(0, math.ceil((90.0 - hi) * res - 0.5))
+            last = min(rows - 1, math.floor((90.0 - lo) * res - 0.5))
+            for row in range(first, last + 1):
+                lat = 90.0 - (row + 0.5) / res
+                if (y1 > lat) != (y2 > lat):
+                    by_row[row].append(x1 + (lat - y1) * (x2 - x1) / (y2 - y1))
+    grid = []
+    for xs in by_row:
+        line = bytearray(cols)
+        xs.sort()
+        for a, b in zip(xs[0::2], xs[1::2]):
+            c0 = max(0, math.ceil((a + 180.0) * res - 0.5))
+            c1 = min(cols - 1, math.floor((b + 180.0) * res - 0.5))
+            for col in range(c0, c1 + 1):
+                line[col] = 1
+        grid.append(line)
+    return grid
+
+
+def inland_cells(land, res, km):
+    """Land cells with no water cell within ``km`` (2-D prefix sums over water)."""
+    rows, cols = len(land), len(land[0])
+    # water[r][c] prefix sums, with columns tripled to wrap around the dateline
+    prefix = [[0] * (3 * cols + 1) for _ in range(rows + 1)]
+    for r in range(rows):
+        acc = 0
+        line, up, out = land[r], prefix[r], prefix[r + 1]
+        for c in range(3 * cols):
+            acc += 0 if line[c % cols] else 1
+            out[c + 1] = up[c + 1] + acc
+    dr = math.ceil(km / KM_PER_DEGREE * res)
+    for r in range(rows):
+        lat = 90.0 - (r + 0.5) / res
+        width = KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6)
+        dc = min(cols, math.ceil(km / width * res))
+        r0, r1 = max(0, r - dr), min(rows, r + dr + 1)
+        for c in range(cols):
+            if not land[r][c]:
+                continue
+            a, b = c + cols - dc, c + cols + dc + 1
+            water = prefix[r1][b] - prefix[r0][b] - prefix[r1][a] + prefix[r0][a]
+            if not water:
+                yield r, c
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("land", help="Natural Earth land polygons (GeoJSON)")
+    ap.add_argument("--lakes", help="lakes polygons (GeoJSON), treated as water")
+    ap.add_argument("--km", type=float, default=INLAND_KM)
+    args = ap.parse_args()
+
+    print("Rasterizing land...")
+    land = rasterize(list(rings(args.land)), CELLS_PER_DEGREE)
+    if args.lakes:
+        print("Carving out lakes...")
+        lakes = rasterize(list(rings(args.lakes)), CELLS_PER_DEGREE)
+        for line, lake in zip(land, lakes):
+            for c, wet in enumerate(lake):
+                if wet:
+                    line[c] = 0
+    print(f"Marking cells more than {args.km:g} km from water...")
+    mask = LandSeaMask.from_cells(inland_cells(land, CELLS_PER_DEGREE, args.km),
+                                  CELLS_PER_DEGREE)
+    out = os.path.join(os.path.dirname(os.path.abspath(__file__)), MASK_FILE)
+    with open(out, "wb") as f:
+        f.write(mask.to_bytes())
+    print(f"Wrote {out} ({os.path.getsize(out) // 1024} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
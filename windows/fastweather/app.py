@@ -13,7 +13,7 @@ import wx
 
 from . import __version__, browse_favorites
 from .constants import USER_GUIDE_URL
-from .city_data import flatten_cities, load_cached_cities
+from .city_data import city_index, load_cached_cities
 from .locale_units import locale_default_units
 from .models.city import CityStore
 from .models.settings import AppSettings
@@ -25,7 +25,7 @@ from .ui.dialogs.city_select import CitySelectionDialog
 from .ui.dialogs.config_dialog import WeatherConfigDialog
 from .ui.dialogs.location_browser import LocationBrowserDialog
 from .ui.events import EVT_FETCH_RESULT
-from .services import alert_service, location_service, updater
+from .services import alert_history, alert_service, climatology, location_service, updater
 from .ui.dialogs.alert_browser_dialog import AlertBrowserDialog
 from .ui.dialogs.alerts_dialog import AlertsDialog
 from .ui.dialogs.around_me_dialog import AroundMeDialog
@@ -35,7 +35,7 @@ from .ui.dialogs.mydata_dialog import MyDataDialog
 from .ui.dialogs.radar_dialog import RadarDialog
 from .ui.dialogs.astronomy_dialog import AstronomyDialog
 from .ui.formatters import Formatter
-from .ui.full_weather_view import build_day_lines, build_full_weather_lines
+from .ui.full_weather_view import build_day_lines, build_full_weather_lines, report_date
 from .paths import user_data_dir
 
 
@@ -93,6 +93,7 @@ class MainFrame(wx.Frame):
                     self.settings.merge_saved(json.load(f))
             except Exception:
                 pass
+        alert_history.configure(self.settings["options"].get("alert_history_days", 90))
 
     def save_config(self):
         try:
@@ -311,7 +312,7 @@ class MainFrame(wx.Frame):
     def all_cities(self):
         """Flattened list of every cached city (built once, lazily)."""
         if self._all_cities is None:
-            self._all_cities = flatten_cities(self.us_cities_cache, self.intl_cities_cache)
+            self._all_cities = city_index().cities
         return self._all_cities
 
     def on_weather_around_me(self, event):
@@ -327,7 +328,8 @@ class MainFrame(wx.Frame):
         city = self.require_selected_city()
         if not city:
             return
-        dlg = HistoricalDialog(self, city, self.settings, self.fmt)
+        saved = [(name, *self.cities.coords(name)) for name in self.cities.names()]
+        dlg = HistoricalDialog(self, city, self.settings, self.fmt, saved)
         dlg.ShowModal()
         dlg.Destroy()
         self.save_config()  # persist years-back
@@ -336,7 +338,8 @@ class MainFrame(wx.Frame):
         city = self.require_selected_city()
         if not city:
             return
-        dlg = MyDataDialog(self, city, self.settings, self.fmt)
+        saved = [(name, *self.cities.coords(name)) for name in self.cities.names()]
+        dlg = MyDataDialog(self, city, self.settings, self.fmt, saved)
         dlg.ShowModal()
         dlg.Destroy()
         self.save_config()  # persist the parameter selection
@@ -808,7 +811,12 @@ class MainFrame(wx.Frame):
         city = self.current_full_city[0]
         data = self.current_full_data
         if self.day_offset == 0:
-            lines = build_full_weather_lines(city, data, self.settings, self.fmt)
+            # Only an already-built climatology: the report never downloads one.
+            clim = climatology.cached(*self.current_full_city[1:3])
+            today = report_date(data)
+            lines = build_full_weather_lines(
+                city, data, self.settings, self.fmt,
+                climate=clim.day(today.month, today.day) if clim else None)
         else:
             ref = data.get("current", {}).get("time", "")[:10]
             try:
@@ -916,7 +924,11 @@ class MainFrame(wx.Frame):
                    for la0, la1, lo0, lo1 in boxes)
 
     def _check_alert_badge(self, city, lat, lon):
-        """Fire a best-effort NWS alert check for US cities to badge the row."""
+        """Fire a best-effort NWS alert check for US cities to badge the row.
+
+        Each job resolves against the shared national alert index, so a full
+        refresh of N cities costs one feed download, not N point queries.
+        """
         if not self._is_us_coord(lat, lon):  # NWS is US-only
             return
         self.fetch.submit(
@@ -990,7 +1002,8 @@ class MainFrame(wx.Frame):
                     self.city_list.SetString(i, new_text)
                     break
 
-            # Best-effort alert badge for US cities (cached 5 min).
+            # Best-effort alert badge for US cities, resolved locally against
+            # one shared national alert feed (refreshed every 5 min).
             if city in self.cities:
                 lat, lon = self.cities.coords(city)
                 self._check_alert_badge(city, lat, lon)
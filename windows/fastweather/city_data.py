@@ -6,9 +6,17 @@
 
 import json
 import os
+import threading
 
+from .city_index import CityIndex
+from .city_search import CitySearchIndex
 from .paths import bundle_dir
 
+_caches = None          # (us, intl) parsed once per process
+_index = None           # CityIndex over flatten_cities(), built lazily
+_search = None          # CitySearchIndex for offline forward geocoding
+_index_lock = threading.Lock()
+
 
 def _candidate_paths(filename):
     base = bundle_dir()
@@ -34,17 +42,23 @@ def _load_first(filename):
 
 
 def load_cached_cities():
-    """Return (us_cities_cache, intl_cities_cache); either may be None."""
-    us = _load_first("us-cities-cached.json")
-    intl = _load_first("international-cities-cached.json")
-    return us, intl
+    """Return (us_cities_cache, intl_cities_cache); either may be None.
+
+    Parsed once per process; the caches are treated as read-only.
+    """
+    global _caches
+    if _caches is None:
+        us = _load_first("us-cities-cached.json")
+        intl = _load_first("international-cities-cached.json")
+        _caches = (us, intl)
+    return _caches
 
 
 def flatten_cities(us_cache, intl_cache):
     """Flatten the state/country caches into one list of city dicts.
 
-    Each entry: {name, display, lat, lon, region}. Used by the Directional
-    Explorer to search cities along a bearing.
+    Each entry: {name, state, country, display, lat, lon, region}. Used by the
+    Directional Explorer and the nearest-city index.
     """
     out = []
     for cache, region_is_country in ((us_cache, False), (intl_cache, True)):
@@ -63,9 +77,34 @@ def flatten_cities(us_cache, intl_cache):
                 parts = [p for p in [name, state, country] if p]
                 out.append({
                     "name": name,
+                    "state": state,
+                    "country": country,
                     "display": ", ".join(parts),
                     "lat": lat,
                     "lon": lon,
                     "region": region,
                 })
     return out
+
+
+def city_index():
+    """Shared :class:`CityIndex` over every bundled city (built once, lazily).
+
+    Safe to call from worker threads; the first caller pays the ~0.2 s build.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CityIndex(flatten_cities(*load_cached_cities()))
+    return _index
+
+
+def city_search():
+    """Shared :class:`CitySearchIndex` over the bundled caches (built lazily)."""
+    global _search
+    if _search is None:
+        with _index_lock:
+            if _search is None:
+                _search = CitySearchIndex(*load_cached_cities())
+    return _search
@@ -0,0 +1,134 @@
+"""Nearest-city lookups over the bundled city caches.
+
+A static 3-D k-d tree over unit vectors on the sphere: straight-line (chord)
+distance between unit vectors is monotonic in great-circle distance, so the
+tree needs no special handling for the antimeridian or the poles. Building the
+~12,000 bundled cities takes a fraction of a second; a k-nearest query visits
+a few dozen nodes and answers well under a millisecond.
+
+Pure Python and free of wx/requests so the out-of-app tools
+(``tools/datatesting``) can import it with ``windows/`` on ``sys.path``.
+"""
+
+import heapq
+import math
+
+from .geo import EARTH_RADIUS_KM, haversine_km
+
+
+def _unit_vector(lat, lon):
+    p, l = math.radians(lat), math.radians(lon)
+    cp = math.cos(p)
+    return (cp * math.cos(l), cp * math.sin(l), math.sin(p))
+
+
+def _chord_sq(km):
+    """Squared chord length (unit sphere) subtending a great-circle distance."""
+    ang = min(math.pi, km / EARTH_RADIUS_KM)
+    return (2 * math.sin(ang / 2)) ** 2
+
+
+class CityIndex:
+    """k-nearest-neighbor index over city dicts carrying ``lat`` / ``lon``.
+
+    Cities are kept by reference (never copied); entries with missing or
+    unparseable coordinates are skipped. The optional region filter compares
+    against each city's ``region`` key (state for US cities, country for
+    international ones in :func:`~fastweather.city_data.flatten_cities`).
+    """
+
+    def __init__(self, cities):
+        self.cities = []
+        self._xyz = []
+        for c in cities:
+            try:
+                lat, lon = float(c["lat"]), float(c["lon"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.cities.append(c)
+            self._xyz.append(_unit_vector(lat, lon))
+        # Implicit tree: node i stores a city index, split axis and children.
+        self._point, self._axis, self._left, self._right = [], [], [], []
+        self._root = self._build(list(range(len(self.cities))))
+
+    def __len__(self):
+        return len(self.cities)
+
+    def _build(self, idxs):
+        if not idxs:
+            return -1
+        xyz = self._xyz
+        # Split on the axis of greatest spread (better than round-robin on a
+        # sphere, where points cluster on continents).
+        spans = []
+        for a in range(3):
+            vals = [xyz[i][a] for i in idxs]
+            spans.append(max(vals) - min(vals))
+        axis = spans.index(max(spans))
+        idxs.sort(key=lambda i: xyz[i][axis])
+        mid = len(idxs) // 2
+        node = len(self._point)
+        self._point.append(idxs[mid])
+        self._axis.append(axis)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._left[node] = self._build(idxs[:mid])
+        self._right[node] = self._build(idxs[mid + 1:])
+        return node
+
+    def nearest(self, lat, lon, k=1, max_km=None, min_km=None, region=None,
+                where=None):
+        """Return up to ``k`` ``(distance_km, city)`` pairs, nearest first.
+
+        ``max_km`` / ``min_km`` bound the great-circle distance (inclusive max,
+        exclusive min), ``region`` keeps only cities whose ``region`` matches,
+        and ``where`` is an optional ``city -> bool`` predicate for anything
+        else (e.g. excluding cities already shown).
+        """
+        if k <= 0 or self._root < 0:
+            return []
+        q = _unit_vector(lat, lon)
+        limit = _chord_sq(max_km) if max_km is not None else 4.0
+        floor = _chord_sq(min_km) if min_km else -1.0
+        best = []  # max-heap of (-dist_sq, city_idx), size <= k
+        xyz, cities = self._xyz, self.cities
+        point, axis, left, right = self._point, self._axis, self._left, self._right
+
+        # Depth-first with (node, squared distance to its splitting plane);
+        # subtrees whose plane is already farther than the k-th best are skipped.
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, plane = stack.pop()
+            bound = -best[0][0] if len(best) == k else limit
+            if plane > bound:
+                continue
+            i = point[node]
+            p = xyz[i]
+            d = (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2
+            if floor < d <= bound:
+                c = cities[i]
+                if ((region is None or c.get("region") == region)
+                        and (where is None or where(c))):
+                    if len(best) == k:
+                        heapq.heapreplace(best, (-d, i))
+                    else:
+                        heapq.heappush(best, (-d, i))
+            a = axis[node]
+            diff = q[a] - p[a]
+            near, far = (left[node], right[node]) if diff < 0 else (right[node], left[node])
+            # Push the far side first so the near side is explored first.
+            if far >= 0:
+                stack.append((far, diff * diff))
+            if near >= 0:
+                stack.append((near, 0.0))
+
+        out = []
+        for _, i in sorted(best, reverse=True):
+            c = cities[i]
+            out.append((haversine_km(lat, lon, float(c["lat"]), float(c["lon"])), c))
+        return out
+
+    def within(self, lat, lon, max_km, region=None, where=None):
+        """Every matching city within ``max_km``, nearest first."""
+        return self.nearest(lat, lon, k=len(self.cities), max_km=max_km,
+                            region=region, where=where)
@@ -0,0 +1,135 @@
+"""Offline place search over the bundled city caches.
+
+A sorted array of accent-folded, lower-cased city names searched by binary
+search for a prefix range, so Add City can resolve the ~12,000 cities we
+already ship without a Nominatim round trip. Matches are returned in
+:func:`~fastweather.services.geocoding_service.build_match` format.
+
+Queries may carry a region after a comma ("Portland, Maine", "Madison, WI",
+"London, United Kingdom"); the region is matched as a prefix of the city's
+state or country, and US postal abbreviations are expanded.
+"""
+
+import bisect
+import re
+import unicodedata
+
+US_STATE_ABBREVIATIONS = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
+    "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
+    "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
+    "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas",
+    "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
+    "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi",
+    "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
+    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York",
+    "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma",
+    "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
+    "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah",
+    "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
+    "WI": "Wisconsin", "WY": "Wyoming",
+}
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text):
+    """Accent-folded, case-folded, punctuation-free form used as a search key."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(_NON_WORD.sub(" ", folded.casefold()).split())
+
+
+class CitySearchIndex:
+    """Prefix search over city dicts ({name, state, country, lat, lon}).
+
+    Ranking: exact name matches before prefix matches, then the city's position
+    within its state/country list (the caches are ordered largest first), then
+    name. ``importance`` is synthesized from that order so local matches sort
+    sensibly next to Nominatim ones.
+    """
+
+    def __init__(self, us_cache=None, intl_cache=None):
+        self.cities = []
+        self._keys = []   # sorted normalized names
+        self._ids = []    # parallel: index into self.cities
+        entries = []
+        for cache, region_is_country in ((us_cache, False), (intl_cache, True)):
+            for region, cities in (cache or {}).items():
+                for rank, c in enumerate(cities):
+                    try:
+                        lat, lon = float(c["lat"]), float(c["lon"])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    name = c.get("name", "")
+                    if not name:
+                        continue
+                    country = c.get("country") or (region if region_is_country else "")
+                    state = c.get("state", "")
+                    self.cities.append({
+                        "name": name, "state": state, "country": country,
+                        "lat": lat, "lon": lon, "rank": rank,
+                        "_regions": (normalize(state), normalize(country)),
+                    })
+                    entries.append((normalize(name), len(self.cities) - 1))
+        entries.sort()
+        self._keys = [k for k, _ in entries]
+        self._ids = [i for _, i in entries]
+
+    def __len__(self):
+        return len(self.cities)
+
+    def _prefix_range(self, prefix):
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\uffff")
+        return lo, hi
+
+    def search(self, query, limit=8, exact_only=False):
+        """Return up to ``limit`` match dicts for a "name[, region]" query."""
+        name_part, _, region_part = (query or "").partition(",")
+        prefix = normalize(name_part)
+        if not prefix:
+            return []
+        region = region_part.strip()
+        region = US_STATE_ABBREVIATIONS.get(region.upper(), region)
+        region = normalize(region)
+
+        lo, hi = self._prefix_range(prefix)
+        scored = []
+        for pos in range(lo, hi):
+            exact = self._keys[pos] == prefix
+            if exact_only and not exact:
+                # Exact keys sort first within the range; nothing else qualifies.
+                break
+            c = self.cities[self._ids[pos]]
+            if region and not any(r.startswith(region) for r in c["_regions"]):
+                continue
+            scored.append(((0 if exact else 1, c["rank"], c["name"]), c))
+        scored.sort(key=lambda s: s[0])
+        matches, seen = [], set()
+        for _, c in scored:
+            m = _as_match(c)
+            if m["display"] in seen:  # a city listed under two regions
+                continue
+            seen.add(m["display"])
+            matches.append(m)
+            if len(matches) >= limit:
+                break
+        return matches
+
+
+def _as_match(c):
+    display = ", ".join(p for p in (c["name"], c["state"], c["country"]) if p)
+    return {
+        "display": display,
+        "name": c["name"],
+        "city": c["name"],
+        "state": c["state"],
+        "country": c["country"],
+        "kind": "city",
+        # Largest cities in a region come first in the caches; keep the
+        # synthesized importance in Nominatim's 0..1 range.
+        "importance": round(0.75 / (1 + c["rank"] / 10.0), 4),
+        "lat": c["lat"],
+        "lon": c["lon"],
+    }
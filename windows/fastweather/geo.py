@@ -57,3 +57,26 @@ def cross_track_km(center_lat, center_lon, bearing, lat, lon):
     theta13 = math.radians(bearing_deg(center_lat, center_lon, lat, lon))
     theta12 = math.radians(bearing)
     return abs(math.asin(math.sin(d13) * math.sin(theta13 - theta12))) * EARTH_RADIUS_KM
+
+
+def point_in_ring(lat, lon, ring):
+    """Even-odd ray cast of a point against one GeoJSON ring ([lon, lat] pairs)."""
+    inside = False
+    n = len(ring)
+    j = n - 1
+    for i in range(n):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > lat) != (yj > lat):
+            x_cross = xi + (lat - yi) * (xj - xi) / (yj - yi)
+            if lon < x_cross:
+                inside = not inside
+        j = i
+    return inside
+
+
+def point_in_polygon(lat, lon, polygon):
+    """True if the point is inside a GeoJSON Polygon (outer ring minus holes)."""
+    if not polygon or not point_in_ring(lat, lon, polygon[0]):
+        return False
+    return not any(point_in_ring(lat, lon, hole) for hole in polygon[1:])
@@ -5,8 +5,10 @@ filters, hazard classification (keyword order is load-bearing), and the
 severity|event grouping used to collapse many area-level products into one row.
 """
 
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 
 # Severity ordering (lower = more critical), matching iOS AlertSeverity.sortOrder.
 SEVERITY_ORDER = {"Extreme": 0, "Severe": 1, "Moderate": 2, "Minor": 3, "Unknown": 4}
@@ -22,40 +24,49 @@ HAZARD_ORDER = [
 ]
 
 
+# (family, keywords) in precedence order. First family with any keyword in the
+# event wins; the order is deliberate (winter before heat, tropical before
+# storms, a bare 'storm' falls to wind) and mirrors iOS HazardType.classify.
+_HAZARD_RULES = [
+    ("Tropical", ("hurricane", "tropical", "typhoon", "storm surge")),
+    ("Storms", ("tornado", "thunderstorm", "severe weather", "special weather statement",
+                "lightning")),
+    ("Flooding", ("flood", "hydrologic", "seiche")),
+    ("Winter", ("winter", "snow", "blizzard", "ice storm", "freez", "frost", "wind chill",
+                "sleet", "cold", "avalanche", "low temperature", "low-temperature", "icy",
+                "glaze")),
+    ("Fire", ("fire", "red flag")),
+    ("Air Quality", ("air quality", "air stagnation", "ozone", "dust", "ashfall", "smoke")),
+    ("Heat", ("heat", "high temperature", "high-temperature", "hot", "heatwave", "warm")),
+    ("Fog", ("fog",)),
+    ("Rain", ("rain", "downpour", "shower", "precipitation")),
+    ("Wind", ("wind", "gale", "storm")),
+    ("Marine & Coastal", ("marine", "small craft", "seas", "surf", "rip current", "beach",
+                          "coastal", "tsunami", "low water", "ashore")),
+]
+_KEYWORD_RANK = {}
+for _rank, (_family, _keywords) in enumerate(_HAZARD_RULES):
+    for _kw in _keywords:
+        _KEYWORD_RANK.setdefault(_kw, _rank)
+# One pass over the event text. The zero-width lookahead reports a keyword at
+# every position (overlaps included), and alternatives are listed in
+# precedence order so each position yields its highest-precedence keyword.
+_HAZARD_RE = re.compile("(?=(" + "|".join(
+    re.escape(kw) for kw in sorted(_KEYWORD_RANK, key=lambda k: (_KEYWORD_RANK[k], -len(k)))
+) + "))")
+
+
+@lru_cache(maxsize=1024)
 def classify_hazard(event):
-    """Classify an event name into a hazard family. First keyword match wins;
-    the order here is deliberate (winter before heat, tropical before storms,
-    a bare 'storm' falls to wind) and mirrors iOS HazardType.classify."""
-    e = (event or "").lower()
-
-    def has(*kw):
-        return any(k in e for k in kw)
-
-    if has("hurricane", "tropical", "typhoon", "storm surge"):
-        return "Tropical"
-    if has("tornado", "thunderstorm", "severe weather", "special weather statement", "lightning"):
-        return "Storms"
-    if has("flood", "hydrologic", "seiche"):
-        return "Flooding"
-    if has("winter", "snow", "blizzard", "ice storm", "freez", "frost", "wind chill",
-            "sleet", "cold", "avalanche", "low temperature", "low-temperature", "icy", "glaze"):
-        return "Winter"
-    if has("fire", "red flag"):
-        return "Fire"
-    if has("air quality", "air stagnation", "ozone", "dust", "ashfall", "smoke"):
-        return "Air Quality"
-    if has("heat", "high temperature", "high-temperature", "hot", "heatwave", "warm"):
-        return "Heat"
-    if has("fog"):
-        return "Fog"
-    if has("rain", "downpour", "shower", "precipitation"):
-        return "Rain"
-    if has("wind", "gale", "storm"):
-        return "Wind"
-    if has("marine", "small craft", "seas", "surf", "rip current", "beach",
-            "coastal", "tsunami", "low water", "ashore"):
-        return "Marine & Coastal"
-    return "Other"
+    """Classify an event name into a hazard family (see ``_HAZARD_RULES``)."""
+    best = len(_HAZARD_RULES)
+    for m in _HAZARD_RE.finditer((event or "").lower()):
+        rank = _KEYWORD_RANK[m.group(1)]
+        if rank < best:
+            best = rank
+            if rank == 0:
+                break
+    return _HAZARD_RULES[best][0] if best < len(_HAZARD_RULES) else "Other"
 
 
 def severity_filter_includes(filter_value, severity):
@@ -77,8 +88,11 @@ def _parse_dt(s):
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class WeatherAlert:
+    """One alert. Hazard, severity rank and parsed times are derived once at
+    construction (the digest and counts read them many times per filter)."""
+
     event: str
     severity: str
     headline: str
@@ -90,18 +104,16 @@ class WeatherAlert:
     id: str = ""
     source: str = "NWS"
     details_url: str = ""
+    hazard: str = field(init=False, repr=False, compare=False)
+    sort_key: int = field(init=False, repr=False, compare=False)
+    onset_dt: datetime = field(init=False, repr=False, compare=False)
+    ends_dt: datetime = field(init=False, repr=False, compare=False)
 
-    @property
-    def sort_key(self):
-        return SEVERITY_ORDER.get(self.severity, 4)
-
-    @property
-    def hazard(self):
-        return classify_hazard(self.event)
-
-    @property
-    def ends_dt(self):
-        return _parse_dt(self.ends)
+    def __post_init__(self):
+        self.hazard = classify_hazard(self.event)
+        self.sort_key = SEVERITY_ORDER.get(self.severity, 4)
+        self.onset_dt = _parse_dt(self.onset)
+        self.ends_dt = _parse_dt(self.ends)
 
     def is_expired(self, now=None):
         end = self.ends_dt
@@ -116,6 +128,7 @@ class AlertDigestGroup:
     event: str
     severity: str
     alerts: list = field(default_factory=list)
+    hazard: str = ""
 
     @property
     def count(self):
@@ -131,38 +144,73 @@ class AlertDigestGroup:
         return min(ends) if ends else None
 
 
+_FAR_FUTURE = datetime.max.replace(tzinfo=timezone.utc)
+
+
+class DigestIndex:
+    """Alerts grouped by severity|event once, with every filter a cheap view.
+
+    Groups (and the alerts inside them) are sorted when the index is built.
+    Both filters select whole groups (a group has one severity, and its event
+    fixes its hazard), so a filtered view is the pre-sorted group list with
+    some groups skipped; views are memoized per filter pair.
+    """
+
+    def __init__(self, alerts):
+        groups = {}
+        for a in alerts:
+            g = groups.get((a.severity, a.event))
+            if g is None:
+                g = groups[(a.severity, a.event)] = AlertDigestGroup(
+                    a.event, a.severity, hazard=a.hazard)
+            g.alerts.append(a)
+        self.groups = list(groups.values())
+        for g in self.groups:
+            g.alerts.sort(key=lambda x: (x.ends_dt is None, x.ends_dt or _FAR_FUTURE))
+        self.groups.sort(key=lambda g: (g.sort_key, -g.count, g.event.lower()))
+        self.total = len(alerts)
+        self._severity = {s: 0 for s in SEVERITY_ALL}
+        self._hazard = {}
+        for g in self.groups:
+            self._severity[g.severity] = self._severity.get(g.severity, 0) + g.count
+            self._hazard[g.hazard] = self._hazard.get(g.hazard, 0) + g.count
+        self._views = {}
+
+    def __len__(self):
+        return self.total
+
+    def view(self, severity_filter="All", hazard_filter=None):
+        """Pre-sorted groups matching the filters (shared; treat as read-only)."""
+        key = (severity_filter, hazard_filter)
+        groups = self._views.get(key)
+        if groups is None:
+            groups = self._views[key] = [
+                g for g in self.groups
+                if severity_filter_includes(severity_filter, g.severity)
+                and (hazard_filter is None or g.hazard == hazard_filter)]
+        return groups
+
+    def severity_counts(self):
+        return dict(self._severity)
+
+    def hazard_counts(self):
+        return dict(self._hazard)
+
+
 def build_digest(alerts, severity_filter="All", hazard_filter=None):
     """Collapse alerts into groups keyed by severity|event.
 
     Filters by (exclusive) severity and optional hazard family, groups the
     remaining alerts, and sorts groups by severity, then count desc, then event.
+    Callers that re-filter the same alerts should keep a :class:`DigestIndex`.
     """
-    scoped = [a for a in alerts
-              if severity_filter_includes(severity_filter, a.severity)
-              and (hazard_filter is None or a.hazard == hazard_filter)]
-
-    groups = {}
-    for a in scoped:
-        key = f"{a.severity}|{a.event}"
-        groups.setdefault(key, AlertDigestGroup(a.event, a.severity)).alerts.append(a)
-
-    result = list(groups.values())
-    for g in result:
-        g.alerts.sort(key=lambda x: (x.ends_dt is None, x.ends_dt or datetime.max.replace(tzinfo=timezone.utc)))
-    result.sort(key=lambda g: (g.sort_key, -g.count, g.event.lower()))
-    return result
+    return DigestIndex(alerts).view(severity_filter, hazard_filter)
 
 
 def severity_counts(alerts):
     """Histogram of alerts by severity (all levels, including zeros)."""
-    counts = {s: 0 for s in SEVERITY_ALL}
-    for a in alerts:
-        counts[a.severity] = counts.get(a.severity, 0) + 1
-    return counts
+    return DigestIndex(alerts).severity_counts()
 
 
 def hazard_counts(alerts):
-    counts = {}
-    for a in alerts:
-        counts[a.hazard] = counts.get(a.hazard, 0) + 1
-    return counts
+    return DigestIndex(alerts).hazard_counts()
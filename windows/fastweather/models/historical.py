@@ -1,6 +1,8 @@
 """Models for historical weather (Open-Meteo archive)."""
 
+from array import array
 from dataclasses import dataclass
+from datetime import date, timedelta
 
 
 @dataclass
@@ -13,3 +15,167 @@ class HistoricalDay:
     wind_max: float = None
     weather_code: int = None
     error: str = None
+
+
+# Open-Meteo daily variable -> HistoricalDay field, in request order.
+DAILY_FIELDS = {
+    "weathercode": "weather_code",
+    "temperature_2m_max": "temp_max",
+    "temperature_2m_min": "temp_min",
+    "precipitation_sum": "precip_sum",
+    "snowfall_sum": "snowfall_sum",
+    "windspeed_10m_max": "wind_max",
+}
+
+# Open-Meteo hourly variable -> hourly column name, in request order.
+HOURLY_FIELDS = {
+    "temperature_2m": "temp",
+    "relativehumidity_2m": "humidity",
+    "precipitation": "precip",
+    "snowfall": "snowfall",
+    "windspeed_10m": "wind_speed",
+    "pressure_msl": "pressure",
+    "weathercode": "weather_code",
+}
+
+_NAN = float("nan")
+
+
+def _opt(value):
+    """NaN (missing) -> None for callers and JSON."""
+    return None if value != value else value
+
+
+class DailySeries:
+    """One location's daily history as contiguous columns from ``start``.
+
+    Each HistoricalDay field is an ``array('d')`` (NaN = no value) indexed by
+    days since ``start``; ``have`` marks the days that have been fetched, so
+    a day the archive reported as empty is not fetched again. Any date's row
+    is an index computation, and a calendar day across many years is a strided
+    read rather than a lookup per year.
+    """
+
+    def __init__(self, start=None):
+        self.start = start
+        self.columns = {f: array("d") for f in DAILY_FIELDS.values()}
+        self.have = bytearray()
+
+    def __len__(self):
+        return len(self.have)
+
+    @property
+    def end(self):
+        return self.start + timedelta(days=len(self.have) - 1) if self.have else None
+
+    def _cover(self, start, end):
+        """Grow the columns (with unfetched days) to span [start, end]."""
+        if self.start is None:
+            self.start = start
+        if start < self.start:
+            pad = (self.start - start).days
+            for name, col in self.columns.items():
+                self.columns[name] = array("d", [_NAN]) * pad + col
+            self.have[:0] = bytes(pad)
+            self.start = start
+        extra = (end - self.start).days + 1 - len(self.have)
+        if extra > 0:
+            for col in self.columns.values():
+                col.extend(array("d", [_NAN]) * extra)
+            self.have.extend(bytes(extra))
+
+    def merge(self, daily, start, end):
+        """Store an Open-Meteo ``daily`` block fetched for [start, end]."""
+        self._cover(start, end)
+        base = self.start.toordinal()
+        lo, hi = start.toordinal() - base, end.toordinal() - base
+        rows = [date.fromisoformat(t).toordinal() - base for t in daily.get("time") or []]
+        for api_name, field_name in DAILY_FIELDS.items():
+            col = self.columns[field_name]
+            for i, v in zip(rows, daily.get(api_name) or []):
+                if lo <= i <= hi:
+                    col[i] = _NAN if v is None else float(v)
+        self.have[lo:hi + 1] = b"\x01" * (hi - lo + 1)
+
+    def missing(self, start, end):
+        """Sub-ranges of [start, end] not fetched yet, as (start, end) dates."""
+        if not self.have:
+            return [(start, end)]
+        gaps = []
+        lo = (start - self.start).days
+        hi = (end - self.start).days + 1
+        if lo < 0:
+            gaps.append((start, min(end, self.start - timedelta(days=1))))
+        i = max(lo, 0)
+        stop = min(hi, len(self.have))
+        while i < stop:
+            i = self.have.find(0, i, stop)
+            if i < 0:
+                break
+            j = self.have.find(1, i, stop)
+            j = stop if j < 0 else j
+            gaps.append((self.start + timedelta(days=i), self.start + timedelta(days=j - 1)))
+            i = j
+        if hi > len(self.have):
+            gaps.append((max(start, self.start + timedelta(days=len(self.have))), end))
+        return gaps
+
+    def day(self, d):
+        """HistoricalDay for a date, or None if it has not been fetched."""
+        if self.start is None:
+            return None
+        i = (d - self.start).days
+        if not 0 <= i < len(self.have) or not self.have[i]:
+            return None
+        values = {name: _opt(col[i]) for name, col in self.columns.items()}
+        if values["weather_code"] is not None:
+            values["weather_code"] = int(values["weather_code"])
+        return HistoricalDay(date=d.isoformat(), **values)
+
+    def days(self, start, end):
+        """Fetched days in [start, end], oldest first."""
+        out = []
+        d = start
+        while d <= end:
+            day = self.day(d)
+            if day is not None:
+                out.append(day)
+            d += timedelta(days=1)
+        return out
+
+    def same_day(self, month, day, years):
+        """The calendar day in each year (in the given order).
+
+        Years where it does not exist (Feb 29) or was not fetched come back as
+        error rows, so the list lines up with ``years``.
+        """
+        out = []
+        for year in years:
+            iso = f"{year:04d}-{month:02d}-{day:02d}"
+            try:
+                d = date(year, month, day)
+            except ValueError:
+                out.append(HistoricalDay(date=iso, error="No such date"))
+                continue
+            out.append(self.day(d) or HistoricalDay(date=iso, error="No data"))
+        return out
+
+    # -- persistence ----------------------------------------------------------
+    def to_payload(self):
+        return {
+            "start": self.start.isoformat() if self.start else None,
+            "have": self.have.hex(),
+            "columns": {name: [_opt(v) for v in col] for name, col in self.columns.items()},
+        }
+
+    @classmethod
+    def from_payload(cls, payload):
+        series = cls(date.fromisoformat(payload["start"]) if payload.get("start") else None)
+        series.have = bytearray.fromhex(payload.get("have") or "")
+        for name in series.columns:
+            values = (payload.get("columns") or {}).get(name) or []
+            col = array("d", (_NAN if v is None else v for v in values))
+            if len(col) < len(series.have):
+                col.extend(array("d", [_NAN]) * (len(series.have) - len(col)))
+            series.columns[name] = col
+        return series
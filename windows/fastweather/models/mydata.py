@@ -139,3 +139,30 @@ def categories():
 
 def params_in(category):
     return [p for p in CATALOG if p.category == category]
+
+
+def sort_matrix(names, rows, sort_by=None, descending=False):
+    """Order (name, row) pairs for the all-cities matrix.
+
+    ``sort_by`` is None (saved order), "city", or a parameter key; cities
+    without a value for that parameter always sort last.
+    """
+    pairs = list(zip(names, rows))
+    if sort_by == "city":
+        pairs.sort(key=lambda p: p[0].lower(), reverse=descending)
+    elif sort_by:
+        present = [p for p in pairs if p[1].get(sort_by) is not None]
+        missing = [p for p in pairs if p[1].get(sort_by) is None]
+        present.sort(key=lambda p: p[1][sort_by], reverse=descending)
+        pairs = present + missing
+    return pairs
+
+
+def matrix_lines(names, params, rows, fmt, sort_by=None, descending=False):
+    """A city-by-parameter text table (header line first) for a monospace list."""
+    header = ["City"] + [p.name for p in params]
+    table = [[name] + [format_value(p, row.get(p.key), fmt) for p in params]
+             for name, row in sort_matrix(names, rows, sort_by, descending)]
+    widths = [max(len(r[i]) for r in table + [header]) for i in range(len(header))]
+    return ["  ".join(c.ljust(w) for c, w in zip(r, widths)).rstrip()
+            for r in [header] + table]
@@ -47,10 +47,12 @@ def default_config():
             "around_me_radius_km": 160,       # ~100 mi
             "around_me_mode": "arc",          # arc | corridor
             "around_me_width": "Standard",    # Narrow | Standard | Medium | Wide
+            "around_me_place_radius_km": 40,  # name tiles after a bundled city this close
             "historical_years_back": 20,
             "mydata_selection": [],           # ordered list of MyDataParameter keys
             "default_alert_severity_filter": "All",   # Extreme|Severe|Moderate|All
             "default_alert_hazard_type": "",          # hazard family or "" for all
+            "alert_history_days": 90,                 # keep seen alerts this long (0 = forever)
             "auto_check_updates": True,               # check GitHub Releases on launch
             "specific_place_names": True,             # airports/landmarks vs locality-only
         },
@@ -2,15 +2,34 @@
 
 Fetches every active alert for a region (not a single point), so the UI can
 filter by severity/hazard and group by event. Sources: NWS (United States) and
-Environment Canada (ECCC). Results and counts are cached 5 minutes.
+Environment Canada (ECCC). Results and counts are cached 5 minutes; the
+multi-megabyte national NWS feed is then revalidated with a conditional GET.
+
+Each source feeds a persistent :class:`AlertStore` keyed by alert id, so a
+refresh only parses new or updated alerts and reuses the rest. The same
+deltas feed a per-region :class:`AlertSearchIndex` for ``search_alerts`` and
+the local alert history (``alert_history``, see ``alert_history_query``).
+
+Region-picker counts come from count-only requests (NWS
+``/alerts/active/count``, ECCC ``resulttype=hits``) issued for all regions at
+once; the full feeds are only downloaded when a region is opened.
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
 from ..cache.memory_cache import TTLCache
 from ..models.alert import WeatherAlert
-from . import http, nws
+from . import alert_history, alert_service, http
+from .alert_search import AlertSearchIndex
+from .alert_store import AlertStore
 
-NWS_ACTIVE_URL = "https://api.weather.gov/alerts/active"
+NWS_COUNT_URL = "https://api.weather.gov/alerts/active/count"
 ECCC_URL = "https://api.weather.gc.ca/collections/weather-alerts/items"
+ECCC_PAGE_SIZE = 500
+ECCC_MAX_PAGES = 40           # guard for `next` links only (no total to bound them)
+ECCC_PAGE_WORKERS = 4
 
 # Region catalog (order shown in the picker).
 REGIONS = [
@@ -30,11 +49,10 @@ def region_by_id(region_id):
 
 
 # -- NWS ---------------------------------------------------------------------
-def _fetch_nws():
-    # NWS rejects a `limit` param with HTTP 400; use status=actual only.
-    data = http.get_json(NWS_ACTIVE_URL, params={"status": "actual"})
-    alerts = [nws.parse_feature(f) for f in data.get("features", [])]
-    return [a for a in alerts if a.ends and not a.is_expired()]
+def _fetch_nws(max_age=0):
+    # The national store is shared with alert-badging (alert_service), which
+    # fetches with status=actual only (NWS rejects a `limit` param with 400).
+    return [a for a in alert_service.sync_national(max_age) if a.ends]
 
 
 # -- ECCC (Canada) -----------------------------------------------------------
@@ -81,19 +99,81 @@ def _eccc_alert(feature):
     )
 
 
+def _eccc_active_alert(feature):
+    """Parse an ECCC feature, or None if its status says it is over."""
+    p = feature.get("properties", {})
+    status = (p.get("status_en") or p.get("display_status") or "").lower()
+    if "ended" in status or "expired" in status:
+        return None
+    return _eccc_alert(feature)
+
+
+def _eccc_version(feature):
+    p = feature.get("properties", {})
+    return "|".join(str(p.get(k) or "") for k in
+                    ("publication_datetime", "status_en", "display_status"))
+
+
+_eccc_store = AlertStore(_eccc_active_alert, version=_eccc_version)
+_eccc_search = AlertSearchIndex()
+_eccc_lock = threading.Lock()
+
+
+def _eccc_page(offset):
+    return http.get_json(ECCC_URL, params={"f": "json", "limit": ECCC_PAGE_SIZE,
+                                           "offset": offset})
+
+
+def _next_link(data):
+    for link in data.get("links") or []:
+        if link.get("rel") == "next" and link.get("href"):
+            return link["href"]
+    return None
+
+
+def _eccc_features():
+    """Every active ECCC alert feature across all OGC API pages.
+
+    The first page reports ``numberMatched``; every remaining offset is then
+    requested concurrently (the host's rate limiter in ``http`` paces them).
+    Without a total, ``next`` links are followed one by one, up to
+    ECCC_MAX_PAGES; a feed that still has more raises rather than coming back
+    silently short. Features are de-duplicated by id, since items can shift
+    between pages mid-fetch.
+    """
+    first = _eccc_page(0)
+    pages = [first]
+    total = first.get("numberMatched")
+    if total is not None:
+        offsets = list(range(ECCC_PAGE_SIZE, int(total), ECCC_PAGE_SIZE))
+        if offsets:
+            with ThreadPoolExecutor(max_workers=min(ECCC_PAGE_WORKERS, len(offsets))) as ex:
+                pages.extend(ex.map(_eccc_page, offsets))
+    else:
+        data = first
+        while data.get("features"):
+            href = _next_link(data)
+            if not href:
+                break
+            if len(pages) >= ECCC_MAX_PAGES:
+                raise ValueError(f"ECCC alerts span more than {ECCC_MAX_PAGES} pages; "
+                                 f"not showing an incomplete list")
+            data = http.get_json(href)
+            pages.append(data)
+    merged = {}
+    for data in pages:
+        for f in data.get("features") or []:
+            merged.setdefault(_eccc_store.key(f) or id(f), f)
+    return list(merged.values())
+
+
 def _fetch_eccc():
-    data = http.get_json(ECCC_URL, params={"f": "json", "limit": 500})
-    alerts = []
-    for feature in data.get("features", []):
-        p = feature.get("properties", {})
-        status = (p.get("status_en") or p.get("display_status") or "").lower()
-        if "ended" in status or "expired" in status:
-            continue
-        a = _eccc_alert(feature)
-        if a.ends and a.is_expired():
-            continue
-        alerts.append(a)
-    return alerts
+    features = _eccc_features()
+    with _eccc_lock:          # the browser and the count check may both load
+        delta = _eccc_store.sync(features)
+        _eccc_search.apply(delta)
+        alert_history.record("ECCC", delta, alert_history.eccc_regions, _eccc_version)
+        return list(_eccc_store.alerts())
 
 
 # -- public API --------------------------------------------------------------
@@ -113,14 +193,71 @@ def fetch_region_alerts(region_id, use_cache=True):
     return alerts
 
 
+def search_alerts(region_id, query, limit=50):
+    """Active alerts in a region matching a text query, best match first.
+
+    Words are matched as prefixes against event, area, headline and
+    description. Loads the region first if needed; raises on failure.
+    """
+    fetch_region_alerts(region_id)
+    index = alert_service.national_search if region_id == "us" else _eccc_search
+    results = index.search(query, limit=limit)
+    if region_id == "us":
+        results = [a for a in results if a.ends]  # same scope as _fetch_nws
+    return results
+
+
+def _count_nws():
+    return int(http.get_json(NWS_COUNT_URL)["total"])
+
+
+def _count_eccc():
+    data = http.get_json(ECCC_URL, params={"f": "json", "resulttype": "hits"})
+    n = data.get("numberMatched")
+    # Without a hit count, fall back to downloading the alerts themselves.
+    return int(n) if n is not None else len(fetch_region_alerts("ca"))
+
+
 def alert_count(region_id):
-    """Active-alert count for a region, or None if the check failed."""
+    """Active-alert count for a region, or None if the check failed.
+
+    Exact when the region's alerts are already loaded; otherwise from the
+    source's count-only request (which may include products the digest
+    drops, such as ended Canadian statements).
+    """
     cached = _count_cache.get(region_id)
     if cached is not None:
         return cached
+    loaded = _alerts_cache.get(region_id)
     try:
-        n = len(fetch_region_alerts(region_id))
+        if loaded is not None:
+            n = len(loaded)
+        elif region_id == "us":
+            n = _count_nws()
+        elif region_id == "ca":
+            n = _count_eccc()
+        else:
+            raise ValueError(f"Unknown region: {region_id}")
     except Exception:
         return None
     _count_cache.set(region_id, n)
     return n
+
+
+def alert_counts(region_ids=None):
+    """{region id: count or None} for every region, fetched concurrently."""
+    ids = list(region_ids) if region_ids is not None else [r["id"] for r in REGIONS]
+    if not ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(ids)) as ex:
+        return dict(zip(ids, ex.map(alert_count, ids)))
+
+
+def alert_history_query(days=30, region=None, event=None, hazard=None, limit=500):
+    """Recorded alerts (including expired ones) from the last ``days`` days.
+
+    ``region`` is a US state or Canadian province code, e.g. "WI".
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    return alert_history.history().query(since=since, region=region, event=event,
+                                         hazard=hazard, limit=limit)
@@ -0,0 +1,210 @@
+"""Local, append-only history of every alert the app has seen.
+
+Alerts leave the live feeds as soon as they expire; this keeps them in a
+SQLite file under the user data directory so past events can be looked up
+again ("all flood warnings in WI in the last 30 days"). Rows are written from
+the :class:`~.alert_store.AlertDelta` of each feed sync, so recording costs no
+extra requests and only new or re-sent alerts are inserted. Each version of an
+alert is stored once (keyed by source, id and version).
+
+Regions are two-letter codes: US state (from the NWS UGC zone codes) or
+Canadian province. Rows older than the retention window are deleted at most
+once a day. Recording is best-effort and never fails a feed sync.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from ..models.alert import WeatherAlert
+from ..paths import user_data_dir
+
+HISTORY_FILE = "alert_history.sqlite3"
+HISTORY_RETENTION_DAYS = 90
+_PRUNE_INTERVAL = 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    rowid INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    alert_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    event TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    hazard TEXT NOT NULL,
+    headline TEXT, description TEXT, instruction TEXT, area TEXT,
+    onset TEXT, ends TEXT, details_url TEXT,
+    start_ts REAL NOT NULL,   -- onset, or first-seen time when there is none
+    ends_ts REAL,
+    UNIQUE (source, alert_id, version)
+);
+CREATE TABLE IF NOT EXISTS alert_regions (
+    alert_rowid INTEGER NOT NULL REFERENCES alerts(rowid) ON DELETE CASCADE,
+    region TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    PRIMARY KEY (region, start_ts, alert_rowid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS alerts_start ON alerts(start_ts);
+CREATE INDEX IF NOT EXISTS alerts_hazard_start ON alerts(hazard, start_ts);
+CREATE INDEX IF NOT EXISTS alert_regions_row ON alert_regions(alert_rowid);
+"""
+
+_COLUMNS = ("event", "severity", "headline", "description", "instruction", "onset",
+            "ends", "area", "alert_id", "source", "details_url")
+
+
+def nws_regions(feature):
+    """US state codes an NWS alert covers, from its UGC codes (``WIZ063``)."""
+    ugc = ((feature.get("properties") or {}).get("geocode") or {}).get("UGC") or []
+    if isinstance(ugc, str):
+        ugc = [ugc]
+    return sorted({c[:2].upper() for c in ugc if isinstance(c, str) and len(c) >= 2})
+
+
+def eccc_regions(feature):
+    """Province code of an ECCC alert feature."""
+    prov = ((feature.get("properties") or {}).get("province") or "").strip().upper()
+    return [prov] if prov else []
+
+
+def _ts(dt):
+    return dt.timestamp() if dt is not None else None
+
+
+class AlertHistory:
+    """SQLite-backed alert history. ``path`` may be ":memory:" (tests)."""
+
+    def __init__(self, path, retention_days=HISTORY_RETENTION_DAYS):
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+        self._last_prune = 0.0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, source, delta, regions_of=None, version_of=None, now=None):
+        """Insert the alerts upserted by a sync delta; return rows added."""
+        if not delta.upserted:
+            return 0
+        seen = (now or datetime.now(timezone.utc)).timestamp()
+        added = 0
+        with self._lock, self._conn:
+            for fid, feature, alert in delta.upserted:
+                version = version_of(feature) if version_of else ""
+                start = _ts(alert.onset_dt) or seen
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO alerts (source, alert_id, version, event, "
+                    "severity, hazard, headline, description, instruction, area, onset, "
+                    "ends, details_url, start_ts, ends_ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (source, fid, version, alert.event, alert.severity, alert.hazard,
+                     alert.headline, alert.description, alert.instruction, alert.area,
+                     alert.onset, alert.ends, alert.details_url,
+                     start, _ts(alert.ends_dt)))
+                if not cur.rowcount:
+                    continue
+                added += 1
+                regions = regions_of(feature) if regions_of else []
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO alert_regions (alert_rowid, region, start_ts) "
+                    "VALUES (?, ?, ?)", [(cur.lastrowid, r, start) for r in regions])
+        self.prune(now)
+        return added
+
+    def prune(self, now=None, force=False):
+        """Delete alerts that started before the retention window."""
+        now_ts = (now or datetime.now(timezone.utc)).timestamp()
+        if not self.retention_days:
+            return 0
+        recent = time.monotonic() - self._last_prune < _PRUNE_INTERVAL
+        if not force and self._last_prune and recent:
+            return 0
+        self._last_prune = time.monotonic()
+        cutoff = now_ts - self.retention_days * 86400
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM alerts WHERE start_ts < ?",
+                                      (cutoff,)).rowcount
+
+    def query(self, since=None, until=None, region=None, event=None, hazard=None,
+              severity=None, source=None, limit=None):
+        """Historical alerts that started in [since, until], newest first.
+
+        ``since``/``until`` are aware datetimes; ``region`` a state/province
+        code; ``event`` matches the event name case-insensitively. Each alert
+        appears once, as its latest recorded version.
+        """
+        # Re-sent or republished alerts keep a row per version; report the newest.
+        clauses = ["a.rowid = (SELECT MAX(v.rowid) FROM alerts v "
+                   "WHERE v.source = a.source AND v.alert_id = a.alert_id)"]
+        args = []
+        table = "alerts a"
+        if region:
+            table = "alert_regions r JOIN alerts a ON a.rowid = r.alert_rowid"
+            clauses.append("r.region = ?")
+            args.append(region.upper())
+        col = "r.start_ts" if region else "a.start_ts"
+        if since is not None:
+            clauses.append(f"{col} >= ?")
+            args.append(since.timestamp())
+        if until is not None:
+            clauses.append(f"{col} <= ?")
+            args.append(until.timestamp())
+        for name, value in (("hazard", hazard), ("severity", severity), ("source", source)):
+            if value:
+                clauses.append(f"a.{name} = ?")
+                args.append(value)
+        if event:
+            clauses.append("a.event = ? COLLATE NOCASE")
+            args.append(event)
+        sql = (f"SELECT {', '.join('a.' + c for c in _COLUMNS)} FROM {table}"
+               + " WHERE " + " AND ".join(clauses)
+               + f" ORDER BY {col} DESC")
+        if limit:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [WeatherAlert(*(r[:8]), id=r[8], source=r[9], details_url=r[10] or "")
+                for r in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+
+
+_history = None
+_history_lock = threading.Lock()
+_retention = {"days": HISTORY_RETENTION_DAYS}
+
+
+def configure(retention_days):
+    """Set the retention window (days; 0 keeps everything)."""
+    _retention["days"] = retention_days
+    if _history is not None:
+        _history.retention_days = retention_days
+
+
+def history():
+    """The app-wide AlertHistory, opened on first use."""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = AlertHistory(os.path.join(user_data_dir(), HISTORY_FILE),
+                                    _retention["days"])
+        return _history
+
+
+def record(source, delta, regions_of=None, version_of=None):
+    """Best-effort :meth:`AlertHistory.record` on the shared history."""
+    if not delta.upserted:
+        return 0
+    try:
+        return history().record(source, delta, regions_of, version_of)
+    except Exception:  # noqa: BLE001 - history must never break a feed sync
+        return 0
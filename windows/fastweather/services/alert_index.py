@@ -0,0 +1,142 @@
+"""Spatial index over the national NWS active-alert feed.
+
+Lets every saved US city be badged from ONE ``/alerts/active`` download instead
+of one ``alerts/active?point=`` request per city. Alerts that carry a polygon
+are matched by point-in-polygon (after a bounding-box prefilter through a
+1-degree grid); zone-based alerts without geometry are matched through their
+UGC codes against the point's forecast zone / county codes.
+
+The index is maintained from an :class:`~.alert_store.AlertDelta`: only new
+or re-sent alerts are (re)linked and alerts that left the feed are unlinked,
+so a refresh costs work proportional to what changed. Pure logic, no network.
+"""
+
+import math
+
+from ..geo import point_in_polygon
+from .geojson_stream import geometry_of
+
+
+def _polygons(geometry):
+    """GeoJSON geometry -> list of polygons (each a list of rings), or []."""
+    if not geometry:
+        return []
+    gtype = geometry.get("type")
+    coords = geometry.get("coordinates") or []
+    if gtype == "Polygon":
+        return [coords]
+    if gtype == "MultiPolygon":
+        return list(coords)
+    if gtype == "GeometryCollection":
+        out = []
+        for g in geometry.get("geometries") or []:
+            out.extend(_polygons(g))
+        return out
+    return []
+
+
+def _bbox(polygons):
+    lons = [pt[0] for poly in polygons for pt in (poly[0] if poly else [])]
+    lats = [pt[1] for poly in polygons for pt in (poly[0] if poly else [])]
+    if not lons:
+        return None
+    return min(lats), min(lons), max(lats), max(lons)
+
+
+def _ugc_codes(properties):
+    ugc = (properties.get("geocode") or {}).get("UGC") or []
+    if isinstance(ugc, str):
+        ugc = [ugc]
+    return frozenset(c.upper() for c in ugc if isinstance(c, str))
+
+
+class _Entry:
+    __slots__ = ("alert", "polygons", "bbox", "ugc")
+
+    def __init__(self, alert, polygons, bbox, ugc):
+        self.alert = alert
+        self.polygons = polygons
+        self.bbox = bbox
+        self.ugc = ugc
+
+
+class AlertIndex:
+    """Active NWS alerts indexed by 1-degree grid cell and by UGC code."""
+
+    def __init__(self):
+        self._entries = {}   # alert id -> _Entry
+        self._grid = {}      # (floor lat, floor lon) -> set of ids with a polygon there
+        self._by_ugc = {}    # UGC code -> set of ids WITHOUT geometry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def apply(self, delta):
+        """Link upserted alerts and unlink removed ones."""
+        for fid in delta.removed:
+            old = self._entries.pop(fid, None)
+            if old is not None:
+                self._unlink(fid, old)
+        for fid, feature, alert in delta.upserted:
+            old = self._entries.pop(fid, None)
+            if old is not None:
+                self._unlink(fid, old)
+            polygons = _polygons(geometry_of(feature))
+            entry = _Entry(alert, polygons, _bbox(polygons) if polygons else None,
+                           _ugc_codes(feature.get("properties") or {}))
+            self._entries[fid] = entry
+            self._link(fid, entry)
+
+    def _cells(self, bbox):
+        lat0, lon0, lat1, lon1 = bbox
+        for la in range(math.floor(lat0), math.floor(lat1) + 1):
+            for lo in range(math.floor(lon0), math.floor(lon1) + 1):
+                yield (la, lo)
+
+    def _link(self, fid, entry):
+        if entry.bbox is not None:
+            for cell in self._cells(entry.bbox):
+                self._grid.setdefault(cell, set()).add(fid)
+        else:
+            for code in entry.ugc:
+                self._by_ugc.setdefault(code, set()).add(fid)
+
+    def _unlink(self, fid, entry):
+        if entry.bbox is not None:
+            for cell in self._cells(entry.bbox):
+                ids = self._grid.get(cell)
+                if ids:
+                    ids.discard(fid)
+                    if not ids:
+                        del self._grid[cell]
+        else:
+            for code in entry.ugc:
+                ids = self._by_ugc.get(code)
+                if ids:
+                    ids.discard(fid)
+                    if not ids:
+                        del self._by_ugc[code]
+
+    def has_zone_alerts(self):
+        """True if any alert lacks geometry (so callers need zone codes)."""
+        return bool(self._by_ugc)
+
+    def alerts_at(self, lat, lon, zones=(), now=None):
+        """Unexpired alerts covering a point, severity-sorted.
+
+        ``zones`` are the point's UGC codes (forecast zone, county...), used
+        for alerts that have no polygon.
+        """
+        ids = set()
+        for fid in self._grid.get((math.floor(lat), math.floor(lon)), ()):
+            e = self._entries[fid]
+            lat0, lon0, lat1, lon1 = e.bbox
+            if (lat0 <= lat <= lat1 and lon0 <= lon <= lon1
+                    and any(point_in_polygon(lat, lon, poly) for poly in e.polygons)):
+                ids.add(fid)
+        for code in zones:
+            ids.update(self._by_ugc.get(code.upper(), ()))
+        alerts = [self._entries[i].alert for i in ids]
+        alerts = [a for a in alerts if not a.is_expired(now)]
+        alerts.sort(key=lambda a: a.sort_key)
+        return alerts
@@ -0,0 +1,119 @@
+"""Full-text search over active alerts (event, area, headline, description).
+
+An inverted index (token -> {alert id: weight}) maintained from the same
+:class:`~.alert_store.AlertDelta` that updates the badge index, so only new or
+re-sent alerts are tokenized. Queries are ANDed word prefixes ("dane co"
+finds "Dane County"): each query word is resolved by binary search over the
+sorted vocabulary, never by rescanning alert text. Pure logic, no network.
+"""
+
+import bisect
+import threading
+
+from ..city_search import normalize
+
+# Where a word appears decides how much a match is worth.
+FIELD_WEIGHTS = (("event", 4.0), ("area", 3.0), ("headline", 2.0), ("description", 1.0))
+PREFIX_FACTOR = 0.5   # a prefix match counts half an exact one
+MIN_TOKEN_LEN = 2
+MAX_PREFIX_TOKENS = 200  # cap on what a prefix shorter than MIN_TOKEN_LEN expands to
+
+
+def _tokens(alert):
+    """{token: weight} for an alert; a word counts once per field."""
+    weights = {}
+    for attr, w in FIELD_WEIGHTS:
+        for tok in set(normalize(getattr(alert, attr, "") or "").split()):
+            if len(tok) >= MIN_TOKEN_LEN:
+                weights[tok] = weights.get(tok, 0.0) + w
+    return weights
+
+
+class AlertSearchIndex:
+    """Inverted index over alerts, kept in step with an AlertStore's deltas."""
+
+    def __init__(self):
+        self._postings = {}    # token -> {id: weight}
+        self._doc_tokens = {}  # id -> tuple of tokens (for removal)
+        self._alerts = {}      # id -> WeatherAlert
+        self._vocab = None     # sorted tokens, rebuilt lazily after changes
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def apply(self, delta):
+        """Index upserted alerts and drop removed ones."""
+        with self._lock:
+            for fid in delta.removed:
+                self._remove(fid)
+            for fid, _feature, alert in delta.upserted:
+                self._remove(fid)
+                self._add(fid, alert)
+
+    def _add(self, fid, alert):
+        tokens = _tokens(alert)
+        for tok, w in tokens.items():
+            posting = self._postings.get(tok)
+            if posting is None:
+                posting = self._postings[tok] = {}
+                self._vocab = None
+            posting[fid] = w
+        self._doc_tokens[fid] = tuple(tokens)
+        self._alerts[fid] = alert
+
+    def _remove(self, fid):
+        self._alerts.pop(fid, None)
+        for tok in self._doc_tokens.pop(fid, ()):
+            posting = self._postings.get(tok)
+            if posting is not None:
+                posting.pop(fid, None)
+                if not posting:
+                    del self._postings[tok]
+                    self._vocab = None
+
+    def _expand(self, word):
+        """Vocabulary tokens starting with ``word``.
+
+        Only a one-letter prefix (which can never be a whole token) is capped;
+        any longer word expands in full so the token being typed is kept.
+        """
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        lo = bisect.bisect_left(self._vocab, word)
+        hi = bisect.bisect_left(self._vocab, word + "\uffff", lo)
+        if len(word) < MIN_TOKEN_LEN:
+            hi = min(hi, lo + MAX_PREFIX_TOKENS)
+        return self._vocab[lo:hi]
+
+    def search(self, query, limit=50, now=None):
+        """Unexpired alerts matching every query word (as a prefix), best first.
+
+        Score per word is the best weight among the tokens it matches (halved
+        for a prefix rather than exact match), summed over words; ties go to
+        the more severe alert.
+        """
+        words = normalize(query).split()
+        if not words:
+            return []
+        with self._lock:
+            scores = None
+            for word in words:
+                word_scores = {}
+                for tok in self._expand(word):
+                    factor = 1.0 if tok == word else PREFIX_FACTOR
+                    for fid, w in self._postings[tok].items():
+                        s = w * factor
+                        if s > word_scores.get(fid, 0.0):
+                            word_scores[fid] = s
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {fid: s + word_scores[fid]
+                              for fid, s in scores.items() if fid in word_scores}
+                if not scores:
+                    return []
+            hits = [(s, self._alerts[fid]) for fid, s in scores.items()]
+        hits = [(s, a) for s, a in hits if not a.is_expired(now)]
+        hits.sort(key=lambda h: (-h[0], h[1].sort_key, h[1].event, h[1].area))
+        return [a for _, a in hits[:limit]]
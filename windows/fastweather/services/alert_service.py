@@ -1,17 +1,41 @@
 """Per-city US weather alerts via the National Weather Service (api.weather.gov).
 
-NWS is US-only. Results are cached 5 minutes and expired alerts are filtered
-out. A fetch failure raises (so the UI can show a distinct "couldn't check"
-state) and must never be presented as "no alerts".
+NWS is US-only. Results are cached 5 minutes (then revalidated with a
+conditional GET, so an unchanged point costs a 304) and expired alerts are
+filtered out. A fetch failure raises (so the UI can show a distinct "couldn't
+check" state) and must never be presented as "no alerts".
+
+The national ``/alerts/active`` feed is held in an :class:`AlertStore` synced
+by alert id (shared with the Alert Browser). City-list badging resolves every
+city against an :class:`AlertIndex` updated from each sync's delta, plus each
+city's NWS zone codes, looked up once and disk-cached permanently. The feed
+is streamed and parsed one feature at a time; polygon text is only parsed for
+alerts that are new or re-sent.
 """
 
+import threading
+import time
+
+from ..cache.disk_cache import DiskCache
 from ..cache.memory_cache import TTLCache
-from . import http, nws
+from . import alert_history, http, nws
+from .alert_index import AlertIndex
+from .alert_search import AlertSearchIndex
+from .alert_store import AlertStore
 
 NWS_ALERTS_URL = "https://api.weather.gov/alerts/active"
+NWS_POINTS_URL = "https://api.weather.gov/points/{lat:.4f},{lon:.4f}"
+NATIONAL_REFRESH_SECONDS = 300
 
 _cache = TTLCache(default_ttl=300)  # 5 minutes
 
+national_store = AlertStore(nws.parse_feature)
+_index = AlertIndex()
+national_search = AlertSearchIndex()  # full-text, used by the Alert Browser
+_index_lock = threading.Lock()
+_index_state = {"synced_at": None}
+_zone_cache = None  # DiskCache built lazily (avoids filesystem work at import)
+
 
 def fetch_alerts(lat, lon, use_cache=True):
     """Return a severity-sorted list of active WeatherAlert for a US coordinate.
@@ -25,7 +49,7 @@ def fetch_alerts(lat, lon, use_cache=True):
         if cached is not None:
             return cached
 
-    data = http.get_json(NWS_ALERTS_URL, params={"point": f"{lat},{lon}"})
+    data = http.get_json(NWS_ALERTS_URL, params={"point": f"{lat},{lon}"}, cache=True)
     alerts = [nws.parse_feature(f) for f in data.get("features", [])]
     alerts = [a for a in alerts if not a.is_expired()]
     alerts.sort(key=lambda a: a.sort_key)
@@ -33,9 +57,94 @@ def fetch_alerts(lat, lon, use_cache=True):
     return alerts
 
 
+# -- national index (badging) --------------------------------------------------
+def sync_national(max_age=NATIONAL_REFRESH_SECONDS):
+    """Sync the shared national AlertStore if older than ``max_age``.
+
+    Returns a snapshot list of its active alerts, taken under the same lock
+    as the sync (badge lookups prune the store from other threads).
+
+    Single-flight: concurrent callers wait for one download rather than each
+    starting their own. The stream is read to the end before the store is
+    touched (geometry stays deferred), so a dropped download changes nothing
+    and the next sync sees the same alerts as new. Only new or re-sent alerts
+    are parsed, and the badge and text indexes and the alert history are
+    updated from the same delta. Raises on failure.
+    """
+    with _index_lock:
+        synced = _index_state["synced_at"]
+        if synced is not None and time.monotonic() - synced < max_age:
+            return list(national_store.alerts())
+        features = http.get_features(NWS_ALERTS_URL, params={"status": "actual"},
+                                     geometry="defer", cache=True)
+        if features is not None:  # None: unchanged since the last sync (304)
+            delta = national_store.sync(list(features))
+            _index.apply(delta)
+            national_search.apply(delta)
+            alert_history.record("NWS", delta, alert_history.nws_regions,
+                                 national_store.version)
+        _index_state["synced_at"] = time.monotonic()
+        return list(national_store.alerts())
+
+
+def national_index(max_age=NATIONAL_REFRESH_SECONDS):
+    """The shared AlertIndex, synced with the national feed if stale."""
+    sync_national(max_age)
+    return _index
+
+
+def _zones():
+    global _zone_cache
+    if _zone_cache is None:
+        _zone_cache = DiskCache("nws_zones", max_age=None)  # zones don't move
+    return _zone_cache
+
+
+def point_zones(lat, lon):
+    """UGC codes (forecast zone, county, fire zone) for a point. Disk-cached."""
+    key = f"{lat:.4f},{lon:.4f}"
+    cached = _zones().get(key)
+    if cached is not None:
+        return cached
+    data = http.get_json(NWS_POINTS_URL.format(lat=lat, lon=lon))
+    p = data.get("properties", {})
+    codes = []
+    for field in ("forecastZone", "county", "fireWeatherZone"):
+        url = p.get(field)
+        if isinstance(url, str) and url.rstrip("/"):
+            codes.append(url.rstrip("/").rsplit("/", 1)[-1].upper())
+    _zones().set(key, codes)
+    return codes
+
+
+def indexed_alerts(lat, lon):
+    """Active alerts for a point resolved locally against the national index.
+
+    Raises if the feed can't be fetched, or if zone codes are needed but can't
+    be looked up and no polygon alert already covers the point.
+    """
+    index = national_index()
+    zones, zone_error = (), None
+    if index.has_zone_alerts():
+        try:
+            zones = point_zones(lat, lon)
+        except Exception as e:  # noqa: BLE001 - polygons may still answer
+            zone_error = e
+    with _index_lock:
+        alerts = index.alerts_at(lat, lon, zones)
+    if zone_error is not None and not alerts:
+        raise zone_error
+    return alerts
+
+
 def has_active_alerts(lat, lon):
     """Best-effort boolean for badging; returns None if the check failed."""
     try:
-        return len(fetch_alerts(lat, lon)) > 0
+        return len(indexed_alerts(lat, lon)) > 0
     except Exception:
         return None
+
+
+def badge_cities(coords):
+    """{name: (lat, lon)} -> {name: True/False/None} from one national fetch."""
+    return {name: has_active_alerts(lat, lon) for name, (lat, lon) in coords.items()}
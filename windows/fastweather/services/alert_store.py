@@ -0,0 +1,131 @@
+"""Persistent, delta-synced store of active alerts keyed by alert id.
+
+A feed refresh hands every feature to :meth:`AlertStore.sync`, but only
+features that are new, or whose version (NWS ``sent``) changed, are parsed into
+a :class:`WeatherAlert`; unchanged ones keep their existing object and features
+that left the feed are dropped. The returned :class:`AlertDelta` lets dependent
+structures (the badge :class:`AlertIndex`) update from the change set alone,
+so per-refresh CPU scales with the volume of change rather than the size of
+the feed.
+
+Not thread-safe: callers that share a store serialise access to it (sync and
+the :meth:`AlertStore.alerts` snapshot) under their own lock.
+
+Expired alerts stay stored (so they are not re-parsed while still in the feed)
+but leave the active view once their end time passes.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+
+@dataclass
+class AlertDelta:
+    upserted: list = field(default_factory=list)  # [(id, feature, WeatherAlert)]
+    removed: list = field(default_factory=list)   # [id]
+
+    def __bool__(self):
+        return bool(self.upserted or self.removed)
+
+
+def _feature_id(feature):
+    p = feature.get("properties") or {}
+    return str(p.get("id") or feature.get("id") or "")
+
+
+def _nws_version(feature):
+    return str((feature.get("properties") or {}).get("sent") or "")
+
+
+class AlertStore:
+    """id -> (version, WeatherAlert) with an incrementally maintained active view.
+
+    ``parse(feature)`` builds the alert, or returns None to drop the feature
+    (e.g. an ECCC alert whose status says it ended). ``key`` and ``version``
+    pull the id and change marker out of a raw feature.
+    """
+
+    def __init__(self, parse, key=_feature_id, version=_nws_version):
+        self.parse = parse
+        self.key = key
+        self.version = version
+        self._items = {}     # id -> (version, alert or None)
+        self._active = {}    # id -> alert (unexpired)
+        self._next_expiry = None
+        self._list = None    # cached active list, rebuilt only after a change
+        self.parsed = 0      # features parsed by the last sync (diagnostics)
+
+    def __len__(self):
+        return len(self._active)
+
+    # -- sync ---------------------------------------------------------------
+    def sync(self, features, now=None):
+        """Apply a full feed snapshot; return the AlertDelta it produced."""
+        now = now or datetime.now(timezone.utc)
+        delta = AlertDelta()
+        seen = set()
+        self.parsed = 0
+        for f in features:
+            fid = self.key(f)
+            if not fid:
+                continue
+            seen.add(fid)
+            version = self.version(f)
+            old = self._items.get(fid)
+            if old is not None and old[0] == version:
+                continue
+            alert = self.parse(f)
+            self.parsed += 1
+            self._deactivate(fid)
+            self._items[fid] = (version, alert)
+            if alert is None:
+                if old is not None and old[1] is not None:
+                    delta.removed.append(fid)
+                continue
+            self._activate(fid, alert, now)
+            delta.upserted.append((fid, f, alert))
+        for fid in [k for k in self._items if k not in seen]:
+            _, alert = self._items.pop(fid)
+            self._deactivate(fid)
+            if alert is not None:
+                delta.removed.append(fid)
+        self.prune(now)
+        return delta
+
+    def prune(self, now=None):
+        """Drop alerts whose end time has passed from the active view.
+
+        Only walks the active set when the earliest known end is due.
+        """
+        now = now or datetime.now(timezone.utc)
+        if self._next_expiry is None or now <= self._next_expiry:
+            return
+        for fid, alert in list(self._active.items()):
+            if alert.is_expired(now):
+                self._deactivate(fid)
+        self._next_expiry = min((a.ends_dt for a in self._active.values() if a.ends_dt),
+                                default=None)
+
+    def _activate(self, fid, alert, now):
+        if alert.is_expired(now):
+            return
+        self._active[fid] = alert
+        end = alert.ends_dt
+        if end is not None and (self._next_expiry is None or end < self._next_expiry):
+            self._next_expiry = end
+        self._list = None
+
+    def _deactivate(self, fid):
+        if self._active.pop(fid, None) is not None:
+            self._list = None
+
+    # -- views --------------------------------------------------------------
+    def alerts(self, now=None):
+        """Active alerts (a cached list; treat as read-only)."""
+        self.prune(now)
+        if self._list is None:
+            self._list = list(self._active.values())
+        return self._list
+
+    def get(self, fid):
+        return self._active.get(fid)
@@ -0,0 +1,212 @@
+"""Per-location daily climatology built from the stored archive series.
+
+One bulk archive download (``historical_service.ensure_archive`` over the last
+CLIMATE_YEARS complete years) is reduced to 366 calendar-day slots: normal
+high/low and precipitation, deciles of the daily high and low, and record
+high/low with their years. The result is persisted, so "is today unusually
+warm?" is a local lookup after the first build.
+
+Normals and deciles pool a +/- WINDOW_DAYS window around each calendar day
+(otherwise 30 samples per day make the percentiles jumpy); records use the
+exact calendar day. Each calendar day is read straight down the series
+columns at one index per year, never by walking dates.
+"""
+
+import calendar
+import threading
+from dataclasses import dataclass
+from datetime import date
+
+from ..cache.disk_cache import DiskCache
+from . import historical_service
+
+CLIMATE_YEARS = 30
+WINDOW_DAYS = 7
+_SLOTS = 366
+_FEB29 = 59
+
+_disk = None
+_memory = {}
+_lock = threading.Lock()
+
+
+def _cache():
+    global _disk
+    if _disk is None:
+        _disk = DiskCache("climatology", max_age=None)
+    return _disk
+
+
+def slot(month, day):
+    """Calendar-day index 0..365 (leap-year calendar, Feb 29 = _FEB29)."""
+    return (date(2000, month, day) - date(2000, 1, 1)).days
+
+
+def _deciles(values):
+    """0th..100th percentile in steps of 10 (linear interpolation)."""
+    values = sorted(values)
+    n = len(values)
+    out = []
+    for k in range(11):
+        pos = (n - 1) * k / 10
+        lo = int(pos)
+        hi = min(lo + 1, n - 1)
+        out.append(values[lo] + (values[hi] - values[lo]) * (pos - lo))
+    return out
+
+
+def _rank(deciles, value):
+    """Approximate percentile (0-100) of ``value`` within decile cut points."""
+    if value is None or not deciles:
+        return None
+    if value <= deciles[0]:
+        return 0.0
+    if value >= deciles[-1]:
+        return 100.0
+    for k in range(10):
+        lo, hi = deciles[k], deciles[k + 1]
+        if lo <= value <= hi:
+            return 10.0 * (k + ((value - lo) / (hi - lo) if hi > lo else 0.5))
+    return None
+
+
+@dataclass
+class DayClimate:
+    month: int
+    day: int
+    years: int
+    normal_max: float = None
+    normal_min: float = None
+    normal_precip: float = None
+    max_deciles: list = None
+    min_deciles: list = None
+    record_high: float = None
+    record_high_year: int = None
+    record_low: float = None
+    record_low_year: int = None
+
+    def high_percentile(self, temp_max):
+        return _rank(self.max_deciles, temp_max)
+
+    def low_percentile(self, temp_min):
+        return _rank(self.min_deciles, temp_min)
+
+
+class Climatology:
+    """366 calendar-day slots of normals, deciles and records (columnar)."""
+
+    FIELDS = ("normal_max", "normal_min", "normal_precip", "max_deciles", "min_deciles",
+              "record_high", "record_high_year", "record_low", "record_low_year")
+
+    def __init__(self, first_year, last_year, columns):
+        self.first_year = first_year
+        self.last_year = last_year
+        self.columns = columns
+
+    def day(self, month, day):
+        i = slot(month, day)
+        return DayClimate(month, day, self.last_year - self.first_year + 1,
+                          **{f: self.columns[f][i] for f in self.FIELDS})
+
+    def to_payload(self):
+        return {"first_year": self.first_year, "last_year": self.last_year,
+                "columns": self.columns}
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(payload["first_year"], payload["last_year"], payload["columns"])
+
+
+def _slot_rows(series, first_year, last_year):
+    """Per calendar-day slot, the ``(year, series index)`` of that day in each
+    fetched year: a strided read down the columns (Feb 29 only in leap years)."""
+    n = len(series.have)
+    bases = [(year, (date(year, 1, 1) - series.start).days, calendar.isleap(year))
+             for year in range(first_year, last_year + 1)]
+    rows = []
+    for k in range(_SLOTS):
+        picked = []
+        for year, base, leap in bases:
+            if not leap and k == _FEB29:
+                continue
+            i = base + (k if leap or k < _FEB29 else k - 1)
+            if 0 <= i < n and series.have[i]:
+                picked.append((year, i))
+        rows.append(picked)
+    return rows
+
+
+def compute(series, first_year, last_year):
+    """Reduce a DailySeries over [first_year, last_year] to a Climatology."""
+    if series.start is None:
+        return Climatology(first_year, last_year,
+                           {f: [None] * _SLOTS for f in Climatology.FIELDS})
+    tmax = series.columns["temp_max"]
+    tmin = series.columns["temp_min"]
+    prcp = series.columns["precip_sum"]
+    rows = _slot_rows(series, first_year, last_year)
+    # (value, year) per calendar day, NaN (missing) left out
+    buckets_max = [[(tmax[i], y) for y, i in r if tmax[i] == tmax[i]] for r in rows]
+    buckets_min = [[(tmin[i], y) for y, i in r if tmin[i] == tmin[i]] for r in rows]
+    buckets_prcp = [[prcp[i] for _, i in r if prcp[i] == prcp[i]] for r in rows]
+
+    def window(buckets, k):
+        for j in range(k - WINDOW_DAYS, k + WINDOW_DAYS + 1):
+            yield from buckets[j % _SLOTS]
+
+    cols = {f: [None] * _SLOTS for f in Climatology.FIELDS}
+    for k in range(_SLOTS):
+        for name, buckets in (("max", buckets_max), ("min", buckets_min)):
+            pooled = [v for v, _ in window(buckets, k)]
+            if pooled:
+                cols[f"normal_{name}"][k] = round(sum(pooled) / len(pooled), 2)
+                cols[f"{name}_deciles"][k] = [round(v, 2) for v in _deciles(pooled)]
+        pooled = list(window(buckets_prcp, k))
+        if pooled:
+            cols["normal_precip"][k] = round(sum(pooled) / len(pooled), 2)
+        if buckets_max[k]:
+            v, y = max(buckets_max[k])
+            cols["record_high"][k], cols["record_high_year"][k] = v, y
+        if buckets_min[k]:
+            v, y = min(buckets_min[k], key=lambda p: (p[0], -p[1]))
+            cols["record_low"][k], cols["record_low_year"][k] = v, y
+    return Climatology(first_year, last_year, cols)
+
+
+def _span(years):
+    last = date.today().year - 1
+    return last - years + 1, last
+
+
+def _key(lat, lon, first, last):
+    return f"{lat:.3f},{lon:.3f}:{first}-{last}"
+
+
+def cached(lat, lon, years=CLIMATE_YEARS):
+    """The location's climatology if already built (no network), else None."""
+    first, last = _span(years)
+    key = _key(lat, lon, first, last)
+    with _lock:
+        clim = _memory.get(key)
+    if clim is None:
+        payload = _cache().get(key)
+        if payload is None:
+            return None
+        clim = Climatology.from_payload(payload)
+        with _lock:
+            _memory[key] = clim
+    return clim
+
+
+def build(lat, lon, years=CLIMATE_YEARS):
+    """Return the location's climatology, downloading and computing it once."""
+    clim = cached(lat, lon, years)
+    if clim is not None:
+        return clim
+    first, last = _span(years)
+    series = historical_service.ensure_archive(lat, lon, date(first, 1, 1), date(last, 12, 31))
+    clim = compute(series, first, last)
+    _cache().set(_key(lat, lon, first, last), clim.to_payload())
+    with _lock:
+        _memory[_key(lat, lon, first, last)] = clim
+    return clim
@@ -1,22 +1,24 @@
 """Nominatim (OpenStreetMap) forward and reverse geocoding.
 
-Forward geocoding is preserved verbatim from the original monolith. Reverse
-geocoding (added for Weather Around Me) is throttled to honor Nominatim's
-~1 req/sec policy and disk-cached permanently (place names don't change).
+Forward geocoding resolves plain city names ("Madison", "Portland, ME") from
+the bundled city caches via a local prefix index; Nominatim handles
+addresses, zip codes, landmarks and anything the caches miss. Reverse
+geocoding (added for Weather Around Me) first answers offline from the nearest
+bundled city within a radius; only points with no bundled city nearby go to
+Nominatim, throttled to honor its ~1 req/sec policy (by the shared per-host
+limiter in ``http``) and disk-cached permanently (place names don't change).
 """
 
-import threading
-import time
-
 from ..constants import NOMINATIM_URL, USER_AGENT
 from ..cache.disk_cache import DiskCache
+from ..city_data import city_index, city_search
 from . import http
 
 NOMINATIM_REVERSE_URL = "https://nominatim.openstreetmap.org/reverse"
 
-# Serialize + throttle reverse-geocode calls across worker threads.
-_reverse_lock = threading.Lock()
-_last_reverse_at = [0.0]
+# Default radius for naming a point after the nearest bundled city.
+OFFLINE_PLACE_RADIUS_KM = 40
+
 _reverse_cache = None  # DiskCache built lazily (avoids filesystem work at import)
 
 
@@ -74,46 +76,84 @@ def build_match(result, specific=True):
     }
 
 
-def geocode(query, specific=True):
+def geocode(query, specific=True, local=True):
     """Return a list of match dicts for a place / city / zip / address query.
 
     Each match: {display, name, city, state, country, kind, importance, lat, lon}.
-    Results are ordered by Nominatim's importance so a genuinely notable place
-    (a city, a university, an airport) outranks an obscure road that merely
-    shares the query text (Nominatim otherwise boosts exact-name matches).
+    With ``local`` on, a query naming a bundled city exactly is answered
+    offline. Otherwise Nominatim results are ordered by its importance so a
+    genuinely notable place (a city, a university, an airport) outranks an
+    obscure road that merely shares the query text (Nominatim otherwise boosts
+    exact-name matches). If Nominatim finds nothing or is unreachable, bundled
+    cities whose names merely start with the query are offered instead.
     """
+    # Digits mean a zip code or street address: always Nominatim.
+    local = local and not any(ch.isdigit() for ch in query)
+    if local:
+        matches = city_search().search(query, exact_only=True)
+        if matches:
+            return matches
+
     params = {
         "q": query, "format": "json", "addressdetails": 1,
         "namedetails": 1, "limit": 8,
     }
     headers = {"User-Agent": USER_AGENT}
-    results = http.get_json(NOMINATIM_URL, params=params, headers=headers)
+    try:
+        results = http.get_json(NOMINATIM_URL, params=params, headers=headers)
+    except Exception:
+        fallback = city_search().search(query) if local else []
+        if fallback:
+            return fallback
+        raise
     matches = [build_match(r, specific) for r in results]
     matches.sort(key=lambda m: m["importance"], reverse=True)
+    if not matches and local:
+        matches = city_search().search(query)
     return matches
 
 
-def reverse_geocode(lat, lon):
-    """Return a short place name for a coordinate (throttled, disk-cached)."""
+def reverse_geocode_offline(lat, lon, max_km=OFFLINE_PLACE_RADIUS_KM):
+    """Name of the nearest bundled city within ``max_km``, or None.
+
+    Formatted like the Nominatim path ("Place, State"; country when the city
+    has no state). Never touches the network.
+    """
+    hits = city_index().nearest(lat, lon, k=1, max_km=max_km)
+    if not hits:
+        return None
+    c = hits[0][1]
+    name = c.get("name") or c.get("display", "")
+    region = c.get("state") or c.get("country") or ""
+    if region and region != name:
+        return f"{name}, {region}"
+    return name
+
+
+def reverse_geocode(lat, lon, max_km=OFFLINE_PLACE_RADIUS_KM):
+    """Return a short place name for a coordinate.
+
+    The nearest bundled city within ``max_km`` wins (instant, offline); pass
+    ``max_km=0`` to force Nominatim. Nominatim results are throttled and
+    disk-cached.
+    """
+    if max_km:
+        name = reverse_geocode_offline(lat, lon, max_km)
+        if name:
+            return name
+
     key = f"{lat:.4f},{lon:.4f}"
     cached = _cache().get(key)
     if cached is not None:
         return cached
 
-    with _reverse_lock:
-        # honor ~1 req/sec
-        elapsed = time.monotonic() - _last_reverse_at[0]
-        if elapsed < 1.1:
-            time.sleep(1.1 - elapsed)
-        try:
-            params = {"lat": lat, "lon": lon, "format": "json", "zoom": 10,
-                      "addressdetails": 1}
-            headers = {"User-Agent": USER_AGENT}
-            data = http.get_json(NOMINATIM_REVERSE_URL, params=params, headers=headers)
-        except Exception:
-            data = None
-        finally:
-            _last_reverse_at[0] = time.monotonic()
+    try:
+        params = {"lat": lat, "lon": lon, "format": "json", "zoom": 10,
+                  "addressdetails": 1}
+        headers = {"User-Agent": USER_AGENT}
+        data = http.get_json(NOMINATIM_REVERSE_URL, params=params, headers=headers)
+    except Exception:
+        data = None
 
     name = _format_place(data, lat, lon)
     if data is not None:
@@ -0,0 +1,154 @@
+"""Incremental parser for large GeoJSON FeatureCollections.
+
+The national NWS ``/alerts/active`` feed is several megabytes, most of it
+polygon coordinates. Instead of ``resp.json()`` on the whole body, this scans
+the response chunk by chunk, cuts out one feature object at a time and yields
+it as soon as its closing brace arrives, so peak memory is roughly one feature
+plus one network chunk and consumers can start work before the download ends.
+
+Geometry handling per feature:
+  ``"parse"``  parse it with the rest of the feature;
+  ``"skip"``   replace it with None (never parsed);
+  ``"defer"``  keep the raw text in a :class:`DeferredGeometry`, parsed only
+               if someone asks (:func:`geometry_of`).
+
+Stdlib only (no ijson); the scanner jumps between structural characters with
+a regex rather than visiting every byte in Python.
+"""
+
+import codecs
+import json
+import re
+
+_SPECIAL = re.compile(r'["{}\[\],:]')
+_STRING_TAIL = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+class DeferredGeometry:
+    """Raw geometry JSON text, parsed on first :meth:`load`."""
+
+    __slots__ = ("text", "_value", "_loaded")
+
+    def __init__(self, text):
+        self.text = text
+        self._value = None
+        self._loaded = False
+
+    def load(self):
+        if not self._loaded:
+            self._value = json.loads(self.text)
+            self._loaded = True
+            self.text = None
+        return self._value
+
+
+def geometry_of(feature):
+    """A feature's geometry dict, parsing a deferred geometry if needed."""
+    geom = feature.get("geometry")
+    if isinstance(geom, DeferredGeometry):
+        geom = feature["geometry"] = geom.load()
+    return geom
+
+
+class FeatureScanner:
+    """Push text in with :meth:`feed`; get back completed feature dicts."""
+
+    def __init__(self, geometry="defer", array_key="features"):
+        self.geometry = geometry
+        self.array_key = array_key
+        self.buf = ""
+        self.pos = 0
+        self.depth = 0
+        self.last_str = None
+        self.key = None            # current key at the top level
+        self.array_depth = None    # depth inside the features array, once found
+        self.done = False
+        self.feat_start = None
+        self.geom_start = None
+        self.geom_span = None
+
+    def feed(self, text):
+        self.buf += text
+        out = []
+        buf = self.buf
+        pos = self.pos
+        while not self.done:
+            m = _SPECIAL.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            i = m.start()
+            ch = buf[i]
+            if ch == '"':
+                tail = _STRING_TAIL.match(buf, i + 1)
+                if tail is None:       # string continues in the next chunk
+                    pos = i
+                    break
+                self.last_str = buf[i + 1:tail.end() - 1]
+                pos = tail.end()
+                continue
+            pos = i + 1
+            if ch == ":":
+                if self.depth == 1:
+                    self.key = self.last_str
+                elif (self.feat_start is not None and self.depth == self.array_depth + 1
+                      and self.last_str == "geometry"):
+                    self.geom_start = pos
+            elif ch in "{[":
+                if (ch == "[" and self.array_depth is None and self.depth == 1
+                        and self.key == self.array_key):
+                    self.array_depth = 2
+                elif (ch == "{" and self.array_depth is not None
+                      and self.depth == self.array_depth and self.feat_start is None):
+                    self.feat_start = i
+                self.depth += 1
+            elif ch in "}]":
+                if self.geom_start is not None and self.depth == self.array_depth + 1:
+                    self._close_geometry(i)
+                self.depth -= 1
+                if self.feat_start is not None and self.depth == self.array_depth:
+                    out.append(self._emit(buf, i + 1))
+                elif ch == "]" and self.array_depth is not None and self.depth == 1:
+                    self.done = True
+            elif ch == ",":
+                if self.geom_start is not None and self.depth == self.array_depth + 1:
+                    self._close_geometry(i)
+            self.last_str = None if ch != ":" else self.last_str
+        # Keep only what an unfinished feature / string still needs.
+        keep = self.feat_start if self.feat_start is not None else pos
+        self.buf = buf[keep:]
+        self.pos = pos - keep
+        if self.feat_start is not None:
+            self.feat_start -= keep
+            if self.geom_start is not None:
+                self.geom_start -= keep
+            if self.geom_span is not None:
+                self.geom_span = (self.geom_span[0] - keep, self.geom_span[1] - keep)
+        return out
+
+    def _close_geometry(self, end):
+        self.geom_span = (self.geom_start, end)
+        self.geom_start = None
+
+    def _emit(self, buf, end):
+        start, span = self.feat_start, self.geom_span
+        self.feat_start = self.geom_span = None
+        if span is None or self.geometry == "parse":
+            return json.loads(buf[start:end])
+        feature = json.loads(buf[start:span[0]] + "null" + buf[span[1]:end])
+        raw = buf[span[0]:span[1]].strip()
+        if self.geometry == "defer" and raw != "null":
+            feature["geometry"] = DeferredGeometry(raw)
+        return feature
+
+
+def iter_features(chunks, geometry="defer"):
+    """Yield feature dicts from an iterable of byte (or str) chunks."""
+    scanner = FeatureScanner(geometry=geometry)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield from scanner.feed(text)
+        if scanner.done:
+            return
+    yield from scanner.feed(decoder.decode(b"", final=True))
@@ -2,28 +2,288 @@
 
 The archive lags real time by a few days; for very recent dates the forecast
 API's past_days provides the same daily fields with no lag. Results are disk-
-cached (historical data never changes). Multi-year lookups fetch each year
-concurrently.
+cached (historical data never changes).
+
+Each location keeps one contiguous :class:`DailySeries` on disk. Range
+queries fetch only the days it is missing and merge them in, so browsing
+adjacent months costs just the new days. Multi-year lookups fill whole years,
+then read the calendar day out of every year locally, so any other date for
+the same city costs nothing. After a browse view, :func:`prefetch_adjacent`
+fills the neighbouring ranges in the background.
+
+Only downloads longer than a chunk (a decade of daily data, a year of hourly)
+are split; the chunks are fetched in parallel (paced by the shared open-meteo
+rate limit), each retried on its own and merged into the series as it lands.
+The series is saved as chunks complete, so a failed or interrupted pull keeps
+what arrived and the next call fetches only the rest.
+
+Hourly history (:func:`ensure_hourly`) is downloaded the same way into a
+memory-mapped columnar :class:`~.hourly_store.HourlyStore`, so multi-year
+hourly analysis never materialises the data as JSON or Python objects.
 """
 
-from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 
 from ..cache.disk_cache import DiskCache
+from ..cache.memory_cache import TTLCache
 from ..constants import OPEN_METEO_API_URL, OPEN_METEO_ARCHIVE_URL
-from ..models.historical import HistoricalDay
+from ..models.historical import DAILY_FIELDS, HOURLY_FIELDS, DailySeries, HistoricalDay
+from ..paths import cache_dir
 from . import http
+from .hourly_store import HourlyStore
+
+_DAILY = ",".join(DAILY_FIELDS)
+_HOURLY = ",".join(HOURLY_FIELDS)
+
+ARCHIVE_LAG_DAYS = 7          # the archive is complete up to about this long ago
+ARCHIVE_CHUNK_YEARS = 10      # calendar years per daily archive request
+HOURLY_CHUNK_YEARS = 1        # calendar years per hourly archive request (24x the rows)
+ARCHIVE_WORKERS = 4           # chunks in flight at once
+ARCHIVE_CHUNK_ATTEMPTS = 3    # tries per chunk (on top of http's own retries)
+ARCHIVE_RETRY_DELAY = 1.0     # seconds before a chunk's second try, then doubled
+ARCHIVE_TIMEOUT = 30          # seconds; a long archive chunk is slow to build
+ARCHIVE_SAVE_INTERVAL = 5.0   # seconds between saves during a long pull
+
+GAP_MERGE_DAYS = 7            # fetch across stored runs shorter than this
+PREFETCH_STEPS = 2            # browse views warmed ahead of and behind the current one
+ARCHIVE_BATCH_SIZE = 10       # locations per multi-coordinate archive request
+
+_recent = TTLCache(default_ttl=3600)
+_series_disk = None
+_series = {}                  # location key -> DailySeries (loaded from disk once)
+_hourly = {}                  # location key -> HourlyStore
+_series_locks = {}
+_series_guard = threading.Lock()
+_prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="historical-prefetch")
+_prefetch_generation = [0]
+
+
+def _series_cache():
+    global _series_disk
+    if _series_disk is None:
+        _series_disk = DiskCache("historical_series", max_age=None)  # permanent
+    return _series_disk
+
+
+def _hourly_dir():
+    return os.path.join(cache_dir(), "historical_hourly")
+
+
+def _series_key(lat, lon):
+    return f"{lat:.3f},{lon:.3f}"
+
+
+def _location_lock(key):
+    with _series_guard:
+        return _series_locks.setdefault(key, threading.Lock())
+
+
+def load_series(lat, lon):
+    """The location's DailySeries (empty if nothing was fetched yet)."""
+    key = _series_key(lat, lon)
+    with _series_guard:
+        series = _series.get(key)
+    if series is None:
+        payload = _series_cache().get(key)
+        series = DailySeries.from_payload(payload) if payload else DailySeries()
+        with _series_guard:
+            series = _series.setdefault(key, series)
+    return series
+
+
+def _archive_daily(lat, lon, start, end):
+    data = http.get_json(OPEN_METEO_ARCHIVE_URL, params={
+        "latitude": lat, "longitude": lon, "timezone": "auto",
+        "daily": _DAILY, "start_date": start.isoformat(), "end_date": end.isoformat(),
+    }, timeout=ARCHIVE_TIMEOUT)
+    return data.get("daily", {})
+
+
+def _archive_daily_many(coords, start, end):
+    """One archive request for several (lat, lon); a daily block per location."""
+    data = http.get_json(OPEN_METEO_ARCHIVE_URL, params={
+        "latitude": ",".join(str(lat) for lat, _ in coords),
+        "longitude": ",".join(str(lon) for _, lon in coords),
+        "timezone": "auto", "daily": _DAILY,
+        "start_date": start.isoformat(), "end_date": end.isoformat(),
+    }, timeout=ARCHIVE_TIMEOUT)
+    results = data if isinstance(data, list) else [data]
+    if len(results) != len(coords):
+        raise ValueError(f"archive returned {len(results)} locations, "
+                         f"expected {len(coords)}")
+    return [r.get("daily", {}) for r in results]
+
+
+def _archive_hourly(lat, lon, start, end):
+    data = http.get_json(OPEN_METEO_ARCHIVE_URL, params={
+        "latitude": lat, "longitude": lon, "timezone": "auto",
+        "hourly": _HOURLY, "start_date": start.isoformat(), "end_date": end.isoformat(),
+    }, timeout=ARCHIVE_TIMEOUT)
+    return data.get("hourly", {})
+
+
+def _retrying(fetch, start, end):
+    """``fetch(start, end)`` for one chunk, retried so one bad chunk is not fatal."""
+    for attempt in range(ARCHIVE_CHUNK_ATTEMPTS):
+        try:
+            return fetch(start, end)
+        except http.CircuitOpenError:
+            raise              # the host is down; do not queue more attempts
+        except Exception:  # noqa: BLE001 - retried, re-raised on the last try
+            if attempt + 1 >= ARCHIVE_CHUNK_ATTEMPTS:
+                raise
+            time.sleep(ARCHIVE_RETRY_DELAY * 2 ** attempt)
+
+
+def _pull(chunks, fetch, merge, save):
+    """Fetch chunks in parallel, merging each one as it completes.
+
+    ``save`` runs every ARCHIVE_SAVE_INTERVAL and once at the end, also after
+    a failure. A chunk that still fails after its retries does not stop the
+    others; the first such error is raised once they are all merged.
+    """
+    error = None
+    saved = time.monotonic()
+    with ThreadPoolExecutor(max_workers=min(ARCHIVE_WORKERS, len(chunks))) as ex:
+        futures = {ex.submit(_retrying, fetch, s, e): (s, e) for s, e in chunks}
+        try:
+            for fut in as_completed(futures):
+                try:
+                    block = fut.result()
+                except Exception as e:  # noqa: BLE001 - keep the other chunks
+                    error = error or e
+                    continue
+                merge(block, *futures[fut])
+                if time.monotonic() - saved >= ARCHIVE_SAVE_INTERVAL:
+                    save()
+                    saved = time.monotonic()
+        finally:
+            for fut in futures:
+                fut.cancel()
+            save()
+    if error is not None:
+        raise error
+
+
+def _coalesce(gaps, slack):
+    """Join gaps separated by fewer than ``slack`` stored days (one request)."""
+    out = []
+    for start, end in gaps:
+        if out and (start - out[-1][1]).days <= slack:
+            out[-1] = (out[-1][0], end)
+        else:
+            out.append((start, end))
+    return out
+
 
-_DAILY = "weathercode,temperature_2m_max,temperature_2m_min,precipitation_sum,snowfall_sum,windspeed_10m_max"
+def _chunks(gaps, years):
+    """Split gaps at calendar-year boundaries, ``years`` years per chunk."""
+    for start, end in gaps:
+        while start <= end:
+            stop = min(end, date(start.year + years - 1, 12, 31))
+            yield start, stop
+            start = stop + timedelta(days=1)
 
-_cache = None
 
+def ensure_archive(lat, lon, start, end):
+    """Make sure the location's series holds [start, end]; return the series.
 
-def _disk():
-    global _cache
-    if _cache is None:
-        _cache = DiskCache("historical", max_age=None)  # permanent
-    return _cache
+    Only the missing sub-ranges are requested (nearby gaps joined, long ones
+    split into ARCHIVE_CHUNK_YEARS chunks fetched ARCHIVE_WORKERS at a time)
+    and merged into the stored series as each arrives. If a chunk still fails
+    after its retries the others are kept and saved, and the first error is
+    raised. Days newer than the archive lag are left for later.
+    """
+    end = min(end, date.today() - timedelta(days=ARCHIVE_LAG_DAYS))
+    key = _series_key(lat, lon)
+    with _location_lock(key):
+        series = load_series(lat, lon)
+        if start > end:
+            return series
+        gaps = _coalesce(series.missing(start, end), GAP_MERGE_DAYS)
+        if not gaps:
+            return series
+        _pull(list(_chunks(gaps, ARCHIVE_CHUNK_YEARS)),
+              lambda s, e: _archive_daily(lat, lon, s, e), series.merge,
+              lambda: _series_cache().set(key, series.to_payload()))
+    return series
+
+
+def ensure_archive_many(coords, start, end):
+    """:func:`ensure_archive` for several locations; returns their series.
+
+    Locations missing the same span of [start, end] share multi-coordinate
+    requests (ARCHIVE_BATCH_SIZE at a time, long spans chunked in parallel),
+    and each response is split back into its location's series. N cities that
+    all lack a date cost one round trip per batch instead of N.
+    """
+    end = min(end, date.today() - timedelta(days=ARCHIVE_LAG_DAYS))
+    keys = {}
+    for lat, lon in coords:
+        keys.setdefault(_series_key(lat, lon), (lat, lon))
+    with ExitStack() as stack:
+        for key in sorted(keys):      # fixed order: no deadlock between callers
+            stack.enter_context(_location_lock(key))
+        series = {key: load_series(lat, lon) for key, (lat, lon) in keys.items()}
+        if start > end:
+            return [series[_series_key(lat, lon)] for lat, lon in coords]
+        spans = {}                    # (first missing, last missing) -> keys
+        for key, s in series.items():
+            gaps = s.missing(start, end)
+            if gaps:
+                spans.setdefault((gaps[0][0], gaps[-1][1]), []).append(key)
+        for span, span_keys in spans.items():
+            for i in range(0, len(span_keys), ARCHIVE_BATCH_SIZE):
+                batch = span_keys[i:i + ARCHIVE_BATCH_SIZE]
+
+                def merge(blocks, s, e, batch=batch):
+                    for key, daily in zip(batch, blocks):
+                        series[key].merge(daily, s, e)
+
+                def save(batch=batch):
+                    for key in batch:
+                        _series_cache().set(key, series[key].to_payload())
+
+                _pull(list(_chunks([span], ARCHIVE_CHUNK_YEARS)),
+                      lambda s, e, batch=batch: _archive_daily_many(
+                          [keys[k] for k in batch], s, e),
+                      merge, save)
+    return [series[_series_key(lat, lon)] for lat, lon in coords]
+
+
+def load_hourly(lat, lon):
+    """The location's HourlyStore (opened from disk once; may be empty)."""
+    key = _series_key(lat, lon)
+    with _series_guard:
+        store = _hourly.get(key)
+        if store is None:
+            name = key.replace(",", "_").replace("-", "m")
+            store = _hourly[key] = HourlyStore(os.path.join(_hourly_dir(), name))
+        return store
+
+
+def ensure_hourly(lat, lon, start, end):
+    """Make sure the location's HourlyStore holds days [start, end]; return it.
+
+    Same chunked, resumable download as :func:`ensure_archive`, in
+    HOURLY_CHUNK_YEARS chunks; use the store's ``values``/``daily``/
+    ``rolling_sum`` to analyse the result.
+    """
+    end = min(end, date.today() - timedelta(days=ARCHIVE_LAG_DAYS))
+    with _location_lock("hourly:" + _series_key(lat, lon)):
+        store = load_hourly(lat, lon)
+        if start > end:
+            return store
+        gaps = _coalesce(store.missing(start, end), GAP_MERGE_DAYS)
+        if gaps:
+            _pull(list(_chunks(gaps, HOURLY_CHUNK_YEARS)),
+                  lambda s, e: _archive_hourly(lat, lon, s, e), store.merge, store.flush)
+    return store
 
 
 def _day_from(daily, idx):
@@ -41,60 +301,152 @@ def _day_from(daily, idx):
     )
 
 
-def _fetch_range_raw(lat, lon, start_date, end_date):
-    """Fetch a date range, choosing archive vs forecast-past_days by recency."""
-    today = date.today()
-    end = date.fromisoformat(end_date)
-    recent_cutoff = today - timedelta(days=10)
-
-    if end >= recent_cutoff:
-        # Use forecast past_days for recency (archive lags a few days).
-        past_days = min(92, (today - date.fromisoformat(start_date)).days + 1)
-        data = http.get_json(OPEN_METEO_API_URL, params={
-            "latitude": lat, "longitude": lon, "timezone": "auto",
-            "daily": _DAILY, "past_days": max(1, past_days), "forecast_days": 1,
-        })
-    else:
-        data = http.get_json(OPEN_METEO_ARCHIVE_URL, params={
-            "latitude": lat, "longitude": lon, "timezone": "auto",
-            "daily": _DAILY, "start_date": start_date, "end_date": end_date,
-        })
-    return data.get("daily", {})
+def _recent_days(lat, lon, start, end):
+    """Days too new for the archive, from the forecast API's past_days."""
+    key = f"{_series_key(lat, lon)}:{start}:{end}"
+    cached = _recent.get(key)
+    if cached is not None:
+        return cached
+    past_days = min(92, (date.today() - start).days + 1)
+    data = http.get_json(OPEN_METEO_API_URL, params={
+        "latitude": lat, "longitude": lon, "timezone": "auto",
+        "daily": _DAILY, "past_days": max(1, past_days), "forecast_days": 1,
+    })
+    daily = data.get("daily", {})
+    lo, hi = start.isoformat(), end.isoformat()
+    days = [_day_from(daily, i) for i, t in enumerate(daily.get("time", []))
+            if lo <= t <= hi]
+    _recent.set(key, days)
+    return days
 
 
 def fetch_range(lat, lon, start_date, end_date):
-    """Return HistoricalDay list for [start_date, end_date] inclusive."""
-    key = f"range:{lat:.3f},{lon:.3f}:{start_date}:{end_date}"
-    cached = _disk().get(key)
-    if cached is not None:
-        return [HistoricalDay(**d) for d in cached]
+    """Return HistoricalDay list for [start_date, end_date] inclusive.
 
-    daily = _fetch_range_raw(lat, lon, start_date, end_date)
-    times = daily.get("time", [])
+    Archive-age days are served from the location's DailySeries, fetching
+    only the sub-ranges it does not hold yet, so overlapping or adjacent
+    ranges cost just their new days. Days inside the archive lag come from
+    the forecast API and are cached briefly in memory (they can still be
+    revised), never stored in the series.
+    """
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    archive_end = date.today() - timedelta(days=ARCHIVE_LAG_DAYS)
     days = []
-    for i, t in enumerate(times):
-        if start_date <= t <= end_date:
-            days.append(_day_from(daily, i))
-    _disk().set(key, [d.__dict__ for d in days])
+    if start <= archive_end:
+        last = min(end, archive_end)
+        days.extend(ensure_archive(lat, lon, start, last).days(start, last))
+    if end > archive_end:
+        days.extend(_recent_days(lat, lon, max(start, archive_end + timedelta(days=1)), end))
     return days
 
 
+def compare_day(coords, day_iso):
+    """One HistoricalDay per (lat, lon) for the same date, in ``coords`` order.
+
+    Archive-age dates are filled for every location with batched requests
+    (see :func:`ensure_archive_many`); recent dates fall back to
+    :func:`fetch_single_day` per location.
+    """
+    day = date.fromisoformat(day_iso)
+    if day > date.today() - timedelta(days=ARCHIVE_LAG_DAYS):
+        return [fetch_single_day(lat, lon, day_iso) for lat, lon in coords]
+    error = "No data"
+    try:
+        series = ensure_archive_many(coords, day, day)
+    except Exception as e:  # noqa: BLE001 - keep the locations that did arrive
+        series = [load_series(lat, lon) for lat, lon in coords]
+        error = str(e)
+    out = []
+    for s in series:
+        found = s.day(day)
+        out.append(found if found is not None else HistoricalDay(date=day_iso, error=error))
+    return out
+
+
+def _prefetch_range(lat, lon, start, end):
+    """Warm [start, end] without holding up foreground loads of the location.
+
+    Like :func:`fetch_range`, but the archive chunks are downloaded outside
+    the location lock; it is taken only to find the gaps and to merge and
+    save each chunk, so the user's own request never waits on a prefetch.
+    """
+    archive_end = date.today() - timedelta(days=ARCHIVE_LAG_DAYS)
+    if start <= archive_end:
+        key = _series_key(lat, lon)
+        lock = _location_lock(key)
+        with lock:
+            gaps = _coalesce(load_series(lat, lon).missing(start, min(end, archive_end)),
+                             GAP_MERGE_DAYS)
+        for s, e in _chunks(gaps, ARCHIVE_CHUNK_YEARS):
+            daily = _retrying(lambda a, b: _archive_daily(lat, lon, a, b), s, e)
+            with lock:
+                series = load_series(lat, lon)
+                series.merge(daily, s, e)
+                _series_cache().set(key, series.to_payload())
+    if end > archive_end:
+        _recent_days(lat, lon, max(start, archive_end + timedelta(days=1)), end)
+
+
+def prefetch_adjacent(lat, lon, start_date, end_date, steps=PREFETCH_STEPS):
+    """Warm the ranges around a browse view so stepping to them is local.
+
+    Queues ``steps`` views' worth of days after and before [start_date,
+    end_date] (one request each way) on a single background worker, so a
+    prefetch never competes with more than one foreground request. A newer
+    call or :func:`cancel_prefetch` supersedes any prefetch still waiting.
+    Downloads run outside the location lock (see :func:`_prefetch_range`).
+    Returns the Future; prefetch errors are swallowed (the view will simply
+    fetch on demand).
+    """
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    span = timedelta(days=((end - start).days + 1) * steps)
+    today = date.today()
+    ranges = []
+    if end < today:
+        ranges.append((end + timedelta(days=1), min(end + span, today)))
+    ranges.append((start - span, start - timedelta(days=1)))
+    with _series_guard:
+        _prefetch_generation[0] += 1
+        generation = _prefetch_generation[0]
+
+    def work():
+        for lo, hi in ranges:
+            if _prefetch_generation[0] != generation:
+                return
+            try:
+                _prefetch_range(lat, lon, lo, hi)
+            except Exception:  # noqa: BLE001 - best-effort warm-up
+                pass
+    return _prefetch_pool.submit(work)
+
+
+def cancel_prefetch():
+    """Drop queued prefetches (one already downloading finishes its request)."""
+    with _series_guard:
+        _prefetch_generation[0] += 1
+
+
 def fetch_single_day(lat, lon, day_iso):
     days = fetch_range(lat, lon, day_iso, day_iso)
     return days[0] if days else HistoricalDay(date=day_iso, error="No data")
 
 
 def fetch_multi_year(lat, lon, month, day, years_back):
-    """Same calendar day across the past `years_back` years, newest first."""
+    """Same calendar day across the past `years_back` years, newest first.
+
+    Fetches the whole span of years once (see ``ensure_archive``), so later
+    calls for any calendar day at this location are answered locally.
+    """
     this_year = date.today().year
     years = list(range(this_year - 1, this_year - 1 - years_back, -1))
-
-    def one(year):
-        iso = f"{year:04d}-{month:02d}-{day:02d}"
-        try:
-            return fetch_single_day(lat, lon, iso)
-        except Exception as e:  # noqa: BLE001
-            return HistoricalDay(date=iso, error=str(e))
-
-    with ThreadPoolExecutor(max_workers=5) as ex:
-        return list(ex.map(one, years))
+    if not years:
+        return []
+    try:
+        series = ensure_archive(lat, lon, date(years[-1], 1, 1), date(years[0], 12, 31))
+    except Exception as e:  # noqa: BLE001 - keep whatever chunks did arrive
+        days = load_series(lat, lon).same_day(month, day, years)
+        for d in days:
+            if d.error == "No data":
+                d.error = str(e)
+        return days
+    return series.same_day(month, day, years)
@@ -0,0 +1,252 @@
+"""Columnar on-disk store for one location's hourly history.
+
+Multi-year hourly data is hundreds of thousands of rows per variable, far too
+much to keep as JSON dicts. Each variable is instead a flat file of float64
+values (NaN = missing), one per hour from local midnight of ``start``, and is
+memory-mapped, so reading a slice copies just those bytes and only the pages
+an analysis touches are loaded. ``have.bin`` holds one byte per day marking
+what has been fetched; ``meta.json`` holds the start date and byte order.
+
+Layout of a store directory::
+
+    meta.json   {"start": "YYYY-MM-DD", "byteorder": "little"}
+    have.bin    one byte per day
+    <col>.f64   24 float64 per day, per column in HOURLY_FIELDS
+"""
+
+import json
+import mmap
+import os
+import sys
+import threading
+from array import array
+from datetime import date, datetime, timedelta
+
+from ..models.historical import HOURLY_FIELDS
+
+_NAN = float("nan")
+_NAN_DAY = array("d", [_NAN] * 24).tobytes()
+_ITEM = 8
+
+_AGGREGATES = {
+    "max": max,
+    "min": min,
+    "sum": sum,
+    "mean": lambda v: sum(v) / len(v),
+}
+
+
+def _write_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class HourlyStore:
+    """Memory-mapped hourly columns for one location (see module docstring)."""
+
+    def __init__(self, path, columns=tuple(HOURLY_FIELDS.values())):
+        self.path = path
+        self.columns = tuple(columns)
+        self.start = None
+        self.have = bytearray()
+        self._maps = {}        # column -> (file, mmap, memoryview of doubles)
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # -- files ----------------------------------------------------------------
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _load(self):
+        try:
+            with open(self._file("meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self._file("have.bin"), "rb") as f:
+                have = bytearray(f.read())
+        except (OSError, ValueError):
+            return
+        if meta.get("byteorder") != sys.byteorder or not meta.get("start"):
+            return             # written on another architecture; refetch
+        self.start = date.fromisoformat(meta["start"])
+        self.have = have
+        self._remap()
+
+    def _unmap(self):
+        for f, mm, view in self._maps.values():
+            view.release()
+            mm.close()
+            f.close()
+        self._maps = {}
+
+    def _remap(self):
+        """(Re)open every column, padding short files to ``len(have)`` days."""
+        self._unmap()
+        size = len(self.have) * 24 * _ITEM
+        if not size:
+            return
+        for col in self.columns:
+            name = self._file(col + ".f64")
+            with open(name, "ab") as f:
+                short = size - f.tell()
+                if short > 0:
+                    f.write(_NAN_DAY * (short // (24 * _ITEM)))
+            f = open(name, "r+b")
+            mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_WRITE)
+            self._maps[col] = (f, mm, memoryview(mm).cast("d"))
+
+    def flush(self):
+        """Write pending values and the day index to disk."""
+        with self._lock:
+            for _f, mm, _view in self._maps.values():
+                mm.flush()
+            _write_atomic(self._file("have.bin"), bytes(self.have))
+            meta = {"start": self.start.isoformat() if self.start else None,
+                    "byteorder": sys.byteorder}
+            _write_atomic(self._file("meta.json"), json.dumps(meta).encode("utf-8"))
+
+    def close(self):
+        with self._lock:
+            self._unmap()
+
+    # -- coverage -------------------------------------------------------------
+    @property
+    def end(self):
+        return self.start + timedelta(days=len(self.have) - 1) if self.have else None
+
+    def _cover(self, start, end):
+        """Grow every column (with unfetched days) to span [start, end]."""
+        if self.start is None:
+            self.start = start
+        if start < self.start:
+            pad = (self.start - start).days
+            self._unmap()
+            for col in self.columns:
+                name = self._file(col + ".f64")
+                try:
+                    with open(name, "rb") as f:
+                        old = f.read()
+                except OSError:
+                    old = b""
+                _write_atomic(name, _NAN_DAY * pad + old)
+            self.have[:0] = bytes(pad)
+            self.start = start
+        extra = (end - self.start).days + 1 - len(self.have)
+        if extra > 0:
+            self.have.extend(bytes(extra))
+        if extra > 0 or not self._maps:
+            self._remap()
+
+    def missing(self, start, end):
+        """Day ranges in [start, end] not fetched yet, as (start, end) dates."""
+        with self._lock:
+            if not self.have:
+                return [(start, end)]
+            gaps, run = [], None
+            d = start
+            while d <= end:
+                i = (d - self.start).days
+                fetched = 0 <= i < len(self.have) and self.have[i]
+                if not fetched and run is None:
+                    run = d
+                elif fetched and run is not None:
+                    gaps.append((run, d - timedelta(days=1)))
+                    run = None
+                d += timedelta(days=1)
+            if run is not None:
+                gaps.append((run, end))
+            return gaps
+
+    def merge(self, hourly, start, end):
+        """Store an Open-Meteo ``hourly`` block fetched for days [start, end]."""
+        with self._lock:
+            self._cover(start, end)
+            base = self.start.toordinal()
+            lo, hi = (start.toordinal() - base) * 24, (end.toordinal() - base) * 24 + 23
+            rows = []
+            for t in hourly.get("time") or []:
+                when = datetime.fromisoformat(t)
+                rows.append((when.toordinal() - base) * 24 + when.hour)
+            for api_name, col in HOURLY_FIELDS.items():
+                if col not in self._maps:
+                    continue
+                view = self._maps[col][2]
+                for i, v in zip(rows, hourly.get(api_name) or []):
+                    if lo <= i <= hi:
+                        view[i] = _NAN if v is None else float(v)
+            a, b = lo // 24, hi // 24
+            self.have[a:b + 1] = b"\x01" * (b - a + 1)
+
+    # -- reading --------------------------------------------------------------
+    def index(self, when):
+        """Hour offset of a datetime (or a date's midnight) from ``start``."""
+        if not isinstance(when, datetime):
+            return (when - self.start).days * 24
+        return (when.date() - self.start).days * 24 + when.hour
+
+    def values(self, col, start, end):
+        """Hourly values of ``col`` for days [start, end] as ``array('d')``.
+
+        Copied straight out of the memory map (nothing outside the range is
+        read); hours outside the stored span are NaN.
+        """
+        with self._lock:
+            n = ((end - start).days + 1) * 24
+            if self.start is None or col not in self._maps:
+                return array("d", [_NAN]) * n
+            lo = self.index(start)
+            hi = lo + n
+            view = self._maps[col][2]
+            a, b = max(lo, 0), min(hi, len(view))
+            out = array("d")
+            if a < b:
+                out.frombytes(view[a:b].cast("B"))
+            if a > lo or b < hi:
+                head = array("d", [_NAN]) * (min(a, hi) - lo)
+                tail = array("d", [_NAN]) * (hi - max(b, lo))
+                out = head + out + tail
+            return out
+
+    def times(self, start, end):
+        """Datetimes matching :meth:`values` for days [start, end]."""
+        first = datetime(start.year, start.month, start.day)
+        return [first + timedelta(hours=h) for h in range(((end - start).days + 1) * 24)]
+
+    def daily(self, col, start, end, how="max"):
+        """Per-day aggregate (max, min, sum or mean) of ``col``.
+
+        Returns ``[(date, value)]`` for [start, end]; value is None for a day
+        with no data. Missing hours are skipped.
+        """
+        agg = _AGGREGATES[how]
+        values = self.values(col, start, end)
+        out = []
+        for k in range((end - start).days + 1):
+            hours = [v for v in values[k * 24:(k + 1) * 24] if v == v]
+            out.append((start + timedelta(days=k), agg(hours) if hours else None))
+        return out
+
+    def rolling_sum(self, col, start, end, window):
+        """Trailing ``window``-hour sums of ``col`` for every hour of [start, end].
+
+        Missing hours count as zero; a window with no data at all is NaN. The
+        first hours include the end of the day before ``start`` when stored.
+        """
+        values = self.values(col, start - timedelta(days=(window - 1) // 24 + 1), end)
+        skip = len(values) - ((end - start).days + 1) * 24
+        out = array("d")
+        total, count = 0.0, 0
+        for i, v in enumerate(values):
+            if v == v:
+                total += v
+                count += 1
+            if i >= window:
+                old = values[i - window]
+                if old == old:
+                    total -= old
+                    count -= 1
+            if i >= skip:
+                out.append(total if count else _NAN)
+        return out
@@ -2,14 +2,53 @@
 
 A descriptive User-Agent is required by Nominatim and NWS (api.weather.gov
 rejects requests without one). Kept here so every service shares the policy.
+
+Outbound requests are also rate limited per host with token buckets, so
+parallel fetches run at the fastest rate each service allows without tripping
+429s, and Nominatim's 1 req/sec policy holds across every worker thread.
+
+Transient failures (connection errors, timeouts, 429 and 5xx) are retried with
+jittered exponential backoff, honoring ``Retry-After``. A per-host circuit
+breaker opens after repeated failures so queued jobs fail fast for a cool-down
+instead of each waiting out ``DEFAULT_TIMEOUT``; ``breaker_states()`` reports
+it for diagnostics.
+
+``get_json(..., cache=True)`` adds an HTTP-semantics cache: responses are kept
+with their ``ETag`` / ``Last-Modified`` validators, served without a request
+while ``Cache-Control: max-age`` says they are fresh, and revalidated with
+``If-None-Match`` / ``If-Modified-Since`` afterwards, so an unchanged feed
+costs a few hundred bytes (HTTP 304) instead of a full download.
+
+``get_features`` streams a large GeoJSON FeatureCollection instead, yielding
+features as they arrive (see :mod:`.geojson_stream`) with the same
+conditional-request handling.
 """
 
+import email.utils
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
 import requests
 
 from ..constants import DEFAULT_TIMEOUT, USER_AGENT
+from .geojson_stream import iter_features
 
 _session = None
 
+# host (or parent domain) -> (requests per second, burst). Subdomains share
+# their parent's bucket, so every *.open-meteo.com endpoint draws on one quota.
+# Hosts not listed here are not limited.
+HOST_RATES = {
+    "nominatim.openstreetmap.org": (1 / 1.1, 1),  # usage policy: <= 1 req/sec
+    "api.weather.gov": (5.0, 10),
+    "open-meteo.com": (10.0, 20),                 # free tier: 600 req/min
+    "api.weather.gc.ca": (5.0, 5),                # MSC GeoMet (ECCC paging)
+}
+
 
 def session():
     global _session
@@ -19,8 +58,425 @@ def session():
     return _session
 
 
-def get_json(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT):
-    """GET a URL and return parsed JSON, raising on HTTP error."""
-    resp = session().get(url, params=params, headers=headers, timeout=timeout)
-    resp.raise_for_status()
-    return resp.json()
+class TokenBucket:
+    """Thread-safe token bucket that never sleeps while holding its lock.
+
+    ``reserve`` takes a token immediately and returns how long the caller must
+    wait before using it; the balance may go negative, which queues later
+    callers behind earlier ones. Concurrent callers therefore pipeline at
+    exactly ``rate`` per second instead of serializing on a held lock.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token; return the seconds to wait before it is valid."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block (without holding the lock) until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_buckets = {}  # configured host key -> TokenBucket
+_buckets_lock = threading.Lock()
+
+
+def _rate_key(host):
+    """The HOST_RATES key governing ``host`` (exact or parent domain), or None."""
+    parts = (host or "").lower().split(".")
+    for i in range(len(parts) - 1):
+        key = ".".join(parts[i:])
+        if key in HOST_RATES:
+            return key
+    return None
+
+
+def set_rate_limit(host, rate, burst=1):
+    """Configure (or with ``rate=None`` remove) the limit for a host."""
+    with _buckets_lock:
+        _buckets.pop(host, None)
+        if rate is None:
+            HOST_RATES.pop(host, None)
+        else:
+            HOST_RATES[host] = (rate, burst)
+
+
+def limiter(host):
+    """The shared TokenBucket for a host, or None when it is unlimited."""
+    key = _rate_key(host)
+    if key is None:
+        return None
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            rate, burst = HOST_RATES[key]
+            bucket = _buckets[key] = TokenBucket(rate, burst)
+        return bucket
+
+
+def throttle(url):
+    """Wait for the URL's host rate limit (no-op for unlimited hosts)."""
+    bucket = limiter(urlsplit(url).hostname)
+    if bucket is not None:
+        bucket.acquire()
+
+
+# -- retry / circuit breaker --------------------------------------------------
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 2            # attempts = 1 + MAX_RETRIES
+BACKOFF_BASE = 0.5         # seconds; doubled per attempt, full jitter
+BACKOFF_MAX = 8.0
+RETRY_AFTER_MAX = 30.0     # never honor a Retry-After longer than this
+BREAKER_THRESHOLD = 5      # consecutive failures that open the breaker
+BREAKER_COOLDOWN = 30.0    # seconds a host is short-circuited
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a host's breaker is open."""
+
+
+class CircuitBreaker:
+    """closed -> (threshold failures) -> open -> (cool-down) -> half-open.
+
+    Half-open lets a single trial request through: success closes the
+    breaker, failure re-opens it for another cool-down.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def state(self):
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now):
+        if self.opened_at is None:
+            return "closed"
+        if now - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def allow(self):
+        """True if a request may go out now (claims the half-open trial)."""
+        with self._lock:
+            st = self._state(time.monotonic())
+            if st == "closed":
+                return True
+            if st == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+    def snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            st = self._state(now)
+            retry_in = (max(0.0, self.cooldown - (now - self.opened_at))
+                        if st == "open" else 0.0)
+            return {"state": st, "failures": self.failures, "retry_in": round(retry_in, 1)}
+
+
+_breakers = {}  # hostname -> CircuitBreaker
+_breakers_lock = threading.Lock()
+
+
+def breaker(host):
+    with _breakers_lock:
+        b = _breakers.get(host)
+        if b is None:
+            b = _breakers[host] = CircuitBreaker()
+        return b
+
+
+def breaker_states():
+    """{host: {state, failures, retry_in}} for every host contacted so far."""
+    with _breakers_lock:
+        items = list(_breakers.items())
+    return {host: b.snapshot() for host, b in items}
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def _retry_after(resp):
+    """Seconds requested by a Retry-After header (delta or HTTP date), or None."""
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _backoff(attempt, resp=None):
+    hinted = _retry_after(resp)
+    if hinted is not None:
+        return min(hinted, RETRY_AFTER_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def get(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, retries=None,
+        stream=False):
+    """Rate-limited, retried GET returning the successful ``Response``.
+
+    Raises ``CircuitOpenError`` immediately while the host's breaker is open,
+    and ``requests.HTTPError`` for non-retryable statuses or once retries run
+    out. Only transient failures are retried; any other request error is
+    raised at once but still settles the breaker, so a half-open trial is
+    never left outstanding. With ``stream=True`` the body is not read; the
+    caller must close the response.
+    """
+    host = urlsplit(url).hostname or ""
+    b = breaker(host)
+    retries = MAX_RETRIES if retries is None else retries
+    attempt = 0
+    while True:
+        if not b.allow():
+            raise CircuitOpenError(
+                f"{host} is temporarily unavailable (retry in "
+                f"{b.snapshot()['retry_in']:.0f}s)")
+        throttle(url)
+        resp = None
+        try:
+            resp = session().get(url, params=params, headers=headers, timeout=timeout,
+                                 stream=stream)
+        except (requests.ConnectionError, requests.Timeout):
+            b.record_failure()
+            if attempt >= retries:
+                raise
+        except requests.RequestException:
+            b.record_failure()
+            raise
+        else:
+            if resp.status_code not in RETRY_STATUSES:
+                b.record_success()  # the host answered; 4xx is the caller's problem
+                resp.raise_for_status()
+                return resp
+            b.record_failure()
+            resp.close()  # hand a streamed connection back before the next try
+            if attempt >= retries:
+                resp.raise_for_status()
+        time.sleep(_backoff(attempt, resp))
+        attempt += 1
+
+
+# -- conditional-GET cache ----------------------------------------------------
+HTTP_CACHE_MAX_ENTRIES = 256
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+class _CacheEntry:
+    __slots__ = ("payload", "etag", "last_modified", "fresh_until")
+
+    def __init__(self, payload, etag, last_modified, fresh_until):
+        self.payload = payload
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fresh_until = fresh_until
+
+
+class HTTPCache:
+    """Thread-safe LRU of parsed JSON bodies with their HTTP validators."""
+
+    def __init__(self, max_entries=HTTP_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0            # served fresh, no request
+        self.revalidated = 0     # 304 Not Modified
+
+    @staticmethod
+    def key(url, params):
+        return url + "?" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+http_cache = HTTPCache()
+
+
+def _fresh_until(resp):
+    """Monotonic deadline from Cache-Control max-age (minus Age), or None.
+
+    ``no-store`` returns False (do not keep); ``no-cache`` means revalidate
+    every time.
+    """
+    cc = resp.headers.get("Cache-Control") or ""
+    lowered = cc.lower()
+    if "no-store" in lowered:
+        return False
+    if "no-cache" in lowered:
+        return None
+    m = _MAX_AGE.search(cc)
+    if not m:
+        return None
+    try:
+        age = float(resp.headers.get("Age") or 0)
+    except ValueError:
+        age = 0.0
+    return time.monotonic() + max(0.0, int(m.group(1)) - age)
+
+
+def _is_fresh(entry):
+    return entry is not None and entry.fresh_until and time.monotonic() < entry.fresh_until
+
+
+def _conditional_headers(headers, entry):
+    send = dict(headers or {})
+    if entry is not None:
+        if entry.etag:
+            send["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            send["If-Modified-Since"] = entry.last_modified
+    return send
+
+
+def _cached_get_json(url, params, headers, timeout):
+    key = HTTPCache.key(url, params)
+    entry = http_cache.get(key)
+    if _is_fresh(entry):
+        http_cache.hits += 1
+        return entry.payload
+
+    resp = get(url, params=params, headers=_conditional_headers(headers, entry),
+               timeout=timeout)
+
+    if resp.status_code == 304 and entry is not None:
+        http_cache.revalidated += 1
+        fresh = _fresh_until(resp)
+        if fresh is not False:
+            entry.fresh_until = fresh
+        return entry.payload
+
+    payload = resp.json()
+    fresh = _fresh_until(resp)
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if fresh is False or not (etag or last_modified or fresh):
+        http_cache.discard(key)
+    else:
+        http_cache.put(key, _CacheEntry(payload, etag, last_modified, fresh))
+    return payload
+
+
+def get_json(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, cache=False):
+    """GET a URL and return parsed JSON, raising on HTTP error.
+
+    With ``cache=True`` the parsed body is kept and revalidated with
+    conditional requests (see module docstring). Callers must treat the
+    returned object as read-only since later calls may return it again.
+    """
+    if cache:
+        return _cached_get_json(url, params, headers, timeout)
+    return get(url, params=params, headers=headers, timeout=timeout).json()
+
+
+# -- streamed GeoJSON -----------------------------------------------------------
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def get_features(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT,
+                 geometry="defer", cache=False):
+    """Stream a GeoJSON FeatureCollection; return an iterator of features.
+
+    Features are parsed one at a time as the body downloads, so memory stays
+    around one feature regardless of feed size. ``geometry`` is "parse",
+    "skip" or "defer" (see :mod:`.geojson_stream`).
+
+    With ``cache=True`` only the validators are kept (the features are the
+    caller's to store), and None is returned when the feed is unchanged since
+    the last stream that was read to the end (fresh, or HTTP 304).
+    """
+    key = "stream:" + HTTPCache.key(url, params)
+    entry = http_cache.get(key) if cache else None
+    if _is_fresh(entry):
+        http_cache.hits += 1
+        return None
+    resp = get(url, params=params, headers=_conditional_headers(headers, entry),
+               timeout=timeout, stream=True)
+    if resp.status_code == 304 and entry is not None:
+        resp.close()
+        http_cache.revalidated += 1
+        fresh = _fresh_until(resp)
+        if fresh is not False:
+            entry.fresh_until = fresh
+        return None
+    return _drain(resp, key if cache else None, geometry)
+
+
+def _drain(resp, key, geometry):
+    try:
+        yield from iter_features(resp.iter_content(STREAM_CHUNK_BYTES), geometry=geometry)
+    finally:
+        resp.close()
+    # Only a fully consumed body may be marked as seen.
+    if key is not None:
+        fresh = _fresh_until(resp)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if fresh is False or not (etag or last_modified or fresh):
+            http_cache.discard(key)
+        else:
+            http_cache.put(key, _CacheEntry(None, etag, last_modified, fresh))
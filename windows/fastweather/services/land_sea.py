@@ -0,0 +1,132 @@
+"""Land/sea lookup so inland points never hit the marine API.
+
+The Open-Meteo marine API answers inland coordinates with all-null values,
+costing a request every time. Two layers avoid that:
+
+- A bundled coarse grid (``land-sea-mask.bin``, built by
+  ``build_land_mask.py`` from Natural Earth polygons). One bit per cell
+  marks land farther than INLAND_KM from the sea; a lookup is an index
+  computation. Coastal cells, and anything the grid cannot vouch for, are
+  never marked, so a real coastal city is not skipped.
+- A point and variable set the marine API has answered with nothing is
+  remembered for NO_DATA_TTL, which covers places the grid misses (or a run
+  from source without the grid file). The variables are part of the key, so
+  an empty answer for a few My Data columns never hides the Marine sheet.
+
+File format: the 8-byte header ``b"FWLS"``, version, cells per degree and two
+reserved bytes, then a row-major bitmap from 90N southwards and from 180W
+eastwards (LSB first).
+"""
+
+import threading
+
+from ..cache.disk_cache import DiskCache
+from ..paths import bundled_file
+
+MASK_FILE = "land-sea-mask.bin"
+INLAND_KM = 50                # cells marked inland are at least this far from the sea
+NO_DATA_TTL = 30 * 86400      # seconds a "marine API returned nothing" answer is trusted
+
+_MAGIC = b"FWLS"
+_VERSION = 1
+_HEADER = 8
+
+INLAND_REASON = f"Inland location (more than {INLAND_KM} km from the sea); no marine data."
+NO_DATA_REASON = "No marine data is available for this location."
+
+
+class LandSeaMask:
+    """A global bitmap grid; ``is_inland`` is O(1)."""
+
+    def __init__(self, bits, cells_per_degree):
+        self.bits = bits
+        self.res = cells_per_degree
+        self.cols = 360 * cells_per_degree
+        self.rows = 180 * cells_per_degree
+        if len(bits) * 8 < self.rows * self.cols:
+            raise ValueError("land/sea bitmap is shorter than its grid")
+
+    def is_inland(self, lat, lon):
+        row = min(int((90.0 - lat) * self.res), self.rows - 1)
+        col = int((lon + 180.0) * self.res) % self.cols
+        if row < 0:
+            return False
+        i = row * self.cols + col
+        return bool(self.bits[i >> 3] >> (i & 7) & 1)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != _MAGIC or data[4] != _VERSION:
+            raise ValueError("not a land/sea mask file")
+        return cls(bytes(data[_HEADER:]), data[5])
+
+    def to_bytes(self):
+        return _MAGIC + bytes([_VERSION, self.res, 0, 0]) + bytes(self.bits)
+
+    @classmethod
+    def from_cells(cls, inland, cells_per_degree):
+        """Build from an iterable of inland (row, col) cells (the build script)."""
+        cells = 180 * 360 * cells_per_degree * cells_per_degree
+        mask = cls(bytearray((cells + 7) // 8), cells_per_degree)
+        for row, col in inland:
+            i = row * mask.cols + col
+            mask.bits[i >> 3] |= 1 << (i & 7)
+        return mask
+
+
+_mask = None
+_mask_loaded = False
+_no_data = None
+_lock = threading.Lock()
+
+
+def mask():
+    """The bundled mask, loaded once; None when it is missing or unreadable."""
+    global _mask, _mask_loaded
+    with _lock:
+        if not _mask_loaded:
+            _mask_loaded = True
+            try:
+                with open(bundled_file(MASK_FILE), "rb") as f:
+                    _mask = LandSeaMask.from_bytes(f.read())
+            except (OSError, ValueError, IndexError):
+                _mask = None
+        return _mask
+
+
+def _no_data_cache():
+    global _no_data
+    if _no_data is None:
+        _no_data = DiskCache("marine_no_data", max_age=NO_DATA_TTL)
+    return _no_data
+
+
+def _point_key(lat, lon, variables):
+    return f"{lat:.2f},{lon:.2f}:" + ",".join(sorted(variables))
+
+
+def skip_reason(lat, lon, variables):
+    """Why a marine request for these variables here would be wasted, or None."""
+    grid = mask()
+    if grid is not None and grid.is_inland(lat, lon):
+        return INLAND_REASON
+    if _no_data_cache().get(_point_key(lat, lon, variables)):
+        return NO_DATA_REASON
+    return None
+
+
+def remember_no_data(lat, lon, variables):
+    """Record that the marine API had no values for these variables here."""
+    _no_data_cache().set(_point_key(lat, lon, variables), True)
+
+
+def is_empty(data):
+    """True when a marine response carries no value at all."""
+    current = {k: v for k, v in (data.get("current") or {}).items()
+               if k not in ("time", "interval")}
+    hourly = {k: v for k, v in (data.get("hourly") or {}).items() if k != "time"}
+    if not current and not hourly:
+        return False           # nothing was asked for; not evidence either way
+    if any(v is not None for v in current.values()):
+        return False
+    return not any(v is not None for arr in hourly.values() for v in arr or [])
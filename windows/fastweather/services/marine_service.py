@@ -1,7 +1,12 @@
-"""Open-Meteo Marine API (waves, swell, currents, sea temperature)."""
+"""Open-Meteo Marine API (waves, swell, currents, sea temperature).
+
+Points the land/sea lookup (:mod:`.land_sea`) knows to be inland, or that
+recently returned no values for the same variables, are not requested: :class:`NoMarineData`
+is raised with the reason instead.
+"""
 
 from ..constants import OPEN_METEO_MARINE_URL
-from . import http
+from . import http, land_sea
 
 # Fields for the standalone Marine sheet.
 _MARINE_CURRENT = (
@@ -11,13 +16,24 @@ _MARINE_CURRENT = (
 )
 
 
+class NoMarineData(Exception):
+    """Marine data does not exist for this point; the message says why."""
+
+
 def fetch_marine(lat, lon, hourly_keys=None, current=None):
+    variables = set(hourly_keys or ()) | set(current.split(",") if current else ())
+    reason = land_sea.skip_reason(lat, lon, variables)
+    if reason:
+        raise NoMarineData(reason)
     params = {"latitude": lat, "longitude": lon, "timezone": "auto", "forecast_days": 1}
     if current:
         params["current"] = current
     if hourly_keys:
         params["hourly"] = ",".join(hourly_keys)
-    return http.get_json(OPEN_METEO_MARINE_URL, params=params)
+    data = http.get_json(OPEN_METEO_MARINE_URL, params=params)
+    if land_sea.is_empty(data):
+        land_sea.remember_no_data(lat, lon, variables)
+    return data
 
 
 def fetch_marine_summary(lat, lon):
@@ -2,64 +2,217 @@
 
 Groups parameters by API endpoint (forecast / marine / air_quality), issues one
 request per endpoint (hourly), and extracts the value for the current hour.
-Each endpoint failure is isolated so a marine outage doesn't hide forecast data.
+The endpoint groups are fetched concurrently, and each failure is isolated so
+a marine outage doesn't hide forecast data.
+
+Responses are cached briefly per endpoint, coordinate and variable set, and
+forecast variables are read from the main view's full forecast
+(``weather_service.cached_full``) when it already holds all of them.
+
+:func:`fetch_mydata_matrix` does the same for every saved city at once: the
+cities missing from the cache go out as multi-location requests (Open-Meteo
+takes comma-separated coordinate lists), MATRIX_BATCH_SIZE per request and
+endpoint, and each city's slice of the answer is cached for the single-city
+view too. Marine requests leave out points :mod:`.land_sea` knows to be
+inland or to have no data for the chosen marine columns.
 """
 
-from ..constants import OPEN_METEO_API_URL
-from . import air_quality_service, http, marine_service
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from ..cache.memory_cache import TTLCache
+from ..constants import (OPEN_METEO_AIR_QUALITY_URL, OPEN_METEO_API_URL,
+                         OPEN_METEO_MARINE_URL)
+from . import air_quality_service, http, land_sea, marine_service, weather_service
+
+MYDATA_CACHE_TTL = 600        # seconds; values are per hour
+MATRIX_BATCH_SIZE = 50        # locations per multi-coordinate request
+MATRIX_WORKERS = 4
+
+_URLS = {
+    "forecast": OPEN_METEO_API_URL,
+    "marine": OPEN_METEO_MARINE_URL,
+    "air_quality": OPEN_METEO_AIR_QUALITY_URL,
+}
+
+_ENDPOINTS = ("forecast", "marine", "air_quality")
+_cache = TTLCache(default_ttl=MYDATA_CACHE_TTL)
+
+
+def _current_hour(data, now=None):
+    """The location's local hour now, as an API time string (YYYY-MM-DDTHH:00).
+
+    Computed from the clock and the response's UTC offset rather than its
+    ``current.time``, so a cached response read after the hour turns still
+    picks the present hour from its ``hourly`` arrays. ``current.time`` is the
+    fallback for a response without an offset.
+    """
+    offset = data.get("utc_offset_seconds")
+    if offset is None:
+        ref = (data.get("current") or {}).get("time")
+        return ref[:13] + ":00" if ref else None
+    local = (now or datetime.now(timezone.utc)) + timedelta(seconds=offset)
+    return local.strftime("%Y-%m-%dT%H:00")
+
+
+def _hour_index(times, ref_time):
+    """Index of ``ref_time`` in an hourly time axis, by arithmetic.
+
+    Hourly axes are evenly spaced, so the offset from the first entry gives
+    the index directly (checked, with a scan as fallback) instead of
+    searching each city's list. 0 when the hour is not on the axis.
+    """
+    if not ref_time or not times:
+        return 0
+    try:
+        delta = datetime.fromisoformat(ref_time) - datetime.fromisoformat(times[0])
+    except ValueError:
+        return 0
+    idx = int(delta.total_seconds() // 3600)
+    if 0 <= idx < len(times) and times[idx] == ref_time:
+        return idx
+    return times.index(ref_time) if ref_time in times else 0
 
 
 def _extract(data, keys, ref_time, results, errors, group):
     hourly = data.get("hourly", {})
-    times = hourly.get("time", [])
-    idx = 0
-    if ref_time and ref_time in times:
-        idx = times.index(ref_time)
+    idx = _hour_index(hourly.get("time", []), ref_time)
     for k in keys:
         arr = hourly.get(k)
         results[k] = arr[idx] if arr and idx < len(arr) else None
 
 
-def fetch_mydata(lat, lon, params):
-    """Return (values: {key: value|None}, errors: {group: message})."""
+def _fetch_forecast(lat, lon, keys):
+    full = weather_service.cached_full(lat, lon)
+    if full is not None and all(k in (full.get("hourly") or {}) for k in keys):
+        return full
+    return http.get_json(OPEN_METEO_API_URL, params={
+        "latitude": lat, "longitude": lon, "timezone": "auto",
+        "current": "temperature_2m", "hourly": ",".join(keys),
+        "forecast_days": 1,
+    })
+
+
+def _fetch_group(group, lat, lon, keys):
+    if group == "forecast":
+        return _fetch_forecast(lat, lon, keys)
+    if group == "marine":
+        return marine_service.fetch_marine(lat, lon, hourly_keys=keys)
+    return air_quality_service.fetch_air_quality(lat, lon, hourly_keys=keys)
+
+
+def _cache_key(group, lat, lon, keys):
+    return (group, round(lat, 4), round(lon, 4), tuple(sorted(keys)))
+
+
+def _group_data(group, lat, lon, keys, use_cache):
+    key = _cache_key(group, lat, lon, keys)
+    data = _cache.get(key) if use_cache else None
+    if data is None:
+        data = _fetch_group(group, lat, lon, keys)
+        _cache.set(key, data)
+    return data
+
+
+def _fetch_batch(group, coords, keys):
+    """One request for several (lat, lon); a response dict per location."""
+    params = {
+        "latitude": ",".join(str(lat) for lat, _ in coords),
+        "longitude": ",".join(str(lon) for _, lon in coords),
+        "timezone": "auto", "hourly": ",".join(keys), "forecast_days": 1,
+    }
+    if group == "forecast":
+        params["current"] = "temperature_2m"
+    data = http.get_json(_URLS[group], params=params)
+    results = data if isinstance(data, list) else [data]
+    if len(results) != len(coords):
+        raise ValueError(f"{group} returned {len(results)} locations, expected {len(coords)}")
+    return results
+
+
+def fetch_mydata(lat, lon, params, use_cache=True):
+    """Return (values: {key: value|None}, errors: {group: message}).
+
+    ``use_cache=False`` (Refresh) re-requests every endpoint.
+    """
     results = {}
     errors = {}
-    ref_time = None
+    groups = {g: [p.key for p in params if p.endpoint == g] for g in _ENDPOINTS}
+    groups = {g: keys for g, keys in groups.items() if keys}
+    if not groups:
+        return results, errors
 
-    forecast_keys = [p.key for p in params if p.endpoint == "forecast"]
-    marine_keys = [p.key for p in params if p.endpoint == "marine"]
-    aq_keys = [p.key for p in params if p.endpoint == "air_quality"]
-
-    if forecast_keys:
+    with ThreadPoolExecutor(max_workers=len(groups)) as ex:
+        futures = {g: ex.submit(_group_data, g, lat, lon, keys, use_cache)
+                   for g, keys in groups.items()}
+    for group, keys in groups.items():
         try:
-            data = http.get_json(OPEN_METEO_API_URL, params={
-                "latitude": lat, "longitude": lon, "timezone": "auto",
-                "current": "temperature_2m", "hourly": ",".join(forecast_keys),
-                "forecast_days": 1,
-            })
-            ref_time = data.get("current", {}).get("time")
-            _extract(data, forecast_keys, ref_time, results, errors, "forecast")
+            data = futures[group].result()
+            _extract(data, keys, _current_hour(data), results, errors, group)
         except Exception as e:  # noqa: BLE001
-            errors["forecast"] = str(e)
-            for k in forecast_keys:
+            errors[group] = str(e)
+            for k in keys:
                 results.setdefault(k, None)
+    return results, errors
 
-    if marine_keys:
-        try:
-            data = marine_service.fetch_marine(lat, lon, hourly_keys=marine_keys)
-            _extract(data, marine_keys, ref_time, results, errors, "marine")
-        except Exception as e:  # noqa: BLE001
-            errors["marine"] = str(e)
-            for k in marine_keys:
-                results.setdefault(k, None)
 
-    if aq_keys:
-        try:
-            data = air_quality_service.fetch_air_quality(lat, lon, hourly_keys=aq_keys)
-            _extract(data, aq_keys, ref_time, results, errors, "air_quality")
-        except Exception as e:  # noqa: BLE001
-            errors["air_quality"] = str(e)
-            for k in aq_keys:
-                results.setdefault(k, None)
+def fetch_mydata_matrix(coords, params, use_cache=True):
+    """Current values of ``params`` for many locations.
 
-    return results, errors
+    Returns (rows, errors): ``rows[i]`` is {key: value|None} for
+    ``coords[i]``; ``errors`` maps group to message (a failed batch leaves its
+    cities' values None). Cached cities cost nothing; the rest are fetched in
+    multi-location batches, all groups and batches concurrently.
+    """
+    rows = [{p.key: None for p in params} for _ in coords]
+    errors = {}
+    groups = {g: [p.key for p in params if p.endpoint == g] for g in _ENDPOINTS}
+    groups = {g: keys for g, keys in groups.items() if keys}
+    data = {}                                      # (group, i) -> response
+    jobs = []                                      # (group, [city indexes])
+    skipped = 0                                    # inland cities left out of marine
+    for group, keys in groups.items():
+        todo = []
+        for i, (lat, lon) in enumerate(coords):
+            if group == "marine" and land_sea.skip_reason(lat, lon, keys):
+                skipped += 1
+                continue
+            cached = None
+            if use_cache:
+                cached = _cache.get(_cache_key(group, lat, lon, keys))
+                if cached is None and group == "forecast":
+                    full = weather_service.cached_full(lat, lon)
+                    if full is not None and all(k in (full.get("hourly") or {}) for k in keys):
+                        cached = full
+            if cached is not None:
+                data[(group, i)] = cached
+            else:
+                todo.append(i)
+        for b in range(0, len(todo), MATRIX_BATCH_SIZE):
+            jobs.append((group, todo[b:b + MATRIX_BATCH_SIZE]))
+
+    def run(job):
+        group, idxs = job
+        keys = groups[group]
+        results = _fetch_batch(group, [coords[i] for i in idxs], keys)
+        for i, result in zip(idxs, results):
+            _cache.set(_cache_key(group, *coords[i], keys), result)
+            if group == "marine" and land_sea.is_empty(result):
+                land_sea.remember_no_data(*coords[i], keys)
+        return results
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(MATRIX_WORKERS, len(jobs))) as ex:
+            futures = [(job, ex.submit(run, job)) for job in jobs]
+        for (group, idxs), fut in futures:
+            try:
+                for i, result in zip(idxs, fut.result()):
+                    data[(group, i)] = result
+            except Exception as e:  # noqa: BLE001 - other groups/batches still render
+                errors.setdefault(group, str(e))
+
+    if skipped and "marine" not in errors:
+        errors["marine"] = f"skipped for {skipped} inland location(s) with no marine data"
+    for (group, i), result in data.items():
+        _extract(result, groups[group], _current_hour(result), rows[i], errors, group)
+    return rows, errors
@@ -1,8 +1,9 @@
 """Weather Around Me: weather for 8 cardinal directions + center at a radius.
 
-Fetches weather concurrently for the nine points; reverse-geocodes surrounding
-place names (serialized/throttled by the geocoding service). Runs on a worker
-thread via the FetchManager, so blocking here is fine.
+Fetches weather concurrently for the nine points; names surrounding points
+after the nearest bundled city (offline), falling back to Nominatim reverse
+geocoding (rate limited by ``http``) only where no bundled city is near.
+Runs on a worker thread via the FetchManager, so blocking here is fine.
 """
 
 from concurrent.futures import ThreadPoolExecutor
@@ -26,11 +27,13 @@ def _tile_weather(tile):
     return tile
 
 
-def fetch_regional(center_name, center_lat, center_lon, radius_km):
+def fetch_regional(center_name, center_lat, center_lon, radius_km,
+                   place_radius_km=geocoding_service.OFFLINE_PLACE_RADIUS_KM):
     """Return {'center': RegionalTile, 'tiles': [RegionalTile x8], 'radius_km'}.
 
     The center keeps the known city name (no reverse geocode); surrounding
-    points are reverse-geocoded (cached after first run).
+    points take the nearest bundled city within ``place_radius_km``, else a
+    Nominatim name (cached after first run).
     """
     center = RegionalTile("Center", center_name, center_lat, center_lon, 0.0)
     tiles = []
@@ -38,12 +41,15 @@ def fetch_regional(center_name, center_lat, center_lon, radius_km):
         lat, lon = destination_point(center_lat, center_lon, bearing, radius_km)
         tiles.append(RegionalTile(name, "", lat, lon, radius_km))
 
-    # Weather concurrently (independent, no rate limit).
-    with ThreadPoolExecutor(max_workers=5) as ex:
-        list(ex.map(_tile_weather, [center] + tiles))
+    def name_tile(t):
+        return geocoding_service.reverse_geocode(t.lat, t.lon, max_km=place_radius_km)
 
-    # Reverse-geocode surrounding names (serialized + throttled inside service).
-    for t in tiles:
-        t.name = geocoding_service.reverse_geocode(t.lat, t.lon)
+    # Weather and names concurrently. Names come from the offline city index
+    # where possible; Nominatim fallbacks are paced by the per-host limiter.
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        weather = ex.map(_tile_weather, [center] + tiles)
+        for t, name in zip(tiles, ex.map(name_tile, tiles)):
+            t.name = name
+        list(weather)
 
     return {"center": center, "tiles": tiles, "radius_km": radius_km}
@@ -2,11 +2,20 @@
 
 Pure data: given coordinates and a detail level, returns the parsed API JSON.
 Parameter sets are preserved verbatim from the original monolith.
+
+The latest full forecast per location is remembered for a few minutes
+(:func:`cached_full`) so other views can reuse its hourly fields instead of
+asking the API again.
 """
 
+from ..cache.memory_cache import TTLCache
 from ..constants import OPEN_METEO_API_URL
 from . import http
 
+FULL_FORECAST_TTL = 600       # seconds a full forecast may be reused elsewhere
+
+_full = TTLCache(default_ttl=FULL_FORECAST_TTL)
+
 _CURRENT_FIELDS = (
     "temperature_2m,relative_humidity_2m,apparent_temperature,dewpoint_2m,is_day,"
     "precipitation,rain,showers,snowfall,weather_code,cloud_cover,pressure_msl,"
@@ -55,4 +64,16 @@ def fetch_weather(lat, lon, detail="basic", forecast_days=16, past_days=7):
         params["daily"] = "temperature_2m_max,temperature_2m_min"
         params["forecast_days"] = 1
 
-    return http.get_json(OPEN_METEO_API_URL, params=params)
+    data = http.get_json(OPEN_METEO_API_URL, params=params)
+    if detail == "full":
+        _full.set(_coord_key(lat, lon), data)
+    return data
+
+
+def _coord_key(lat, lon):
+    return f"{lat:.4f},{lon:.4f}"
+
+
+def cached_full(lat, lon):
+    """The full forecast fetched for this point in the last few minutes, or None."""
+    return _full.get(_coord_key(lat, lon))
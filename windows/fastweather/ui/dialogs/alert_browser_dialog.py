@@ -24,8 +24,10 @@ class AlertBrowserDialog(wx.Dialog):
         super().__init__(parent, title="Browse Weather Alerts", size=(760, 620))
         self.settings = settings
         self.region_alerts = []
+        self.digest = A.DigestIndex([])
         self.groups = []
         self.current_group = None
+        self.current_region = None
         self.severity_filter = "All"
         self.hazard_filter = None
         self._alive = True
@@ -70,10 +72,7 @@ class AlertBrowserDialog(wx.Dialog):
 
     def _load_counts(self):
         def work():
-            counts = {}
-            for r in svc.REGIONS:
-                counts[r["id"]] = svc.alert_count(r["id"])
-            wx.CallAfter(self._apply_counts, counts)
+            wx.CallAfter(self._apply_counts, svc.alert_counts())
         threading.Thread(target=work, daemon=True).start()
 
     def _apply_counts(self, counts):
@@ -110,6 +109,15 @@ class AlertBrowserDialog(wx.Dialog):
         filt.Add(haz_box, 0)
         s.Add(filt, 0, wx.LEFT | wx.RIGHT | wx.BOTTOM, 8)
 
+        find = wx.BoxSizer(wx.HORIZONTAL)
+        find.Add(wx.StaticText(p, label="Search alerts (county, keyword):"), 0,
+                 wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 6)
+        self.search_text = wx.TextCtrl(p, style=wx.TE_PROCESS_ENTER)
+        find.Add(self.search_text, 1, wx.RIGHT, 6)
+        self.search_btn = wx.Button(p, label="Search")
+        find.Add(self.search_btn, 0)
+        s.Add(find, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 8)
+
         self.digest_status = wx.StaticText(p, label="")
         s.Add(self.digest_status, 0, wx.LEFT | wx.BOTTOM, 8)
         self.group_list = wx.ListBox(p, style=wx.LB_SINGLE | wx.WANTS_CHARS)
@@ -129,6 +137,8 @@ class AlertBrowserDialog(wx.Dialog):
         self.group_list.Bind(wx.EVT_LISTBOX_DCLICK, self.on_open_group)
         self._bind_enter(self.group_list, self.on_open_group)
         self.open_group_btn.Bind(wx.EVT_BUTTON, self.on_open_group)
+        self.search_text.Bind(wx.EVT_TEXT_ENTER, self.on_search)
+        self.search_btn.Bind(wx.EVT_BUTTON, self.on_search)
 
     # -- group page -----------------------------------------------------------
     def _build_group_page(self):
@@ -224,6 +234,7 @@ class AlertBrowserDialog(wx.Dialog):
         if not self._alive:
             return
         self.region_alerts = alerts
+        self.digest = A.DigestIndex(alerts)
         # Seed filters from saved defaults (once per open is fine here).
         opts = self.settings["options"]
         self.severity_filter = opts.get("default_alert_severity_filter", "All")
@@ -235,7 +246,7 @@ class AlertBrowserDialog(wx.Dialog):
         self._rebuild_groups()
 
     def _rebuild_hazard_choice(self):
-        present = A.hazard_counts(self.region_alerts)
+        present = self.digest.hazard_counts()
         items = [_ALL_TYPES]
         for h in A.HAZARD_ORDER:
             if present.get(h):
@@ -260,7 +271,7 @@ class AlertBrowserDialog(wx.Dialog):
         self._rebuild_groups()
 
     def _rebuild_groups(self):
-        self.groups = A.build_digest(self.region_alerts, self.severity_filter, self.hazard_filter)
+        self.groups = self.digest.view(self.severity_filter, self.hazard_filter)
         self.group_list.Clear()
         if not self.region_alerts:
             self.digest_status.SetLabel("No active alerts right now.")
@@ -299,12 +310,17 @@ class AlertBrowserDialog(wx.Dialog):
         if sel == wx.NOT_FOUND or sel >= len(self.groups):
             return
         group = self.groups[sel]
+        self._show_group(group, f"[{group.severity}] {group.event} - {group.count} areas")
+
+    def _show_group(self, group, title, with_event=False):
         self.current_group = group
-        self.group_title.SetLabel(f"[{group.severity}] {group.event} - {group.count} areas")
+        self.group_title.SetLabel(title)
         self.area_list.Clear()
         for a in group.alerts:
             until = fmt_time(a.ends) if a.ends else ""
             label = a.area or a.event
+            if with_event:
+                label = f"[{a.severity}] {a.event} - {label}"
             if until:
                 label += f"  (until {until})"
             self.area_list.Append(label)
@@ -312,6 +328,37 @@ class AlertBrowserDialog(wx.Dialog):
         self.open_area_btn.Enable()
         self._goto(2, self.area_list)
 
+    # -- text search ----------------------------------------------------------
+    def on_search(self, event):
+        query = self.search_text.GetValue().strip()
+        region = self.current_region
+        if not query or region is None:
+            return
+        self.digest_status.SetLabel(f'Searching for "{query}"...')
+
+        def work():
+            try:
+                results = svc.search_alerts(region["id"], query)
+            except Exception as e:  # noqa: BLE001
+                wx.CallAfter(self._search_done, query, None, str(e))
+                return
+            wx.CallAfter(self._search_done, query, results, None)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _search_done(self, query, results, err):
+        if not self._alive:
+            return
+        if err is not None:
+            self.digest_status.SetLabel(f"Search failed: {err}")
+            return
+        if not results:
+            self.digest_status.SetLabel(f'No active alerts match "{query}".')
+            return
+        self.digest_status.SetLabel(f'{len(results)} alerts match "{query}".')
+        group = A.AlertDigestGroup(f'Search: "{query}"', "", list(results))
+        self._show_group(group, f'{len(results)} alerts matching "{query}"', with_event=True)
+
     def on_open_area(self, event):
         sel = self.area_list.GetSelection()
         if not self.current_group or sel == wx.NOT_FOUND or sel >= len(self.current_group.alerts):
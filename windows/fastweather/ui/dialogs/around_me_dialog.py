@@ -113,13 +113,15 @@ class AroundMeDialog(wx.Dialog):
         radius_km = self._radii_km[self.radius_choice.GetSelection()]
         self.settings["options"]["around_me_radius_km"] = radius_km
         self.around_btn.Disable()
-        self.around_status.SetLabel("Loading (first run reverse-geocodes place names, ~10s)...")
+        self.around_status.SetLabel("Loading...")
         self.around_lines.set_message("Loading...")
         name, lat, lon = self.center
+        place_km = self.settings["options"].get("around_me_place_radius_km", 40)
 
         def work():
             try:
-                result = regional_service.fetch_regional(name, lat, lon, radius_km)
+                result = regional_service.fetch_regional(
+                    name, lat, lon, radius_km, place_radius_km=place_km)
             except Exception as e:  # noqa: BLE001
                 wx.CallAfter(self._around_error, str(e))
                 return
@@ -1,4 +1,5 @@
-"""Historical weather sheet: Single Day, Multi-Year, and Daily Browse modes."""
+"""Historical weather sheet: Single Day, Multi-Year, Daily Browse, Climate and
+Compare Cities modes."""
 
 import threading
 from datetime import date, timedelta
@@ -7,8 +8,9 @@ import wx
 import wx.adv
 
 from ...models.weather import describe_weather_code
-from ...services import historical_service
+from ...services import climatology, historical_service
 from ..accessible_list import AccessibleLinesPanel
+from ..full_weather_view import climate_lines
 
 
 def _wxdate_to_iso(d):
@@ -35,12 +37,48 @@ def format_day_line(day, fmt):
     return " ".join(parts)
 
 
+def format_comparison_lines(names, days, fmt):
+    """A text table with one row per city for the same date (monospace list)."""
+    header = ("City", "High", "Low", "Precip", "Max wind", "Conditions")
+    rows, errors = [], []
+    for name, day in zip(names, days):
+        if day.error:
+            errors.append(f"{name}: unavailable ({day.error})")
+            continue
+        rows.append((
+            name,
+            fmt.temperature_short(day.temp_max) if day.temp_max is not None else "-",
+            fmt.temperature_short(day.temp_min) if day.temp_min is not None else "-",
+            fmt.precipitation(day.precip_sum) if day.precip_sum is not None else "-",
+            fmt.wind_speed(day.wind_max) if day.wind_max is not None else "-",
+            describe_weather_code(day.weather_code) or "",
+        ))
+    if not rows:
+        return errors
+    widths = [max(len(r[i]) for r in rows + [header]) for i in range(len(header) - 1)]
+
+    def line(cells):
+        return "  ".join([c.ljust(w) for c, w in zip(cells, widths)] + [cells[-1]]).rstrip()
+    return [line(header)] + [line(r) for r in rows] + errors
+
+
+def comparison_label(names):
+    """Caption for the Compare Cities tab, from the names actually compared."""
+    if len(names) < 2:
+        return f"Only {names[0]} is available; save more cities to compare them."
+    others = len(names) - 1
+    return (f"The same date for {names[0]} and {others} other saved "
+            f"{'city' if others == 1 else 'cities'}.")
+
+
 class HistoricalDialog(wx.Dialog):
-    def __init__(self, parent, center, settings, fmt):
+    def __init__(self, parent, center, settings, fmt, cities=None):
         super().__init__(parent, title=f"Historical Weather - {center[0]}", size=(680, 560))
         self.center = center
         self.settings = settings
         self.fmt = fmt
+        # Saved cities for the comparison tab, the selected one first.
+        self.cities = [center] + [c for c in (cities or []) if c[0] != center[0]]
         self._alive = True
 
         panel = wx.Panel(self)
@@ -49,6 +87,8 @@ class HistoricalDialog(wx.Dialog):
         self._build_single()
         self._build_multiyear()
         self._build_browse()
+        self._build_climate()
+        self._build_compare()
         vbox.Add(self.nb, 1, wx.EXPAND | wx.ALL, 8)
         btns = wx.StdDialogButtonSizer()
         btns.AddButton(wx.Button(panel, wx.ID_CLOSE))
@@ -110,13 +150,59 @@ class HistoricalDialog(wx.Dialog):
         self.browse_days = wx.SpinCtrl(p, min=1, max=31, initial=7)
         row.Add(self.browse_days, 0, wx.RIGHT, 8)
         b = wx.Button(p, label="Load")
-        row.Add(b, 0)
+        row.Add(b, 0, wx.RIGHT, 8)
+        prev_btn = wx.Button(p, label="&Previous")
+        row.Add(prev_btn, 0, wx.RIGHT, 4)
+        next_btn = wx.Button(p, label="&Next")
+        row.Add(next_btn, 0)
         s.Add(row, 0, wx.ALL, 8)
         self.browse_lines = AccessibleLinesPanel(p)
         s.Add(self.browse_lines, 1, wx.EXPAND | wx.ALL, 8)
         p.SetSizer(s)
         self.nb.AddPage(p, "Daily Browse")
         b.Bind(wx.EVT_BUTTON, self.on_browse)
+        prev_btn.Bind(wx.EVT_BUTTON, lambda e: self._step_browse(-1))
+        next_btn.Bind(wx.EVT_BUTTON, lambda e: self._step_browse(1))
+
+    def _build_climate(self):
+        p = wx.Panel(self.nb)
+        s = wx.BoxSizer(wx.VERTICAL)
+        row = wx.BoxSizer(wx.HORIZONTAL)
+        row.Add(wx.StaticText(p, label="Calendar day:"), 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
+        self.climate_date = wx.adv.DatePickerCtrl(p, style=wx.adv.DP_DROPDOWN)
+        row.Add(self.climate_date, 0, wx.RIGHT, 8)
+        b = wx.Button(p, label="Load")
+        row.Add(b, 0)
+        s.Add(row, 0, wx.ALL, 8)
+        s.Add(wx.StaticText(p, label=f"Normals, typical range and records from the last "
+                                     f"{climatology.CLIMATE_YEARS} years. The first load "
+                                     f"downloads them; later lookups are instant."),
+              0, wx.LEFT | wx.RIGHT, 8)
+        self.climate_lines = AccessibleLinesPanel(p)
+        s.Add(self.climate_lines, 1, wx.EXPAND | wx.ALL, 8)
+        p.SetSizer(s)
+        self.nb.AddPage(p, "Climate")
+        b.Bind(wx.EVT_BUTTON, self.on_climate)
+
+    def _build_compare(self):
+        p = wx.Panel(self.nb)
+        s = wx.BoxSizer(wx.VERTICAL)
+        row = wx.BoxSizer(wx.HORIZONTAL)
+        row.Add(wx.StaticText(p, label="Date:"), 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
+        self.compare_date = wx.adv.DatePickerCtrl(p, style=wx.adv.DP_DROPDOWN)
+        day = wx.DateTime.Now(); day.Subtract(wx.TimeSpan.Days(10))
+        self.compare_date.SetValue(day)
+        row.Add(self.compare_date, 0, wx.RIGHT, 8)
+        b = wx.Button(p, label="Compare")
+        row.Add(b, 0)
+        s.Add(row, 0, wx.ALL, 8)
+        s.Add(wx.StaticText(p, label=comparison_label([c[0] for c in self.cities])),
+              0, wx.LEFT | wx.RIGHT, 8)
+        self.compare_lines = AccessibleLinesPanel(p)
+        s.Add(self.compare_lines, 1, wx.EXPAND | wx.ALL, 8)
+        p.SetSizer(s)
+        self.nb.AddPage(p, "Compare Cities")
+        b.Bind(wx.EVT_BUTTON, self.on_compare)
 
     # -- actions --------------------------------------------------------------
     def _run(self, target_panel, fn):
@@ -159,9 +245,75 @@ class HistoricalDialog(wx.Dialog):
         start = _wxdate_to_iso(self.browse_date.GetValue())
         n = self.browse_days.GetValue()
         end = (date.fromisoformat(start) + timedelta(days=n - 1)).isoformat()
-        self._run(self.browse_lines,
-                  lambda lat, lon: historical_service.fetch_range(lat, lon, start, end))
+
+        def fetch(lat, lon):
+            days = historical_service.fetch_range(lat, lon, start, end)
+            # Warm the neighbouring views so Previous/Next are answered locally.
+            historical_service.prefetch_adjacent(lat, lon, start, end)
+            return days
+        self._run(self.browse_lines, fetch)
+
+    def _step_browse(self, direction):
+        """Move the browse window by its own length and load it."""
+        d = self.browse_date.GetValue()
+        d.Add(wx.DateSpan.Days(direction * self.browse_days.GetValue()))
+        self.browse_date.SetValue(d)
+        self.on_browse(None)
+
+    def on_climate(self, event):
+        d = self.climate_date.GetValue()
+        month, day = d.GetMonth() + 1, d.GetDay()
+        panel = self.climate_lines
+        panel.set_message("Loading...")
+        name, lat, lon = self.center
+
+        def work():
+            try:
+                clim = climatology.build(lat, lon)
+            except Exception as e:  # noqa: BLE001
+                wx.CallAfter(panel.set_message, f"Error: {e}")
+                return
+            # Compare with this year's observed day when it is already stored.
+            try:
+                observed = historical_service.load_series(lat, lon).day(
+                    date(date.today().year, month, day))
+            except ValueError:  # Feb 29 outside a leap year
+                observed = None
+            lines = climate_lines(clim.day(month, day), self.fmt,
+                                  observed.temp_max if observed else None,
+                                  observed.temp_min if observed else None)
+            wx.CallAfter(self._render_lines, panel, lines)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def on_compare(self, event):
+        iso = _wxdate_to_iso(self.compare_date.GetValue())
+        panel = self.compare_lines
+        panel.set_message("Loading...")
+        cities = list(self.cities)
+
+        def work():
+            try:
+                days = historical_service.compare_day([(lat, lon) for _, lat, lon in cities], iso)
+            except Exception as e:  # noqa: BLE001
+                wx.CallAfter(panel.set_message, f"Error: {e}")
+                return
+            lines = format_comparison_lines([c[0] for c in cities], days, self.fmt)
+            wx.CallAfter(self._render_lines, panel, [iso] + lines if lines else [],
+                         "No saved cities to compare.")
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _render_lines(self, panel, lines, empty="No climate data available."):
+        if not self._alive:
+            return
+        if not lines:
+            panel.set_message(empty)
+            return
+        panel.set_lines(lines)
+        panel.set_focus()
 
     def _on_close(self, event):
         self._alive = False
+        historical_service.cancel_prefetch()
         event.Skip()
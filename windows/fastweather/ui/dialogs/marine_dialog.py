@@ -1,7 +1,8 @@
 """Marine forecast sheet: current waves, swell, currents, and sea temperature.
 
-Marine data is only available for coastal/ocean points; inland coordinates
-return empty values, which is reported clearly rather than as an error.
+Marine data is only available for coastal/ocean points. Known inland points
+are not requested at all (``marine_service.NoMarineData``), and empty answers
+are reported clearly rather than as an error.
 """
 
 import threading
@@ -56,6 +57,9 @@ class MarineDialog(wx.Dialog):
         def work():
             try:
                 data = marine_service.fetch_marine_summary(lat, lon)
+            except marine_service.NoMarineData as e:
+                wx.CallAfter(self._no_data, str(e))
+                return
             except Exception as e:  # noqa: BLE001
                 wx.CallAfter(self._error, str(e))
                 return
@@ -89,13 +93,18 @@ class MarineDialog(wx.Dialog):
             lines.append(f"{label}: {text}")
 
         if not any_value:
-            self.status.SetLabel("No marine data for this location (inland?).")
-            self.lines.set_message("No marine data available for this location.")
+            self._no_data("No marine data available for this location.")
             return
         self.status.SetLabel(f"Marine conditions near {self.center[0]}.")
         self.lines.set_lines(lines)
         self.lines.set_focus()
 
+    def _no_data(self, reason):
+        if not self._alive:
+            return
+        self.status.SetLabel("No marine data for this location.")
+        self.lines.set_message(reason)
+
     def _on_close(self, event):
         self._alive = False
         event.Skip()
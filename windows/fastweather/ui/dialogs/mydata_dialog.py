@@ -53,11 +53,13 @@ class MyDataConfigDialog(wx.Dialog):
 
 
 class MyDataDialog(wx.Dialog):
-    def __init__(self, parent, center, settings, fmt):
+    def __init__(self, parent, center, settings, fmt, cities=None):
         super().__init__(parent, title=f"My Data - {center[0]}", size=(640, 560))
         self.center = center
         self.settings = settings
         self.fmt = fmt
+        self.cities = list(cities or [center])   # (name, lat, lon) for the matrix
+        self._matrix = None                      # (params, rows, errors) of the last matrix load
         self._alive = True
 
         panel = wx.Panel(self)
@@ -70,6 +72,17 @@ class MyDataDialog(wx.Dialog):
         row.Add(self.refresh_btn, 0)
         vbox.Add(row, 0, wx.ALL, 8)
 
+        mrow = wx.BoxSizer(wx.HORIZONTAL)
+        self.all_cities = wx.CheckBox(panel, label=f"&All saved cities ({len(self.cities)})")
+        mrow.Add(self.all_cities, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 12)
+        mrow.Add(wx.StaticText(panel, label="Sort by:"), 0,
+                 wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
+        self.sort_choice = wx.Choice(panel)
+        mrow.Add(self.sort_choice, 0, wx.RIGHT, 8)
+        self.sort_desc = wx.CheckBox(panel, label="&Descending")
+        mrow.Add(self.sort_desc, 0, wx.ALIGN_CENTER_VERTICAL)
+        vbox.Add(mrow, 0, wx.LEFT | wx.RIGHT | wx.BOTTOM, 8)
+
         self.status = wx.StaticText(panel, label="")
         vbox.Add(self.status, 0, wx.LEFT | wx.BOTTOM, 8)
 
@@ -83,7 +96,10 @@ class MyDataDialog(wx.Dialog):
         panel.SetSizer(vbox)
 
         self.choose_btn.Bind(wx.EVT_BUTTON, self.on_choose)
-        self.refresh_btn.Bind(wx.EVT_BUTTON, lambda e: self.load())
+        self.refresh_btn.Bind(wx.EVT_BUTTON, lambda e: self.load(refresh=True))
+        self.all_cities.Bind(wx.EVT_CHECKBOX, lambda e: self.load())
+        self.sort_choice.Bind(wx.EVT_CHOICE, lambda e: self._render_matrix())
+        self.sort_desc.Bind(wx.EVT_CHECKBOX, lambda e: self._render_matrix())
         self.Bind(wx.EVT_BUTTON, lambda e: self.Close(), id=wx.ID_CLOSE)
         self.Bind(wx.EVT_CLOSE, self._on_close)
 
@@ -99,7 +115,7 @@ class MyDataDialog(wx.Dialog):
             self.load()
         dlg.Destroy()
 
-    def load(self):
+    def load(self, refresh=False):
         keys = self._selection()
         if not keys:
             self.status.SetLabel("No parameters selected.")
@@ -109,11 +125,16 @@ class MyDataDialog(wx.Dialog):
         self.status.SetLabel("Loading...")
         self.lines.set_message("Loading...")
         self.refresh_btn.Disable()
+        self._set_sort_choices(params)
+        if self.all_cities.GetValue():
+            self._load_matrix(params, refresh)
+            return
         name, lat, lon = self.center
 
         def work():
             try:
-                values, errors = mydata_service.fetch_mydata(lat, lon, params)
+                values, errors = mydata_service.fetch_mydata(lat, lon, params,
+                                                             use_cache=not refresh)
             except Exception as e:  # noqa: BLE001
                 wx.CallAfter(self._error, str(e))
                 return
@@ -121,6 +142,52 @@ class MyDataDialog(wx.Dialog):
 
         threading.Thread(target=work, daemon=True).start()
 
+    def _set_sort_choices(self, params):
+        """Sort options: saved order, city name, then each selected parameter."""
+        self._sort_keys = [None, "city"] + [p.key for p in params]
+        current = self.sort_choice.GetSelection()
+        self.sort_choice.Set(["Saved order", "City"] + [p.name for p in params])
+        self.sort_choice.SetSelection(current if 0 <= current < len(self._sort_keys) else 0)
+        self.sort_choice.Enable(self.all_cities.GetValue())
+        self.sort_desc.Enable(self.all_cities.GetValue())
+
+    def _load_matrix(self, params, refresh):
+        coords = [(lat, lon) for _, lat, lon in self.cities]
+
+        def work():
+            try:
+                rows, errors = mydata_service.fetch_mydata_matrix(coords, params,
+                                                                  use_cache=not refresh)
+            except Exception as e:  # noqa: BLE001
+                wx.CallAfter(self._error, str(e))
+                return
+            wx.CallAfter(self._matrix_ready, params, rows, errors)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _matrix_ready(self, params, rows, errors):
+        if not self._alive:
+            return
+        self.refresh_btn.Enable()
+        self._matrix = (params, rows, errors)
+        self.status.SetLabel(f"My Data for {len(self.cities)} saved cities.")
+        self._render_matrix()
+        self.lines.set_focus()
+
+    def _render_matrix(self):
+        if self._matrix is None or not self.all_cities.GetValue():
+            return
+        params, rows, errors = self._matrix
+        sel = self.sort_choice.GetSelection()
+        sort_by = self._sort_keys[sel] if 0 <= sel < len(self._sort_keys) else None
+        lines = mydata.matrix_lines([c[0] for c in self.cities], params, rows, self.fmt,
+                                    sort_by, self.sort_desc.GetValue())
+        if errors:
+            lines.append("")
+            for group, msg in errors.items():
+                lines.append(f"({group} unavailable: {msg})")
+        self.lines.set_lines(lines)
+
     def _error(self, err):
         if not self._alive:
             return
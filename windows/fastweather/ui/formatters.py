@@ -39,6 +39,12 @@ class Formatter:
         temp_f = (temp_c * 9 / 5) + 32
         return f"{temp_f:.0f}°F"
 
+    def temperature_delta(self, delta_c):
+        """A temperature difference (no 32-degree offset), unsigned."""
+        if self._units["temperature"] == "C":
+            return f"{abs(delta_c):.0f}°C"
+        return f"{abs(delta_c) * 9 / 5:.0f}°F"
+
     def wind_speed(self, wind_kmh):
         unit = self._units.get("wind_speed", "mph")
         if unit == "km/h":
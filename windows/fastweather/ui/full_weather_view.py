@@ -5,7 +5,7 @@ Pure text: takes parsed API data, the AppSettings (field toggles), and a
 Formatter (unit-aware). Returns a list of lines for AccessibleLinesPanel.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 
 from ..models.weather import describe_cloud_cover, describe_weather_code
 
@@ -23,6 +23,73 @@ def _hour_ampm(iso):
     return dt.strftime("%I %p").lstrip("0")
 
 
+def _versus_normal(value, normal, percentile, fmt):
+    if value is None or normal is None:
+        return ""
+    delta = value - normal
+    side = "above" if delta > 0 else "below"
+    text = (f"{fmt.temperature_delta(delta)} {side} normal" if round(abs(delta)) else
+            "near normal")
+    if percentile is not None and (percentile >= 90 or percentile <= 10):
+        text += ", unusually " + ("warm" if percentile >= 90 else "cold")
+    return text
+
+
+def climate_lines(clim_day, fmt, temp_max=None, temp_min=None):
+    """Normals / records for a calendar day, optionally compared with a day's
+    high and low. ``clim_day`` is a climatology.DayClimate."""
+    lines = []
+    if clim_day.normal_max is not None and clim_day.normal_min is not None:
+        lines.append(f"Normal high {fmt.temperature_short(clim_day.normal_max)}, "
+                     f"normal low {fmt.temperature_short(clim_day.normal_min)} "
+                     f"({clim_day.years}-year average)")
+    vs_high = _versus_normal(temp_max, clim_day.normal_max,
+                             clim_day.high_percentile(temp_max), fmt)
+    if vs_high:
+        lines.append(f"High {fmt.temperature_short(temp_max)} is {vs_high}")
+    vs_low = _versus_normal(temp_min, clim_day.normal_min,
+                            clim_day.low_percentile(temp_min), fmt)
+    if vs_low:
+        lines.append(f"Low {fmt.temperature_short(temp_min)} is {vs_low}")
+    if clim_day.max_deciles and clim_day.min_deciles:
+        lines.append(f"Typical range: highs {fmt.temperature_short(clim_day.max_deciles[1])}"
+                     f" to {fmt.temperature_short(clim_day.max_deciles[9])}, lows "
+                     f"{fmt.temperature_short(clim_day.min_deciles[1])} to "
+                     f"{fmt.temperature_short(clim_day.min_deciles[9])}")
+    if clim_day.record_high is not None:
+        lines.append(f"Record high {fmt.temperature_short(clim_day.record_high)} "
+                     f"({clim_day.record_high_year})")
+    if clim_day.record_low is not None:
+        lines.append(f"Record low {fmt.temperature_short(clim_day.record_low)} "
+                     f"({clim_day.record_low_year})")
+    if clim_day.normal_precip is not None:
+        lines.append(f"Normal precipitation {fmt.precipitation(clim_day.normal_precip)} per day")
+    return lines
+
+
+def report_date(data):
+    """Today at the location (from ``current.time``), falling back to ours."""
+    iso = ((data.get("current") or {}).get("time") or "")[:10]
+    return date.fromisoformat(iso) if iso else date.today()
+
+
+def _today_climate(clim_day, data, fmt):
+    """Climate lines comparing today's forecast with ``clim_day`` (or none)."""
+    if clim_day is None:
+        return []
+    daily = data.get("daily", {})
+    # The daily block starts past_days back; find today by the location's clock.
+    today_iso = report_date(data).isoformat()
+    times = daily.get("time") or []
+    idx = times.index(today_iso) if today_iso in times else None
+
+    def today_value(key):
+        values = daily.get(key) or []
+        return values[idx] if idx is not None and idx < len(values) else None
+    return climate_lines(clim_day, fmt,
+                         today_value("temperature_2m_max"), today_value("temperature_2m_min"))
+
+
 def build_today_outlook(data, settings, fmt):
     """Plain-language highlights for today (precip timing, UV, wind)."""
     lines = []
@@ -120,7 +187,8 @@ def build_day_lines(city, data, settings, fmt, target_date, offset_label):
     return lines
 
 
-def build_full_weather_lines(city, data, settings, fmt):
+def build_full_weather_lines(city, data, settings, fmt, climate=None):
+    """The full report; ``climate`` is today's climatology.DayClimate, if built."""
     lines = []
     lines.append(f"Report for {city}")
     lines.append("=" * 40)
@@ -250,6 +318,12 @@ def build_full_weather_lines(city, data, settings, fmt):
                 lines.extend(outlook)
                 lines.append("")
 
+        climate_text = _today_climate(climate, data, fmt)
+        if climate_text:
+            lines.append("CLIMATE")
+            lines.extend(climate_text)
+            lines.append("")
+
     cfg_hourly = settings["hourly"]
     if hourly and any(cfg_hourly.values()):
         lines.append("HOURLY")
@@ -2,7 +2,10 @@ import unittest
 from datetime import datetime, timedelta, timezone
 
 from fastweather.models import alert as A
-from fastweather.services import alert_service, nws
+from fastweather.services import alert_browser_service, alert_history, alert_service, nws
+from fastweather.services.alert_index import AlertIndex
+from fastweather.services.alert_search import AlertSearchIndex
+from fastweather.services.alert_store import AlertStore
 
 
 def _future(hours=6):
@@ -30,6 +33,28 @@ class HazardTests(unittest.TestCase):
         for event, expected in cases.items():
             self.assertEqual(A.classify_hazard(event), expected, event)
 
+    def test_overlapping_keywords_keep_precedence(self):
+        cases = {
+            "Tropical Storm Warning": "Tropical",  # not Wind via "storm"
+            "Storm Surge Watch": "Tropical",
+            "Wind Chill Advisory": "Winter",       # not Wind via "wind"
+            "Storm Warning": "Wind",
+            "Snowstorm": "Winter",
+            "Severe Thunderstorm Warning": "Storms",
+            "Special Marine Warning": "Marine & Coastal",
+            "": "Other",
+        }
+        for event, expected in cases.items():
+            self.assertEqual(A.classify_hazard(event), expected, event)
+
+    def test_derived_fields_computed_once(self):
+        a = A.WeatherAlert("Flood Warning", "Severe", "", "", "", "2026-10-19T10:00:00Z",
+                           "2026-10-19T16:00:00-05:00", "")
+        self.assertEqual((a.hazard, a.sort_key), ("Flooding", 1))
+        self.assertEqual(a.onset_dt, datetime(2026, 10, 19, 10, tzinfo=timezone.utc))
+        self.assertEqual(a.ends_dt, datetime(2026, 10, 19, 21, tzinfo=timezone.utc))
+        self.assertFalse(hasattr(a, "__dict__"))  # slotted
+
 
 class SeverityFilterTests(unittest.TestCase):
     def test_exclusive(self):
@@ -70,6 +95,26 @@ class DigestTests(unittest.TestCase):
         self.assertEqual(len(groups), 1)
         self.assertEqual(groups[0].event, "Flood Warning")
 
+    def test_index_views_and_counts(self):
+        alerts = [self._mk("Flood Warning", "Severe", "A"),
+                  self._mk("Flood Warning", "Severe", "B"),
+                  self._mk("Flood Advisory", "Minor", "C"),
+                  self._mk("High Wind Warning", "Severe", "D"),
+                  self._mk("Tornado Warning", "Extreme", "E")]
+        index = A.DigestIndex(alerts)
+
+        def rows(groups):
+            return [(g.severity, g.event, g.count) for g in groups]
+        self.assertEqual(rows(index.view("Severe")),
+                         [("Severe", "Flood Warning", 2), ("Severe", "High Wind Warning", 1)])
+        self.assertEqual(rows(index.view("All", "Flooding")),
+                         [("Severe", "Flood Warning", 2), ("Minor", "Flood Advisory", 1)])
+        self.assertEqual(index.view("Moderate", "Wind"), [])
+        self.assertIs(index.view("Severe", "Flooding"), index.view("Severe", "Flooding"))
+        self.assertEqual(index.severity_counts(),
+                         {"Extreme": 1, "Severe": 3, "Moderate": 0, "Minor": 1, "Unknown": 0})
+        self.assertEqual(index.hazard_counts(), {"Storms": 1, "Flooding": 3, "Wind": 1})
+
 
 class ExpiryTests(unittest.TestCase):
     def test_expired(self):
@@ -135,5 +180,332 @@ class AlertServiceTests(unittest.TestCase):
         self.assertIsNone(alert_service.has_active_alerts(9.0, 9.0))
 
 
+def _square(lat0, lon0, lat1, lon1):
+    return [[[lon0, lat0], [lon1, lat0], [lon1, lat1], [lon0, lat1], [lon0, lat0]]]
+
+
+def _feature(fid, event, sent="t1", geometry=None, ugc=(), ends=None, area="Area",
+             severity="Severe"):
+    return {"id": fid, "geometry": geometry, "properties": {
+        "id": fid, "event": event, "severity": severity, "areaDesc": area,
+        "sent": sent, "ends": ends or _future(), "geocode": {"UGC": list(ugc)}}}
+
+
+_POLY = {"type": "Polygon", "coordinates": _square(42.5, -90.0, 43.5, -89.0)}
+
+
+class AlertStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.store = AlertStore(nws.parse_feature)
+        self.delta = self.store.sync([
+            _feature("a", "Tornado Warning"),
+            _feature("b", "Flood Warning"),
+            _feature("old", "Flood Warning", ends=_past()),
+        ])
+
+    def test_initial_sync(self):
+        self.assertEqual(self.store.parsed, 3)
+        self.assertEqual(len(self.delta.upserted), 3)
+        self.assertEqual(sorted(a.event for a in self.store.alerts()),
+                         ["Flood Warning", "Tornado Warning"])  # expired not active
+        self.assertEqual(sorted(a.hazard for a in self.store.alerts()), ["Flooding", "Storms"])
+
+    def test_delta_reuses_unchanged_and_drops_removed(self):
+        kept = self.store.get("a")
+        delta = self.store.sync([
+            _feature("a", "Tornado Warning"),
+            _feature("b", "Flash Flood Warning", sent="t2"),
+            _feature("c", "High Wind Warning"),
+        ])
+        self.assertEqual(self.store.parsed, 2)                  # b re-sent, c new
+        self.assertIs(self.store.get("a"), kept)                # reused, not re-parsed
+        self.assertEqual(sorted(fid for fid, _, _ in delta.upserted), ["b", "c"])
+        self.assertEqual(delta.removed, ["old"])
+        self.assertEqual(sorted(a.hazard for a in self.store.alerts()),
+                         ["Flooding", "Storms", "Wind"])
+
+    def test_unchanged_feed_is_empty_delta(self):
+        delta = self.store.sync([
+            _feature("a", "Tornado Warning"),
+            _feature("b", "Flood Warning"),
+            _feature("old", "Flood Warning", ends=_past()),
+        ])
+        self.assertFalse(delta)
+        self.assertEqual(self.store.parsed, 0)
+
+    def test_alerts_expire_out_of_active_view(self):
+        later = datetime.now(timezone.utc) + timedelta(hours=12)
+        self.assertEqual(self.store.alerts(now=later), [])
+        self.assertIsNone(self.store.get("a"))
+
+
+class AlertIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.store = AlertStore(nws.parse_feature)
+        self.index = AlertIndex()
+        self.index.apply(self.store.sync([
+            _feature("p1", "Tornado Warning", geometry=_POLY),
+            _feature("z1", "Winter Storm Warning", ugc=["WIZ063", "WIZ064"]),
+            _feature("old", "Flood Warning", ends=_past(),
+                     geometry={"type": "Polygon", "coordinates": _square(42.0, -91.0, 44.0, -88.0)}),
+        ]))
+
+    def events(self, alerts):
+        return sorted(a.event for a in alerts)
+
+    def test_polygon_and_zone_matching(self):
+        self.assertEqual(self.events(self.index.alerts_at(43.07, -89.38)), ["Tornado Warning"])
+        self.assertEqual(self.events(self.index.alerts_at(43.07, -89.38, ["WIZ063"])),
+                         ["Tornado Warning", "Winter Storm Warning"])
+        self.assertEqual(self.index.alerts_at(43.07, -87.5), [])  # outside polygon
+        self.assertTrue(self.index.has_zone_alerts())
+
+    def test_incremental_update(self):
+        self.index.apply(self.store.sync([
+            _feature("p1", "Tornado Warning", geometry=_POLY),
+            _feature("z1", "Winter Storm Warning", sent="t2", ugc=["MNZ001"]),
+        ]))
+        self.assertEqual(len(self.index), 2)   # "old" dropped from the feed
+        self.assertEqual(self.index.alerts_at(43.07, -89.38, ["WIZ063"])[0].event,
+                         "Tornado Warning")
+        self.assertEqual(len(self.index.alerts_at(45.0, -95.0, ["MNZ001"])), 1)
+
+
+class AlertSearchTests(unittest.TestCase):
+    def setUp(self):
+        self.store = AlertStore(nws.parse_feature)
+        self.search = AlertSearchIndex()
+        self.search.apply(self.store.sync([
+            _feature("a", "Flood Warning", area="Dane County, WI"),
+            _feature("b", "Winter Storm Warning", area="Danbury; Fairfield"),
+            _feature("c", "Flood Advisory", area="Rock County, WI", severity="Minor"),
+        ]))
+
+    def ids(self, query):
+        return [a.id for a in self.search.search(query)]
+
+    def test_prefix_and_ranking(self):
+        self.assertEqual(self.ids("dane county"), ["a"])
+        self.assertEqual(sorted(self.ids("dan")), ["a", "b"])
+        self.assertEqual(self.ids("flood"), ["a", "c"])   # Severe before Minor
+        self.assertEqual(self.ids("flood rock"), ["c"])
+        self.assertEqual(self.ids("tornado"), [])
+        self.assertEqual(self.ids("  "), [])
+
+    def test_crowded_prefix_keeps_every_match(self):
+        filler = " ".join(f"co{i:03d}" for i in range(300))   # sorts before "county"
+        self.search.apply(self.store.sync([
+            _feature("a", "Flood Warning", area="Dane County, WI"),
+            _feature("d", "Special Weather Statement", area=filler),
+        ]))
+        self.assertEqual(self.ids("dane co"), ["a"])
+
+    def test_incremental_updates(self):
+        self.search.apply(self.store.sync([
+            _feature("a", "Flood Warning", area="Dane County, WI"),
+            _feature("c", "Flood Advisory", sent="t2", area="Green County, WI",
+                     severity="Minor"),
+        ]))
+        self.assertEqual(self.ids("rock"), [])
+        self.assertEqual(self.ids("green"), ["c"])
+        self.assertEqual(self.ids("winter"), [])
+        self.assertEqual(len(self.search), 2)
+
+
+class AlertHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime.now(timezone.utc)
+        self.history = alert_history.AlertHistory(":memory:", retention_days=30)
+        self.store = AlertStore(nws.parse_feature)
+        self.record([
+            _feature("a", "Flood Warning", ugc=["WIZ063"]),
+            _feature("b", "Flood Warning", ugc=["MNZ001", "MNC003"]),
+            _feature("c", "Tornado Warning", ugc=["WIC025"]),
+        ])
+
+    def record(self, features, now=None):
+        return self.history.record("NWS", self.store.sync(features, now=now),
+                                   alert_history.nws_regions, self.store.version, now=now)
+
+    def events(self, **kw):
+        return sorted((a.id, a.event) for a in self.history.query(**kw))
+
+    def test_region_time_and_event_queries(self):
+        since = self.now - timedelta(days=30)
+        self.assertEqual(self.events(since=since, region="wi", event="flood warning"),
+                         [("a", "Flood Warning")])
+        self.assertEqual(self.events(region="MN"), [("b", "Flood Warning")])
+        self.assertEqual(self.events(hazard="Storms"), [("c", "Tornado Warning")])
+        self.assertEqual(self.events(since=self.now + timedelta(days=1)), [])
+
+    def test_keeps_expired_and_only_new_versions(self):
+        added = self.record([_feature("a", "Flood Warning", ugc=["WIZ063"]),
+                             _feature("b", "Flood Warning", sent="t2", ugc=["MNZ001"])])
+        self.assertEqual(added, 1)  # a unchanged; b re-sent; c left the feed
+        self.assertEqual(len(self.history), 4)
+        self.assertIn(("c", "Tornado Warning"), self.events())
+
+    def test_query_reports_latest_version_once(self):
+        self.record([_feature("b", "Flood Warning", sent="t2", ugc=["MNZ001"]),
+                     _feature("b2", "Flood Warning", ugc=["MNZ002"])])
+        self.record([_feature("b", "Flash Flood Warning", sent="t3", ugc=["MNZ001"]),
+                     _feature("b2", "Flood Warning", ugc=["MNZ002"])])
+        self.assertEqual(len(self.history), 6)            # every version is kept
+        self.assertEqual(self.events(region="MN"),
+                         [("b", "Flash Flood Warning"), ("b2", "Flood Warning")])
+        self.assertEqual(self.events(event="flood warning", region="MN"),
+                         [("b2", "Flood Warning")])
+
+    def test_retention(self):
+        later = self.now + timedelta(days=45)
+        self.assertEqual(self.history.prune(now=later, force=True), 3)
+        self.assertEqual(self.events(region="WI"), [])
+
+
+class BadgeTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = (alert_service.http.get_features, alert_service.point_zones,
+                      alert_history._history, alert_service.national_store,
+                      alert_service._index, alert_service.national_search)
+        alert_history._history = alert_history.AlertHistory(":memory:")
+        alert_service.national_store = AlertStore(nws.parse_feature)
+        alert_service._index = AlertIndex()
+        alert_service.national_search = AlertSearchIndex()
+        alert_service._index_state.update(synced_at=None)
+        self.requests = []
+        feed = [_feature("p1", "Tornado Warning", geometry=_POLY)]
+
+        def fake_get_features(url, params=None, **kwargs):
+            self.requests.append(params)
+            return iter(feed)
+        alert_service.http.get_features = fake_get_features
+        alert_service.point_zones = lambda lat, lon: []
+
+    def tearDown(self):
+        (alert_service.http.get_features, alert_service.point_zones,
+         alert_history._history, alert_service.national_store,
+         alert_service._index, alert_service.national_search) = self._orig
+        alert_service._index_state.update(synced_at=None)
+
+    def test_many_cities_one_request(self):
+        badges = alert_service.badge_cities({
+            "Madison": (43.07, -89.38), "Milwaukee": (43.04, -87.91),
+            "Janesville": (42.68, -89.02)})
+        self.assertEqual(badges, {"Madison": True, "Milwaukee": False, "Janesville": True})
+        self.assertEqual(self.requests, [{"status": "actual"}])
+        self.assertEqual(len(alert_history._history), 1)  # recorded from the delta
+
+    def test_dropped_stream_leaves_store_untouched(self):
+        feed = [_feature("p1", "Tornado Warning", geometry=_POLY),
+                _feature("p2", "Flood Warning", geometry=_POLY)]
+
+        def dropped(url, params=None, **kwargs):
+            yield from feed
+            raise ConnectionError("connection reset")
+        alert_service.http.get_features = dropped
+        with self.assertRaises(ConnectionError):
+            alert_service.sync_national()
+        alert_service.http.get_features = lambda url, params=None, **kw: iter(feed)
+        alert_service.sync_national()
+        self.assertEqual([a.event for a in alert_service.national_search.search("flood")],
+                         ["Flood Warning"])
+        self.assertEqual(len(alert_history._history), 2)
+        self.assertTrue(alert_service.badge_cities({"Madison": (43.07, -89.38)})["Madison"])
+
+
+class RegionCountTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = alert_browser_service.http.get_json
+        alert_browser_service._count_cache.clear()
+        alert_browser_service._alerts_cache.clear()
+        self.urls = []
+
+        def fake_get_json(url, params=None, **kwargs):
+            self.urls.append(url)
+            if url == alert_browser_service.NWS_COUNT_URL:
+                return {"total": 412, "land": 300, "marine": 112}
+            if url == alert_browser_service.ECCC_URL and params.get("resulttype") == "hits":
+                return {"type": "FeatureCollection", "numberMatched": 37, "features": []}
+            raise AssertionError(f"unexpected full fetch: {url}")
+        alert_browser_service.http.get_json = fake_get_json
+
+    def tearDown(self):
+        alert_browser_service.http.get_json = self._orig
+        alert_browser_service._count_cache.clear()
+        alert_browser_service._alerts_cache.clear()
+
+    def test_counts_use_count_endpoints_only(self):
+        self.assertEqual(alert_browser_service.alert_counts(), {"us": 412, "ca": 37})
+        self.assertEqual(len(self.urls), 2)
+
+    def test_loaded_region_counts_exactly(self):
+        alert_browser_service._alerts_cache.set("ca", ["a", "b"])
+        self.assertEqual(alert_browser_service.alert_count("ca"), 2)
+
+    def test_failure_is_none(self):
+        alert_browser_service.http.get_json = lambda *a, **k: 1 / 0
+        self.assertEqual(alert_browser_service.alert_counts(["us"]), {"us": None})
+
+
+def _eccc_feature(n):
+    return {"id": f"f{n}", "properties": {
+        "id": f"a{n}", "alert_name_en": "rainfall warning", "status_en": "active",
+        "publication_datetime": "2026-10-19T10:00:00Z", "event_end_datetime": _future()}}
+
+
+class EcccPagingTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = (alert_browser_service.http.get_json, alert_browser_service.ECCC_PAGE_SIZE)
+        alert_browser_service.ECCC_PAGE_SIZE = 3
+        self.features = [_eccc_feature(n) for n in range(8)]
+        self.calls = []
+
+    def tearDown(self):
+        alert_browser_service.http.get_json, alert_browser_service.ECCC_PAGE_SIZE = self._orig
+
+    def test_offsets_fetched_and_deduplicated(self):
+        def fake_get_json(url, params=None, **kwargs):
+            self.calls.append(params["offset"])
+            # Overlap one item between pages, as if the feed shifted mid-fetch.
+            start = max(0, params["offset"] - 1)
+            return {"numberMatched": 8,
+                    "features": self.features[start:params["offset"] + params["limit"]]}
+        alert_browser_service.http.get_json = fake_get_json
+        feats = alert_browser_service._eccc_features()
+        self.assertEqual(sorted(self.calls), [0, 3, 6])
+        self.assertEqual(sorted(f["properties"]["id"] for f in feats),
+                         [f"a{n}" for n in range(8)])
+
+    def test_follows_next_links_without_total(self):
+        def fake_get_json(url, params=None, **kwargs):
+            offset = params["offset"] if params else int(url.rsplit("=", 1)[1])
+            self.calls.append(offset)
+            page = {"features": self.features[offset:offset + 3], "links": []}
+            if offset + 3 < len(self.features):
+                page["links"].append({"rel": "next", "href": f"https://eccc.test/items?offset={offset + 3}"})
+            return page
+        alert_browser_service.http.get_json = fake_get_json
+        self.assertEqual(len(alert_browser_service._eccc_features()), 8)
+        self.assertEqual(self.calls, [0, 3, 6])
+
+        orig, alert_browser_service.ECCC_MAX_PAGES = alert_browser_service.ECCC_MAX_PAGES, 2
+        try:
+            with self.assertRaises(ValueError):          # never silently short
+                alert_browser_service._eccc_features()
+        finally:
+            alert_browser_service.ECCC_MAX_PAGES = orig
+
+    def test_total_is_not_capped(self):
+        self.features = [_eccc_feature(n) for n in range(3 * 45)]
+
+        def fake_get_json(url, params=None, **kwargs):
+            self.calls.append(params["offset"])
+            return {"numberMatched": len(self.features),
+                    "features": self.features[params["offset"]:params["offset"] + 3]}
+        alert_browser_service.http.get_json = fake_get_json
+        self.assertEqual(len(alert_browser_service._eccc_features()), 3 * 45)
+        self.assertEqual(len(self.calls), 45)             # past ECCC_MAX_PAGES
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from fastweather import geo
+from fastweather.city_index import CityIndex
+
+
+def _city(name, lat, lon, region=""):
+    return {"display": name, "lat": lat, "lon": lon, "region": region}
+
+
+class CityIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.cities = [
+            _city("Madison", 43.0747, -89.3842, "Wisconsin"),
+            _city("Milwaukee", 43.0386, -87.9091, "Wisconsin"),
+            _city("Chicago", 41.8781, -87.6298, "Illinois"),
+            _city("Rockford", 42.2711, -89.0940, "Illinois"),
+            _city("Denver", 39.7392, -104.9903, "Colorado"),
+            _city("Suva", -18.1416, 178.4419, "Fiji"),
+            _city("Broken", None, None),
+        ]
+        self.index = CityIndex(self.cities)
+
+    def names(self, hits):
+        return [c["display"] for _, c in hits]
+
+    def test_skips_cities_without_coordinates(self):
+        self.assertEqual(len(self.index), 6)
+
+    def test_k_nearest_sorted_by_distance(self):
+        hits = self.index.nearest(43.0, -89.3, k=3)
+        self.assertEqual(self.names(hits), ["Madison", "Rockford", "Milwaukee"])
+        dists = [d for d, _ in hits]
+        self.assertEqual(dists, sorted(dists))
+        self.assertAlmostEqual(dists[0], geo.haversine_km(43.0, -89.3, 43.0747, -89.3842))
+
+    def test_radius_and_minimum(self):
+        self.assertEqual(self.names(self.index.nearest(43.0747, -89.3842, k=5, max_km=150)),
+                         ["Madison", "Rockford", "Milwaukee"])
+        self.assertEqual(self.names(self.index.nearest(43.0747, -89.3842, k=1, min_km=1)),
+                         ["Rockford"])
+        self.assertEqual(self.index.nearest(0.0, 0.0, k=3, max_km=500), [])
+
+    def test_region_and_predicate_filters(self):
+        hits = self.index.nearest(43.0, -89.3, k=5, region="Illinois")
+        self.assertEqual(self.names(hits), ["Rockford", "Chicago"])
+        hits = self.index.nearest(43.0, -89.3, k=1,
+                                  where=lambda c: c["display"] != "Madison")
+        self.assertEqual(self.names(hits), ["Rockford"])
+
+    def test_across_antimeridian(self):
+        hits = self.index.nearest(-18.0, -179.9, k=1, max_km=300)
+        self.assertEqual(self.names(hits), ["Suva"])
+
+    def test_matches_brute_force(self):
+        grid = [_city(f"{la},{lo}", la, lo) for la in range(-80, 81, 7)
+                for lo in range(-180, 180, 11)]
+        index = CityIndex(grid)
+        for lat, lon in ((43.1, -89.4), (-33.9, 151.2), (89.0, 10.0), (0.0, 179.9)):
+            brute = sorted(grid, key=lambda c: geo.haversine_km(lat, lon, c["lat"], c["lon"]))
+            self.assertEqual(self.names(index.nearest(lat, lon, k=6)),
+                             [c["display"] for c in brute[:6]])
+
+    def test_within(self):
+        hits = self.index.within(43.0747, -89.3842, 200)
+        self.assertEqual(set(self.names(hits)), {"Madison", "Milwaukee", "Rockford", "Chicago"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from fastweather.city_search import CitySearchIndex, normalize
+
+US = {
+    "Wisconsin": [
+        {"name": "Milwaukee", "state": "Wisconsin", "country": "United States", "lat": 43.04, "lon": -87.91},
+        {"name": "Madison", "state": "Wisconsin", "country": "United States", "lat": 43.07, "lon": -89.38},
+    ],
+    "Alabama": [
+        {"name": "Birmingham", "state": "Alabama", "country": "United States", "lat": 33.52, "lon": -86.80},
+        {"name": "Huntsville", "state": "Alabama", "country": "United States", "lat": 34.73, "lon": -86.59},
+        {"name": "Madison", "state": "Alabama", "country": "United States", "lat": 34.70, "lon": -86.75},
+    ],
+}
+INTL = {
+    "Spain": [
+        {"name": "Madrid", "state": "Comunidad de Madrid", "country": "Spain", "lat": 40.42, "lon": -3.70},
+    ],
+    "Switzerland": [
+        {"name": "Zürich", "state": "Zürich", "country": "Switzerland", "lat": 47.37, "lon": 8.54},
+    ],
+}
+
+
+class CitySearchTests(unittest.TestCase):
+    def setUp(self):
+        self.index = CitySearchIndex(US, INTL)
+
+    def displays(self, matches):
+        return [m["display"] for m in matches]
+
+    def test_normalize_folds_accents_case_and_punctuation(self):
+        self.assertEqual(normalize("  Zürich-Stadt, "), "zurich stadt")
+        self.assertEqual(normalize("SÃO Paulo"), "sao paulo")
+
+    def test_exact_matches_ranked_by_size_within_region(self):
+        self.assertEqual(self.displays(self.index.search("madison")),
+                         ["Madison, Wisconsin, United States",
+                          "Madison, Alabama, United States"])
+
+    def test_region_filter_and_state_abbreviation(self):
+        self.assertEqual(self.displays(self.index.search("Madison, AL")),
+                         ["Madison, Alabama, United States"])
+        self.assertEqual(self.displays(self.index.search("Madison, wisc")),
+                         ["Madison, Wisconsin, United States"])
+
+    def test_prefix_and_exact_only(self):
+        self.assertEqual(self.displays(self.index.search("mad")),
+                         ["Madrid, Comunidad de Madrid, Spain",
+                          "Madison, Wisconsin, United States",
+                          "Madison, Alabama, United States"])
+        self.assertEqual(self.index.search("mad", exact_only=True), [])
+
+    def test_accent_insensitive_build_match_shape(self):
+        m = self.index.search("zurich")[0]
+        self.assertEqual(m["display"], "Zürich, Zürich, Switzerland")
+        for key in ("name", "city", "state", "country", "kind", "importance", "lat", "lon"):
+            self.assertIn(key, m)
+        self.assertEqual(m["kind"], "city")
+
+
+if __name__ == "__main__":
+    unittest.main()
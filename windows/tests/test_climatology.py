@@ -0,0 +1,71 @@
+import unittest
+from datetime import date, timedelta
+
+from fastweather.models.historical import DailySeries
+from fastweather.models.settings import AppSettings
+from fastweather.services import climatology
+from fastweather.ui.formatters import Formatter
+from fastweather.ui import full_weather_view
+from fastweather.ui.full_weather_view import climate_lines
+
+
+def _series(first_year, last_year):
+    """Highs of 20C + year offset, lows 10C below; a record day in 2001."""
+    start, end = date(first_year, 1, 1), date(last_year, 12, 31)
+    n = (end - start).days + 1
+    times = [(start + timedelta(days=i)) for i in range(n)]
+    highs = [20.0 + (t.year - first_year) for t in times]
+    highs[times.index(date(2001, 7, 4))] = 40.0
+    series = DailySeries()
+    series.merge({"time": [t.isoformat() for t in times],
+                  "temperature_2m_max": highs,
+                  "temperature_2m_min": [h - 10 for h in highs],
+                  "precipitation_sum": [1.0] * n}, start, end)
+    return series
+
+
+class ClimatologyTests(unittest.TestCase):
+    def setUp(self):
+        self.clim = climatology.compute(_series(2000, 2009), 2000, 2009)
+
+    def test_normals_percentiles_records(self):
+        day = self.clim.day(7, 4)
+        self.assertEqual(day.years, 10)
+        self.assertAlmostEqual(day.normal_max, 24.63, places=2)   # 24.5 + the 40C outlier
+        self.assertEqual((day.record_high, day.record_high_year), (40.0, 2001))
+        self.assertEqual((day.record_low, day.record_low_year), (10.0, 2000))
+        self.assertEqual(day.normal_precip, 1.0)
+        self.assertEqual(day.high_percentile(50.0), 100.0)
+        self.assertEqual(day.high_percentile(0.0), 0.0)
+        self.assertTrue(40 <= day.high_percentile(24.5) <= 60)
+
+    def test_leap_day_and_round_trip(self):
+        clim = climatology.Climatology.from_payload(self.clim.to_payload())
+        self.assertIsNotNone(clim.day(2, 29).normal_max)
+        self.assertEqual(clim.day(12, 31).record_high_year, 2009)
+
+    def test_climate_lines(self):
+        fmt = Formatter(AppSettings())
+        lines = climate_lines(self.clim.day(1, 15), fmt, temp_max=35.0)
+        self.assertTrue(lines[0].startswith("Normal high 76°F, normal low 58°F"))
+        self.assertIn("unusually warm", lines[1])
+        self.assertTrue(any(l.startswith("Record high 84°F (2009)") for l in lines))
+
+    def test_report_uses_today_not_past_days(self):
+        days = [date(2026, 1, 8) + timedelta(days=i) for i in range(15)]  # past_days=7
+        highs = [0.0] * 15
+        highs[7] = 35.0                                                   # Jan 15
+        data = {"current": {"time": "2026-01-15T10:00"},
+                "daily": {"time": [d.isoformat() for d in days],
+                          "temperature_2m_max": highs,
+                          "temperature_2m_min": [h - 10 for h in highs]}}
+        today = full_weather_view.report_date(data)
+        lines = full_weather_view._today_climate(self.clim.day(today.month, today.day), data,
+                                                 Formatter(AppSettings()))
+        self.assertEqual(lines, climate_lines(self.clim.day(1, 15), Formatter(AppSettings()),
+                                              35.0, 25.0))
+        self.assertIn("unusually warm", lines[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
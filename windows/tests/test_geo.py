@@ -20,6 +20,13 @@ class GeoTests(unittest.TestCase):
         self.assertEqual(geo.angular_diff(10, 350), 20)
         self.assertEqual(geo.angular_diff(0, 180), 180)
 
+    def test_point_in_polygon_with_hole(self):
+        outer = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+        hole = [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]]
+        self.assertTrue(geo.point_in_polygon(2, 2, [outer, hole]))
+        self.assertFalse(geo.point_in_polygon(5, 5, [outer, hole]))
+        self.assertFalse(geo.point_in_polygon(11, 5, [outer]))
+
     def test_cross_track_small_on_line(self):
         # a point due east on the eastward line has ~0 cross-track distance
         lat, lon = geo.destination_point(43.0, -89.0, 90, 50)
@@ -1,5 +1,7 @@
 import unittest
 
+from fastweather.city_index import CityIndex
+from fastweather.city_search import CitySearchIndex
 from fastweather.services import geocoding_service as g
 
 
@@ -60,5 +62,92 @@ class GeocodeSortTests(unittest.TestCase):
         self.assertEqual(matches[0]["name"], "Big University")  # importance wins
 
 
+class LocalGeocodeTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = (g.city_search, g.http.get_json)
+        index = CitySearchIndex({"Wisconsin": [
+            {"name": "Madison", "state": "Wisconsin", "country": "United States",
+             "lat": 43.07, "lon": -89.38},
+        ]})
+        g.city_search = lambda: index
+        self.calls = []
+
+        def fake_get_json(url, params=None, headers=None):
+            self.calls.append(params["q"])
+            return [_result("Main Street", {"city": "Madison", "state": "Wisconsin",
+                                            "country": "United States"}, type_="road")]
+        g.http.get_json = fake_get_json
+
+    def tearDown(self):
+        g.city_search, g.http.get_json = self._orig
+
+    def test_bundled_city_answered_offline(self):
+        matches = g.geocode("madison, wi")
+        self.assertEqual(matches[0]["display"], "Madison, Wisconsin, United States")
+        self.assertEqual(self.calls, [])
+
+    def test_addresses_and_landmarks_go_to_nominatim(self):
+        g.geocode("123 Main St, Madison")
+        g.geocode("Madison Square Garden")
+        self.assertEqual(self.calls, ["123 Main St, Madison", "Madison Square Garden"])
+        g.geocode("madison", local=False)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_prefix_fallback_when_network_fails(self):
+        def boom(*a, **k):
+            raise OSError("offline")
+        g.http.get_json = boom
+        self.assertEqual(g.geocode("madi")[0]["name"], "Madison")
+        with self.assertRaises(OSError):
+            g.geocode("Nowhere Special")
+
+
+class _MemoryCache:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value):
+        self.store[key] = value
+
+
+class ReverseGeocodeTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = (g.city_index, g.http.get_json, g._reverse_cache)
+        index = CityIndex([
+            {"name": "Madison", "state": "Wisconsin", "country": "United States",
+             "lat": 43.0747, "lon": -89.3842},
+            {"name": "Reykjavik", "state": "", "country": "Iceland",
+             "lat": 64.1466, "lon": -21.9426},
+        ])
+        g.city_index = lambda: index
+        g._reverse_cache = _MemoryCache()
+        self.calls = []
+
+        def fake_get_json(url, params=None, headers=None):
+            self.calls.append(params)
+            return {"address": {"town": "Middle", "state": "Nowhere"}}
+        g.http.get_json = fake_get_json
+
+    def tearDown(self):
+        g.city_index, g.http.get_json, g._reverse_cache = self._orig
+
+    def test_nearby_bundled_city_answers_offline(self):
+        self.assertEqual(g.reverse_geocode(43.2, -89.5), "Madison, Wisconsin")
+        self.assertEqual(g.reverse_geocode(64.0, -22.0), "Reykjavik, Iceland")
+        self.assertEqual(self.calls, [])
+
+    def test_falls_back_to_nominatim_when_nothing_near(self):
+        self.assertIsNone(g.reverse_geocode_offline(40.0, -100.0))
+        self.assertEqual(g.reverse_geocode(40.0, -100.0), "Middle, Nowhere")
+        self.assertEqual(len(self.calls), 1)
+
+    def test_zero_radius_forces_nominatim(self):
+        self.assertEqual(g.reverse_geocode(43.0747, -89.3842, max_km=0), "Middle, Nowhere")
+        self.assertEqual(len(self.calls), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,10 +3,19 @@ import unittest
 from fastweather.models.historical import HistoricalDay
 from fastweather.models.settings import AppSettings
 from fastweather.services import historical_service
-from fastweather.ui.dialogs.historical_dialog import format_day_line
+from fastweather.ui.dialogs.historical_dialog import (comparison_label, format_comparison_lines,
+                                                      format_day_line)
 from fastweather.ui.formatters import Formatter
 
 
+class _NullDisk:
+    def get(self, key):
+        return None
+
+    def set(self, key, payload):
+        pass
+
+
 class HistoricalTests(unittest.TestCase):
     def test_day_from(self):
         daily = {
@@ -37,18 +46,41 @@ class HistoricalTests(unittest.TestCase):
         line = format_day_line(HistoricalDay(date="2000-01-02", error="No data"), fmt)
         self.assertIn("unavailable", line)
 
+    def test_comparison_table(self):
+        fmt = Formatter(AppSettings())
+        days = [HistoricalDay(date="2000-01-02", temp_max=2.0, temp_min=-3.0, precip_sum=0.0,
+                              wind_max=10.0, weather_code=3),
+                HistoricalDay(date="2000-01-02", error="No data"),
+                HistoricalDay(date="2000-01-02", temp_max=20.0)]
+        lines = format_comparison_lines(["Madison", "Nowhere", "Miami, Florida"], days, fmt)
+        self.assertTrue(lines[0].startswith("City            High"))
+        self.assertIn("36°F", lines[1])
+        self.assertEqual(lines[1].index("36°F"), lines[0].index("High"))
+        self.assertTrue(lines[2].startswith("Miami, Florida  68°F"))
+        self.assertEqual(lines[3], "Nowhere: unavailable (No data)")
+
+    def test_comparison_label_counts_compared_cities(self):
+        self.assertEqual(comparison_label(["Madison", "Miami", "Boise"]),
+                         "The same date for Madison and 2 other saved cities.")
+        self.assertEqual(comparison_label(["Madison", "Miami"]),
+                         "The same date for Madison and 1 other saved city.")
+        self.assertIn("save more cities", comparison_label(["Madison"]))
+
     def test_multi_year_dates(self):
         captured = []
-        orig = historical_service.fetch_single_day
-        historical_service.fetch_single_day = (
-            lambda lat, lon, iso: captured.append(iso) or HistoricalDay(date=iso))
+        orig = (historical_service._archive_daily, historical_service._series_cache)
+        historical_service._archive_daily = (
+            lambda lat, lon, start, end: captured.append((start, end)) or {})
+        historical_service._series_cache = lambda: _NullDisk()
+        historical_service._series.clear()
         try:
             days = historical_service.fetch_multi_year(1.0, 2.0, 7, 4, 3)
         finally:
-            historical_service.fetch_single_day = orig
+            historical_service._archive_daily, historical_service._series_cache = orig
+            historical_service._series.clear()
         self.assertEqual(len(days), 3)
-        # all requested dates end in -07-04
-        self.assertTrue(all(iso.endswith("-07-04") for iso in captured))
+        self.assertTrue(all(d.date.endswith("-07-04") for d in days))
+        self.assertEqual(len(captured), 1)  # one archive request for all years
 
 
 if __name__ == "__main__":
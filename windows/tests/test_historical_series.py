@@ -0,0 +1,358 @@
+import math
+import tempfile
+import threading
+import unittest
+from datetime import date, datetime, timedelta
+
+from fastweather.models.historical import DailySeries
+from fastweather.services import historical_service
+from fastweather.services.hourly_store import HourlyStore
+
+
+def _daily(start, end, base=10.0):
+    days = (end - start).days + 1
+    times = [(start + timedelta(days=i)).isoformat() for i in range(days)]
+    return {
+        "time": times,
+        "temperature_2m_max": [base + i for i in range(days)],
+        "temperature_2m_min": [base - 10 + i for i in range(days)],
+        "precipitation_sum": [0.0] * days,
+        "snowfall_sum": [None] * days,
+        "windspeed_10m_max": [5.0] * days,
+        "weathercode": [3] * days,
+    }
+
+
+def _hourly(start, end):
+    """Hourly block whose temperature is the hour of day and precip 1 mm/h."""
+    hours = ((end - start).days + 1) * 24
+    first = datetime(start.year, start.month, start.day)
+    return {
+        "time": [(first + timedelta(hours=h)).isoformat(timespec="minutes")
+                 for h in range(hours)],
+        "temperature_2m": [float(h % 24) for h in range(hours)],
+        "precipitation": [1.0] * hours,
+        "weathercode": [None] * hours,
+    }
+
+
+class _MemoryDisk:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, payload):
+        self.data[key] = payload
+
+
+class DailySeriesTests(unittest.TestCase):
+    def test_merge_lookup_and_gaps(self):
+        s = DailySeries()
+        s.merge(_daily(date(2000, 1, 1), date(2000, 1, 10)), date(2000, 1, 1), date(2000, 1, 10))
+        s.merge(_daily(date(2000, 1, 20), date(2000, 1, 31)), date(2000, 1, 20), date(2000, 1, 31))
+        d = s.day(date(2000, 1, 3))
+        self.assertEqual((d.date, d.temp_max, d.snowfall_sum, d.weather_code),
+                         ("2000-01-03", 12.0, None, 3))
+        self.assertIsNone(s.day(date(2000, 1, 15)))
+        self.assertEqual(s.missing(date(1999, 12, 30), date(2000, 2, 2)), [
+            (date(1999, 12, 30), date(1999, 12, 31)),
+            (date(2000, 1, 11), date(2000, 1, 19)),
+            (date(2000, 2, 1), date(2000, 2, 2)),
+        ])
+        self.assertEqual(s.missing(date(2000, 1, 2), date(2000, 1, 9)), [])
+
+    def test_same_day_and_round_trip(self):
+        s = DailySeries()
+        s.merge(_daily(date(2019, 1, 1), date(2020, 12, 31)), date(2019, 1, 1), date(2020, 12, 31))
+        s = DailySeries.from_payload(s.to_payload())
+        rows = s.same_day(2, 29, [2020, 2019])
+        self.assertIsNone(rows[0].error)
+        self.assertEqual(rows[1].error, "No such date")
+        self.assertEqual(s.same_day(3, 1, [2018])[0].error, "No data")
+
+
+class _ArchiveFixture(unittest.TestCase):
+    def setUp(self):
+        self._orig = (historical_service._archive_daily, historical_service._series_cache)
+        self.disk = _MemoryDisk()
+        self.calls = []
+
+        def fake_archive(lat, lon, start, end):
+            self.calls.append((start, end))
+            return _daily(start, end)
+        historical_service._archive_daily = fake_archive
+        historical_service._series_cache = lambda: self.disk
+        historical_service._series.clear()
+
+    def tearDown(self):
+        historical_service._archive_daily, historical_service._series_cache = self._orig
+        historical_service._series.clear()
+
+
+class MultiYearArchiveTests(_ArchiveFixture):
+    def test_one_fetch_then_any_day_is_local(self):
+        days = historical_service.fetch_multi_year(43.0, -89.0, 7, 4, 20)
+        self.assertEqual(len(days), 20)
+        self.assertTrue(all(d.error is None for d in days))
+        self.assertEqual(len(self.calls), 2)  # two decade-long chunks
+        historical_service.fetch_multi_year(43.0, -89.0, 12, 25, 20)
+        self.assertEqual(len(self.calls), 2)  # other dates are free
+
+    def test_series_persisted_across_sessions(self):
+        historical_service.fetch_multi_year(43.0, -89.0, 7, 4, 5)
+        historical_service._series.clear()     # fresh process, same disk
+        historical_service.fetch_multi_year(43.0, -89.0, 1, 1, 5)
+        self.assertEqual(len(self.calls), 1)
+
+
+class RangeGapFillTests(_ArchiveFixture):
+    def test_overlapping_ranges_fetch_only_new_days(self):
+        days = historical_service.fetch_range(43.0, -89.0, "2000-01-01", "2000-01-31")
+        self.assertEqual(len(days), 31)
+        days = historical_service.fetch_range(43.0, -89.0, "2000-01-15", "2000-02-15")
+        self.assertEqual([d.date for d in days][0], "2000-01-15")
+        self.assertEqual(len(days), 32)
+        self.assertEqual(self.calls, [(date(2000, 1, 1), date(2000, 1, 31)),
+                                      (date(2000, 2, 1), date(2000, 2, 15))])
+        day = historical_service.fetch_single_day(43.0, -89.0, "2000-01-20")
+        self.assertEqual(day.temp_max, 29.0)   # read from the stored month
+        self.assertEqual(len(self.calls), 2)
+
+    def test_holes_are_filled_and_small_ones_joined(self):
+        historical_service.fetch_range(43.0, -89.0, "2000-03-01", "2000-03-05")
+        historical_service.fetch_range(43.0, -89.0, "2000-03-08", "2000-03-10")
+        historical_service.fetch_range(43.0, -89.0, "2000-04-01", "2000-04-30")
+        del self.calls[:]
+        days = historical_service.fetch_range(43.0, -89.0, "2000-02-25", "2000-05-10")
+        self.assertEqual(len(days), 76)
+        # Short stored runs (Mar 1-5, 8-10) are fetched across; April is not.
+        self.assertEqual(self.calls, [(date(2000, 2, 25), date(2000, 3, 31)),
+                                      (date(2000, 5, 1), date(2000, 5, 10))])
+
+
+class ChunkedArchiveTests(_ArchiveFixture):
+    def setUp(self):
+        super().setUp()
+        self._orig_chunking = (historical_service.ARCHIVE_RETRY_DELAY,
+                               historical_service.ARCHIVE_CHUNK_YEARS)
+        historical_service.ARCHIVE_RETRY_DELAY = 0
+        historical_service.ARCHIVE_CHUNK_YEARS = 1
+
+    def tearDown(self):
+        (historical_service.ARCHIVE_RETRY_DELAY,
+         historical_service.ARCHIVE_CHUNK_YEARS) = self._orig_chunking
+        super().tearDown()
+
+    def _flaky(self, fail):
+        """Archive fake that raises while ``fail(start, attempt)`` is true."""
+        attempts = {}
+
+        def fetch(lat, lon, start, end):
+            attempts[start] = attempts.get(start, 0) + 1
+            self.calls.append((start, end))
+            if fail(start, attempts[start]):
+                raise OSError("timed out")
+            return _daily(start, end)
+        historical_service._archive_daily = fetch
+
+    def test_long_range_split_into_year_chunks(self):
+        series = historical_service.ensure_archive(43.0, -89.0, date(1990, 1, 1),
+                                                   date(1999, 12, 31))
+        self.assertEqual(len(self.calls), 10)
+        self.assertEqual(sorted(self.calls)[0], (date(1990, 1, 1), date(1990, 12, 31)))
+        self.assertEqual(series.missing(date(1990, 1, 1), date(1999, 12, 31)), [])
+
+    def test_chunk_retried_on_its_own(self):
+        self._flaky(lambda start, n: start.year == 1995 and n == 1)
+        historical_service.ensure_archive(43.0, -89.0, date(1990, 1, 1), date(1999, 12, 31))
+        self.assertEqual(len(self.calls), 11)
+
+    def test_partial_failure_is_kept_and_resumed(self):
+        self._flaky(lambda start, n: start.year == 1995)
+        with self.assertRaises(OSError):
+            historical_service.ensure_archive(43.0, -89.0, date(1990, 1, 1),
+                                              date(1999, 12, 31))
+        historical_service._series.clear()      # the saved series survives
+        del self.calls[:]
+        self._flaky(lambda start, n: False)
+        historical_service.ensure_archive(43.0, -89.0, date(1990, 1, 1), date(1999, 12, 31))
+        self.assertEqual(self.calls, [(date(1995, 1, 1), date(1995, 12, 31))])
+
+
+class PrefetchTests(_ArchiveFixture):
+    def test_adjacent_views_are_local_after_prefetch(self):
+        historical_service.fetch_range(43.0, -89.0, "2000-03-08", "2000-03-14")
+        historical_service.prefetch_adjacent(
+            43.0, -89.0, "2000-03-08", "2000-03-14").result(timeout=5)
+        self.assertEqual(sorted(self.calls), [(date(2000, 2, 23), date(2000, 3, 7)),
+                                              (date(2000, 3, 8), date(2000, 3, 14)),
+                                              (date(2000, 3, 15), date(2000, 3, 28))])
+        del self.calls[:]
+        for start, end in (("2000-03-15", "2000-03-21"), ("2000-03-01", "2000-03-07")):
+            self.assertEqual(len(historical_service.fetch_range(43.0, -89.0, start, end)), 7)
+        self.assertEqual(self.calls, [])
+
+    def test_prefetch_download_does_not_block_foreground(self):
+        started, gate = threading.Event(), threading.Event()
+
+        def slow(lat, lon, start, end):
+            if start < date(2000, 3, 8):          # the backward prefetch
+                started.set()
+                gate.wait(5)
+            self.calls.append((start, end))
+            return _daily(start, end)
+        historical_service._archive_daily = slow
+        pending = historical_service.prefetch_adjacent(43.0, -89.0, "2000-03-08", "2000-03-14")
+        self.assertTrue(started.wait(5))
+        user = threading.Thread(target=historical_service.fetch_range,
+                                args=(43.0, -89.0, "2000-06-01", "2000-06-07"))
+        user.start()
+        user.join(2)
+        self.assertFalse(user.is_alive())         # not stuck behind the prefetch
+        gate.set()
+        pending.result(timeout=5)
+        series = historical_service.load_series(43.0, -89.0)
+        self.assertEqual(series.missing(date(2000, 2, 23), date(2000, 3, 7)), [])
+        self.assertEqual(series.missing(date(2000, 6, 1), date(2000, 6, 7)), [])
+
+    def test_newer_view_cancels_queued_prefetch(self):
+        gate = threading.Event()
+        historical_service._prefetch_pool.submit(gate.wait, 5)   # occupy the worker
+        stale = historical_service.prefetch_adjacent(43.0, -89.0, "2000-03-08", "2000-03-14")
+        historical_service.cancel_prefetch()
+        gate.set()
+        stale.result(timeout=5)
+        self.assertEqual(self.calls, [])
+
+
+class BatchedArchiveTests(_ArchiveFixture):
+    def setUp(self):
+        super().setUp()
+        self._orig_many = historical_service._archive_daily_many
+        self.batches = []
+
+        def fake_many(coords, start, end):
+            self.batches.append((tuple(coords), start, end))
+            return [_daily(start, end, base=lat) for lat, _lon in coords]
+        historical_service._archive_daily_many = fake_many
+
+    def tearDown(self):
+        historical_service._archive_daily_many = self._orig_many
+        super().tearDown()
+
+    def test_one_request_for_all_cities(self):
+        coords = [(43.0, -89.0), (41.9, -87.6), (44.9, -93.2)]
+        days = historical_service.compare_day(coords, "2010-07-01")
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual([d.temp_max for d in days], [43.0, 41.9, 44.9])
+        # Results were split into each city's own series.
+        historical_service.fetch_single_day(41.9, -87.6, "2010-07-01")
+        self.assertEqual(self.calls, [])
+
+    def test_only_cities_missing_the_date_are_requested(self):
+        historical_service.fetch_single_day(43.0, -89.0, "2010-07-01")
+        historical_service.compare_day([(43.0, -89.0), (41.9, -87.6)], "2010-07-01")
+        self.assertEqual(self.batches, [(((41.9, -87.6),), date(2010, 7, 1), date(2010, 7, 1))])
+
+    def test_failed_batch_keeps_stored_cities(self):
+        historical_service.fetch_single_day(43.0, -89.0, "2010-07-01")
+
+        def boom(coords, start, end):
+            raise OSError("timed out")
+        historical_service._archive_daily_many = boom
+        historical_service.ARCHIVE_RETRY_DELAY, delay = 0, historical_service.ARCHIVE_RETRY_DELAY
+        try:
+            days = historical_service.compare_day([(43.0, -89.0), (41.9, -87.6)], "2010-07-01")
+        finally:
+            historical_service.ARCHIVE_RETRY_DELAY = delay
+        self.assertIsNone(days[0].error)
+        self.assertEqual(days[1].error, "timed out")
+
+    def test_multi_coordinate_response_is_split(self):
+        orig = historical_service.http.get_json
+        seen = {}
+
+        def fake_get_json(url, params=None, **kw):
+            seen.update(params)
+            return [{"daily": {"time": ["2010-07-01"], "temperature_2m_max": [v]}}
+                    for v in (1.0, 2.0)]
+        historical_service.http.get_json = fake_get_json
+        try:
+            blocks = self._orig_many(
+                [(43.0, -89.0), (41.9, -87.6)], date(2010, 7, 1), date(2010, 7, 1))
+        finally:
+            historical_service.http.get_json = orig
+        self.assertEqual(seen["latitude"], "43.0,41.9")
+        self.assertEqual([b["temperature_2m_max"] for b in blocks], [[1.0], [2.0]])
+
+
+class HourlyStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = HourlyStore(self.tmp.name)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_merge_slice_and_aggregates(self):
+        jan5, jan10 = date(2001, 1, 5), date(2001, 1, 10)
+        self.store.merge(_hourly(jan5, jan10), jan5, jan10)
+        self.store.merge(_hourly(date(2001, 1, 1), date(2001, 1, 2)),
+                         date(2001, 1, 1), date(2001, 1, 2))   # grows at the front
+        self.assertEqual(self.store.missing(date(2001, 1, 1), date(2001, 1, 12)), [
+            (date(2001, 1, 3), date(2001, 1, 4)), (date(2001, 1, 11), date(2001, 1, 12))])
+        temps = self.store.values("temp", jan5, jan5)
+        self.assertEqual(list(temps), [float(h) for h in range(24)])
+        self.assertTrue(math.isnan(self.store.values("snowfall", jan5, jan5)[0]))
+        self.assertEqual(self.store.daily("temp", date(2001, 1, 4), jan5, "max"),
+                         [(date(2001, 1, 4), None), (jan5, 23.0)])
+        self.assertEqual(self.store.daily("precip", jan5, jan5, "sum"), [(jan5, 24.0)])
+        sums = self.store.rolling_sum("precip", jan5, jan5, 6)
+        self.assertEqual(len(sums), 24)
+        self.assertEqual(sums[0], 1.0)                 # Jan 4 is missing
+        self.assertEqual(sums[10], 6.0)
+
+    def test_reopened_from_disk(self):
+        d = date(2001, 6, 1)
+        self.store.merge(_hourly(d, d), d, d)
+        self.store.flush()
+        self.store.close()
+        self.store = HourlyStore(self.tmp.name)
+        self.assertEqual(self.store.missing(d, d), [])
+        self.assertEqual(self.store.values("temp", d, d)[12], 12.0)
+
+
+class EnsureHourlyTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._orig = (historical_service._archive_hourly, historical_service._hourly_dir)
+        self.calls = []
+
+        def fake_archive(lat, lon, start, end):
+            self.calls.append((start, end))
+            return _hourly(start, end)
+        historical_service._archive_hourly = fake_archive
+        historical_service._hourly_dir = lambda: self.tmp.name
+
+    def tearDown(self):
+        for store in historical_service._hourly.values():
+            store.close()
+        historical_service._hourly.clear()
+        historical_service._archive_hourly, historical_service._hourly_dir = self._orig
+        self.tmp.cleanup()
+
+    def test_years_fetched_once_in_chunks(self):
+        store = historical_service.ensure_hourly(43.0, -89.0, date(2010, 1, 1),
+                                                 date(2012, 12, 31))
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(store.daily("temp", date(2011, 7, 4), date(2011, 7, 4), "mean"),
+                         [(date(2011, 7, 4), 11.5)])
+        historical_service.ensure_hourly(43.0, -89.0, date(2011, 3, 1), date(2011, 3, 31))
+        self.assertEqual(len(self.calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
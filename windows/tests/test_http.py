@@ -0,0 +1,264 @@
+import json
+import threading
+import time
+import unittest
+
+import requests
+
+from fastweather.services import http
+from fastweather.services.geojson_stream import geometry_of
+
+
+class _Resp:
+    def __init__(self, status, payload=None, headers=None):
+        self.status_code = status
+        self.payload = payload
+        self.headers = headers or {}
+
+    def json(self):
+        return self.payload
+
+    def iter_content(self, chunk_size):
+        raw = json.dumps(self.payload).encode()
+        return (raw[i:i + 7] for i in range(0, len(raw), 7))  # awkward chunking
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+class _ScriptedSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        self.last_headers = kwargs.get("headers") or {}
+        out = self.outcomes.pop(0)
+        if isinstance(out, Exception):
+            raise out
+        return out
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_burst_then_paced_reservations(self):
+        bucket = http.TokenBucket(rate=10, burst=2)
+        waits = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, delta=0.02)
+        self.assertAlmostEqual(waits[3], 0.2, delta=0.02)
+
+    def test_concurrent_callers_pipeline(self):
+        bucket = http.TokenBucket(rate=50, burst=1)
+        done = []
+
+        def worker():
+            bucket.acquire()
+            done.append(time.monotonic())
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 1 immediate + 5 paced at 20 ms: ~0.1 s total, not 6 serialized sleeps.
+        elapsed = max(done) - start
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertLess(elapsed, 0.5)
+
+
+class HostLimiterTests(unittest.TestCase):
+    def tearDown(self):
+        http.set_rate_limit("example.test", None)
+
+    def test_subdomains_share_parent_bucket(self):
+        a = http.limiter("api.open-meteo.com")
+        b = http.limiter("archive-api.open-meteo.com")
+        self.assertIsNotNone(a)
+        self.assertIs(a, b)
+
+    def test_unlisted_host_unlimited_until_configured(self):
+        self.assertIsNone(http.limiter("example.test"))
+        http.set_rate_limit("example.test", 2.0, burst=3)
+        bucket = http.limiter("www.example.test")
+        self.assertEqual((bucket.rate, bucket.burst), (2.0, 3.0))
+
+
+class RetryBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = (http.session, http.BACKOFF_BASE)
+        http.BACKOFF_BASE = 0.0
+        http.reset_breakers()
+
+    def tearDown(self):
+        http.session, http.BACKOFF_BASE = self._orig
+        http.reset_breakers()
+
+    def use(self, *outcomes):
+        fake = _ScriptedSession(outcomes)
+        http.session = lambda: fake
+        return fake
+
+    def test_retries_transient_failures(self):
+        fake = self.use(_Resp(503), requests.ConnectionError("reset"), _Resp(200, {"ok": 1}))
+        self.assertEqual(http.get_json("https://flaky.test/x"), {"ok": 1})
+        self.assertEqual(fake.calls, 3)
+        self.assertEqual(http.breaker_states()["flaky.test"]["state"], "closed")
+
+    def test_client_errors_not_retried(self):
+        fake = self.use(_Resp(404), _Resp(200, {}))
+        with self.assertRaises(requests.HTTPError):
+            http.get_json("https://flaky.test/missing")
+        self.assertEqual(fake.calls, 1)
+
+    def test_gives_up_after_max_retries(self):
+        fake = self.use(*[_Resp(500)] * 5)
+        with self.assertRaises(requests.HTTPError):
+            http.get_json("https://flaky.test/x")
+        self.assertEqual(fake.calls, 1 + http.MAX_RETRIES)
+
+    def test_breaker_opens_and_short_circuits(self):
+        fake = self.use(*[_Resp(503)] * 10)
+        with self.assertRaises(requests.HTTPError):
+            http.get_json("https://down.test/a")
+        with self.assertRaises(requests.RequestException):
+            http.get_json("https://down.test/b")
+        calls = fake.calls
+        self.assertEqual(calls, http.BREAKER_THRESHOLD)
+        with self.assertRaises(http.CircuitOpenError):
+            http.get_json("https://down.test/c")
+        self.assertEqual(fake.calls, calls)  # no network while open
+        state = http.breaker_states()["down.test"]
+        self.assertEqual(state["state"], "open")
+        self.assertGreater(state["retry_in"], 0)
+
+    def test_half_open_trial_closes_on_success(self):
+        b = http.CircuitBreaker(threshold=1, cooldown=0.0)
+        b.record_failure()
+        self.assertEqual(b.state(), "half-open")
+        self.assertTrue(b.allow())
+        self.assertFalse(b.allow())  # only one trial at a time
+        b.record_success()
+        self.assertEqual(b.state(), "closed")
+
+    def test_failed_trial_of_any_kind_settles_breaker(self):
+        http._breakers["odd.test"] = b = http.CircuitBreaker(threshold=1, cooldown=0.0)
+        b.record_failure()
+        fake = self.use(requests.TooManyRedirects("loop"), _Resp(200, {"ok": 1}))
+        with self.assertRaises(requests.TooManyRedirects):
+            http.get_json("https://odd.test/x")
+        self.assertEqual(fake.calls, 1)  # not retried
+        self.assertEqual(http.get_json("https://odd.test/x"), {"ok": 1})
+        self.assertEqual(b.state(), "closed")
+
+    def test_retried_response_is_closed(self):
+        closed = []
+        busy = _Resp(503)
+        busy.close = lambda: closed.append(True)
+        self.use(busy, _Resp(200, {"ok": 1}))
+        http.get("https://flaky.test/x", stream=True)
+        self.assertEqual(closed, [True])
+
+    def test_retry_after_honored(self):
+        self.assertEqual(http._backoff(0, _Resp(429, headers={"Retry-After": "3"})), 3.0)
+        self.assertEqual(http._backoff(0, _Resp(429, headers={"Retry-After": "9999"})),
+                         http.RETRY_AFTER_MAX)
+
+
+class ConditionalCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = http.session
+        http.http_cache.clear()
+        http.reset_breakers()
+
+    def tearDown(self):
+        http.session = self._orig
+        http.http_cache.clear()
+
+    def use(self, *outcomes):
+        fake = _ScriptedSession(outcomes)
+        http.session = lambda: fake
+        return fake
+
+    def test_revalidates_with_validators_and_reuses_on_304(self):
+        body = {"features": [1, 2, 3]}
+        fake = self.use(
+            _Resp(200, body, {"ETag": '"v1"', "Last-Modified": "Mon, 19 Oct 2026 10:00:00 GMT"}),
+            _Resp(304),
+        )
+        self.assertEqual(http.get_json("https://nws.test/alerts", {"a": 1}, cache=True), body)
+        self.assertNotIn("If-None-Match", fake.last_headers)
+        again = http.get_json("https://nws.test/alerts", {"a": 1}, cache=True)
+        self.assertIs(again, body)
+        self.assertEqual(fake.last_headers["If-None-Match"], '"v1"')
+        self.assertEqual(fake.last_headers["If-Modified-Since"], "Mon, 19 Oct 2026 10:00:00 GMT")
+
+    def test_fresh_max_age_skips_request(self):
+        fake = self.use(_Resp(200, {"n": 1}, {"Cache-Control": "public, max-age=60"}))
+        http.get_json("https://nws.test/x", cache=True)
+        self.assertEqual(http.get_json("https://nws.test/x", cache=True), {"n": 1})
+        self.assertEqual(fake.calls, 1)
+
+    def test_changed_body_replaces_entry(self):
+        self.use(_Resp(200, {"n": 1}, {"ETag": "a"}), _Resp(200, {"n": 2}, {"ETag": "b"}))
+        http.get_json("https://nws.test/x", cache=True)
+        self.assertEqual(http.get_json("https://nws.test/x", cache=True), {"n": 2})
+
+    def test_no_store_and_uncached_calls_send_no_validators(self):
+        fake = self.use(_Resp(200, {}, {"ETag": "a", "Cache-Control": "no-store"}),
+                        _Resp(200, {}), _Resp(200, {}))
+        http.get_json("https://nws.test/x", cache=True)
+        http.get_json("https://nws.test/x", cache=True)
+        self.assertNotIn("If-None-Match", fake.last_headers)
+        http.get_json("https://nws.test/x")
+        self.assertEqual(fake.calls, 3)
+
+
+class StreamedFeatureTests(unittest.TestCase):
+    FEED = {
+        "@context": [{"@vocab": "x", "nested": {"features": [0]}}],
+        "type": "FeatureCollection",
+        "features": [
+            {"id": "a", "geometry": {"type": "Polygon", "coordinates": [[[1, 2], [3, 4]]]},
+             "properties": {"headline": 'Tricky "quotes", {braces} [and] colons: \\ caf\u00e9'}},
+            {"id": "b", "geometry": None, "properties": {}},
+        ],
+        "title": "after",
+    }
+
+    setUp = ConditionalCacheTests.setUp
+    tearDown = ConditionalCacheTests.tearDown
+    use = ConditionalCacheTests.use
+
+    def test_geometry_modes(self):
+        for mode in ("parse", "skip", "defer"):
+            self.use(_Resp(200, self.FEED))
+            feats = list(http.get_features("https://nws.test/alerts", geometry=mode))
+            self.assertEqual([f["properties"] for f in feats],
+                             [f["properties"] for f in self.FEED["features"]])
+            geoms = [geometry_of(f) for f in feats]
+            expected = [None, None] if mode == "skip" else [f["geometry"] for f in self.FEED["features"]]
+            self.assertEqual(geoms, expected, mode)
+
+    def test_unchanged_stream_returns_none(self):
+        fake = self.use(_Resp(200, self.FEED, {"ETag": '"v1"'}), _Resp(304))
+        self.assertEqual(len(list(http.get_features("https://nws.test/a", cache=True))), 2)
+        self.assertIsNone(http.get_features("https://nws.test/a", cache=True))
+        self.assertEqual(fake.last_headers["If-None-Match"], '"v1"')
+
+    def test_partly_read_stream_is_not_marked_seen(self):
+        fake = self.use(_Resp(200, self.FEED, {"ETag": '"v1"'}), _Resp(200, self.FEED))
+        stream = http.get_features("https://nws.test/a", cache=True)
+        next(stream)
+        stream.close()
+        self.assertIsNotNone(http.get_features("https://nws.test/a", cache=True))
+        self.assertNotIn("If-None-Match", fake.last_headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from fastweather.models import mydata
+from fastweather.services import land_sea, marine_service, mydata_service
+
+
+class _MemoryDisk:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, payload):
+        self.data[key] = payload
+
+
+def _square_mask():
+    """1-degree grid with lat 40..45N, lon 85..95W marked inland."""
+    cells = [(90 - lat - 1, 180 + lon) for lat in range(40, 45) for lon in range(-95, -85)]
+    return land_sea.LandSeaMask.from_cells(cells, 1)
+
+
+class LandSeaMaskTests(unittest.TestCase):
+    def test_lookup_and_round_trip(self):
+        mask = land_sea.LandSeaMask.from_bytes(_square_mask().to_bytes())
+        self.assertTrue(mask.is_inland(43.07, -89.38))      # Madison
+        self.assertFalse(mask.is_inland(47.6, -122.3))      # Seattle
+        self.assertFalse(mask.is_inland(90.0, 180.0))       # edges stay in range
+        self.assertFalse(mask.is_inland(-90.0, -180.0))
+        with self.assertRaises(ValueError):
+            land_sea.LandSeaMask.from_bytes(b"nope" + bytes(8))
+
+    def test_is_empty(self):
+        self.assertTrue(land_sea.is_empty({"current": {"time": "t", "wave_height": None}}))
+        self.assertTrue(land_sea.is_empty({"hourly": {"time": ["t"], "wave_height": [None]}}))
+        self.assertFalse(land_sea.is_empty({"hourly": {"wave_height": [None, 0.4]}}))
+        self.assertFalse(land_sea.is_empty({}))
+
+
+class MarineSkipTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = (land_sea._mask, land_sea._mask_loaded, land_sea._no_data,
+                      marine_service.http.get_json)
+        land_sea._mask, land_sea._mask_loaded = _square_mask(), True
+        land_sea._no_data = _MemoryDisk()
+        self.requests = []
+
+        def fake_get_json(url, params=None, **kw):
+            self.requests.append(params["latitude"])
+            return {"current": {"time": "2026-07-22T01:00", "wave_height": None}}
+        marine_service.http.get_json = fake_get_json
+        mydata_service._cache.clear()
+
+    def tearDown(self):
+        (land_sea._mask, land_sea._mask_loaded, land_sea._no_data,
+         marine_service.http.get_json) = self._orig
+        mydata_service._cache.clear()
+
+    def test_inland_point_is_not_requested(self):
+        with self.assertRaises(marine_service.NoMarineData) as cm:
+            marine_service.fetch_marine_summary(43.07, -89.38)
+        self.assertIn("Inland", str(cm.exception))
+        self.assertEqual(self.requests, [])
+
+    def test_empty_answer_remembered(self):
+        marine_service.fetch_marine_summary(47.6, -122.3)
+        with self.assertRaises(marine_service.NoMarineData):
+            marine_service.fetch_marine_summary(47.6, -122.3)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_no_data_remembered_per_variable_set(self):
+        params = [mydata.CATALOG_BY_KEY["wave_height"]]
+        mydata_service.fetch_mydata_matrix([(47.6, -122.3)], params)
+        mydata_service._cache.clear()
+        rows, errors = mydata_service.fetch_mydata_matrix([(47.6, -122.3)], params)
+        self.assertIn("1 inland", errors["marine"])
+        values, errors = mydata_service.fetch_mydata(47.6, -122.3, params)
+        self.assertEqual(errors["marine"], land_sea.NO_DATA_REASON)
+        self.assertEqual(len(self.requests), 1)             # learned for wave_height
+        marine_service.fetch_marine_summary(47.6, -122.3)   # other variables: still asked
+        self.assertEqual(len(self.requests), 2)
+
+    def test_my_data_reports_why(self):
+        params = [mydata.CATALOG_BY_KEY["wave_height"]]
+        values, errors = mydata_service.fetch_mydata(43.07, -89.38, params)
+        self.assertIsNone(values["wave_height"])
+        self.assertEqual(errors["marine"], land_sea.INLAND_REASON)
+        rows, errors = mydata_service.fetch_mydata_matrix([(43.07, -89.38), (41.88, -87.63)],
+                                                          params)
+        self.assertEqual(self.requests, [])
+        self.assertIn("2 inland", errors["marine"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,9 @@
 import unittest
+from datetime import datetime, timezone
 
 from fastweather.models import mydata
 from fastweather.models.settings import AppSettings
-from fastweather.services import mydata_service
+from fastweather.services import mydata_service, weather_service
 from fastweather.ui.formatters import Formatter
 
 
@@ -56,5 +57,114 @@ class ExtractTests(unittest.TestCase):
         self.assertEqual(results["cape"], 22.0)
 
 
+class MatrixLinesTests(unittest.TestCase):
+    def test_sorted_with_missing_last(self):
+        fmt = Formatter(AppSettings())
+        params = [mydata.CATALOG_BY_KEY["uv_index"]]
+        rows = [{"uv_index": 3.0}, {"uv_index": None}, {"uv_index": 8.5}]
+        lines = mydata.matrix_lines(["Madison", "Juneau", "Phoenix"], params, rows, fmt,
+                                    sort_by="uv_index", descending=True)
+        self.assertEqual(lines, ["City     UV Index", "Phoenix  8.5",
+                                 "Madison  3", "Juneau   N/A"])
+        names = [n for n, _ in mydata.sort_matrix(["b", "A", "c"], [{}, {}, {}], "city")]
+        self.assertEqual(names, ["A", "b", "c"])
+
+
+def _hourly(keys, value=1.0):
+    return {"current": {"time": "2026-07-22T01:15"},
+            "hourly": {"time": ["2026-07-22T00:00", "2026-07-22T01:00"],
+                       **{k: [0.0, value] for k in keys}}}
+
+
+class FetchMyDataTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = (mydata_service.http.get_json, mydata_service.marine_service.fetch_marine)
+        self.requests = []
+
+        def fake_get_json(url, params=None, **kw):
+            self.requests.append(url)
+            return _hourly(params["hourly"].split(","))
+        mydata_service.http.get_json = fake_get_json
+        mydata_service._cache.clear()
+        weather_service._full.clear()
+
+    def tearDown(self):
+        mydata_service.http.get_json, mydata_service.marine_service.fetch_marine = self._orig
+        mydata_service._cache.clear()
+        weather_service._full.clear()
+
+    def _params(self, *keys):
+        return [mydata.CATALOG_BY_KEY[k] for k in keys]
+
+    def test_endpoint_failure_is_isolated_and_values_cached(self):
+        def down(*a, **k):
+            raise OSError("marine down")
+        mydata_service.marine_service.fetch_marine = down
+        params = self._params("cape", "pm2_5", "wave_height")
+        values, errors = mydata_service.fetch_mydata(43.0, -89.0, params)
+        self.assertEqual((values["cape"], values["pm2_5"], values["wave_height"]),
+                         (1.0, 1.0, None))
+        self.assertEqual(errors, {"marine": "marine down"})
+        self.assertEqual(len(self.requests), 2)
+        mydata_service.fetch_mydata(43.0, -89.0, params)
+        self.assertEqual(len(self.requests), 2)        # served from cache
+        mydata_service.fetch_mydata(43.0, -89.0, params, use_cache=False)
+        self.assertEqual(len(self.requests), 4)
+
+    def test_forecast_keys_read_from_full_forecast(self):
+        weather_service._full.set(weather_service._coord_key(43.0, -89.0),
+                                  _hourly(["cape", "uv_index"], value=7.0))
+        values, errors = mydata_service.fetch_mydata(43.0, -89.0, self._params("uv_index"))
+        self.assertEqual(values["uv_index"], 7.0)
+        self.assertEqual(self.requests, [])
+        mydata_service.fetch_mydata(43.0, -89.0, self._params("wind_speed_80m"))
+        self.assertEqual(len(self.requests), 1)        # not in the full forecast
+
+    def test_matrix_batches_uncached_cities(self):
+        mydata_service.fetch_mydata(41.9, -87.6, self._params("pm2_5"))   # one cached city
+        calls = []
+
+        def fake_get_json(url, params=None, **kw):
+            calls.append((url, params["latitude"]))
+            n = len(params["latitude"].split(","))
+            return [_hourly(params["hourly"].split(","), value=float(i)) for i in range(n)]
+        mydata_service.http.get_json = fake_get_json
+        coords = [(43.0, -89.0), (41.9, -87.6), (44.9, -93.2)]
+        rows, errors = mydata_service.fetch_mydata_matrix(
+            coords, self._params("cape", "pm2_5"))
+        self.assertEqual(errors, {})
+        self.assertEqual(sorted(calls), [
+            (mydata_service.OPEN_METEO_AIR_QUALITY_URL, "43.0,44.9"),
+            (mydata_service.OPEN_METEO_API_URL, "43.0,41.9,44.9")])
+        self.assertEqual([r["cape"] for r in rows], [0.0, 1.0, 2.0])
+        self.assertEqual([r["pm2_5"] for r in rows], [0.0, 1.0, 1.0])
+        # Each city's slice is cached for the single-city view.
+        values, _ = mydata_service.fetch_mydata(44.9, -93.2, self._params("cape", "pm2_5"))
+        self.assertEqual((values["cape"], values["pm2_5"]), (2.0, 1.0))
+        self.assertEqual(len(calls), 2)
+
+    def test_hour_index_is_arithmetic(self):
+        times = [f"2026-07-{d:02d}T{h:02d}:00" for d in (21, 22) for h in range(24)]
+        self.assertEqual(mydata_service._hour_index(times, "2026-07-22T05:00"), 29)
+        self.assertEqual(mydata_service._hour_index(times, "2026-07-25T05:00"), 0)
+
+    def test_current_hour_without_current_block(self):
+        data = {"utc_offset_seconds": -18000}
+        now = datetime(2026, 7, 22, 6, 40, tzinfo=timezone.utc)
+        self.assertEqual(mydata_service._current_hour(data, now), "2026-07-22T01:00")
+        self.assertEqual(mydata_service._current_hour(_hourly([])), "2026-07-22T01:00")
+
+    def test_cached_response_read_at_present_hour(self):
+        data = {**_hourly(["cape"]), "utc_offset_seconds": -18000}
+        data["hourly"]["time"].append("2026-07-22T02:00")
+        data["hourly"]["cape"].append(2.0)
+        later = datetime(2026, 7, 22, 7, 5, tzinfo=timezone.utc)   # 02:05 local
+        hour = mydata_service._current_hour(data, later)
+        self.assertEqual(hour, "2026-07-22T02:00")
+        results = {}
+        mydata_service._extract(data, ["cape"], hour, results, {}, "forecast")
+        self.assertEqual(results["cape"], 2.0)
+
+
 if __name__ == "__main__":
     unittest.main()